@@ -7,4 +7,16 @@ human developers and AI-assisted development tools.
 
 __version__ = '0.1.0'
 
-from adp_py.core import * 
\ No newline at end of file
+__all__ = [
+    'ADPSchema', 'get_default_schema', 'load_schema', 'register_schema',
+    'ADPParser', 'ADPMetadata', 'ParsedFile',
+    'GraphBuilder', 'KnowledgeGraph', 'NodeType', 'EdgeType',
+]
+
+
+def __getattr__(name):
+    """Resolve the public API from adp_py.core on first access (PEP 562)."""
+    if name in __all__:
+        from adp_py import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -8,18 +8,23 @@
 
 import os
 import sys
-import json
+import pickle
 import click
 import logging
-from typing import List, Dict, Any, Optional
-from rich.console import Console
+from collections import Counter, deque
+from itertools import chain, islice
+from operator import attrgetter
+from typing import List, Dict, Any, Iterator, Optional
+from rich.console import Console, Group
 from rich.table import Table
 from rich.syntax import Syntax
 from rich.panel import Panel
 
-from adp_py.core.parser import ADPParser, ParsedFile, CodeScope
+from adp_py.core.parser import (ADPParser, ParsedFile, CodeScope, PARSER_VERSION, get_language_from_file_path,
+                                 iter_parse_files, iter_source_files)
 from adp_py.core.schema import ADPSchema, load_schema, get_default_schema, register_schema
-from adp_py.core.graph import GraphBuilder, KnowledgeGraph, NodeType, EdgeType
+from adp_py.utils.json_utils import dumps, dumps_bytes
+from adp_py.utils.parse_cache import ParseCache
 
 
 console = Console()
@@ -29,6 +34,104 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("adp")
 
 
+# Above this many files, scan lists files as plain text instead of a table
+_MAX_TABLE_ROWS = 500
+
+# Files at least this large only have their first and last lines printed by debug
+_DEBUG_MAX_FULL_CONTENT = 64 * 1024
+_DEBUG_CONTEXT_LINES = 50
+
+
+def _parse_paths(parser: ADPParser, entries: Iterator[os.DirEntry], use_cache: bool = True) -> List[ParsedFile]:
+    """
+    Parse files, reusing cached results for files that have not changed.
+    
+    Args:
+        parser: Parser whose schema the cached results belong to.
+        entries: DirEntry objects of the files to parse.
+        use_cache: Whether to use the persistent parse cache.
+    
+    Returns:
+        List of ParsedFile objects for the files that contain metadata.
+    """
+    if not use_cache:
+        file_paths = [entry.path for entry in entries]
+        # The parser skips files without the metadata marker itself, in the workers
+        parsed_files = iter_parse_files(file_paths)
+        return [parsed_file for parsed_file in parsed_files if parsed_file.has_metadata]
+    
+    with ParseCache(schema_name=parser.schema.name) as cache:
+        results: List[Optional[ParsedFile]] = []
+        misses = []
+        for entry in entries:
+            stat_result = entry.stat()
+            cached = cache.get(entry.path, stat_result)
+            if cached is None:
+                misses.append((len(results), entry.path, stat_result))
+            results.append(cached)
+        
+        if misses:
+            fresh = iter_parse_files([file_path for _, file_path, _ in misses])
+            for (index, file_path, stat_result), parsed_file in zip(misses, fresh):
+                results[index] = parsed_file
+                cache.put(file_path, stat_result, parsed_file)
+    
+    return [parsed_file for parsed_file in results if parsed_file.has_metadata]
+
+
+def _collect_parsed_files(parser: ADPParser, path: str, recursive: bool, use_cache: bool = True,
+                          cache_file: Optional[str] = None, is_file: Optional[bool] = None) -> List[ParsedFile]:
+    """
+    Parse a file or directory, or reuse the results saved by an earlier command.
+    
+    Args:
+        parser: Parser to use.
+        path: File or directory to parse.
+        recursive: Whether to recursively parse subdirectories.
+        use_cache: Whether to use the persistent per-file parse cache.
+        cache_file: File to load parse results from if it was written for the same
+            path and none of the files found there have changed since, and to save
+            them to otherwise.
+        is_file: Whether path is a regular file, if the caller already knows.
+    
+    Returns:
+        List of ParsedFile objects. For a single file the list always holds its
+        result; for a directory only files with metadata are included.
+    """
+    if is_file is None:
+        is_file = os.path.isfile(path)
+    # Walk once up front: the cache file is only valid for the same files, unchanged
+    entries = None if is_file else list(iter_source_files(path, recursive))
+    
+    source = None
+    if cache_file:
+        stamped = [(os.path.abspath(path), os.stat(path))] if is_file else \
+            [(entry.path, entry.stat()) for entry in entries]
+        files = [(file_path, stat_result.st_mtime_ns, stat_result.st_size) for file_path, stat_result in stamped]
+        source = {"path": os.path.abspath(path), "recursive": recursive, "schema": parser.schema.name,
+                  "parser_version": PARSER_VERSION, "files": files}
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                saved = pickle.load(f)
+            if saved.get("source") == source:
+                console.print(f"Reusing parse results from: [bold]{cache_file}[/bold]")
+                return saved["parsed_files"]
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, TypeError, ValueError) as e:
+            # Older dataclass layouts fail to unpickle with TypeError or ValueError
+            logger.warning(f"Ignoring unreadable cache file {cache_file}: {e}")
+    
+    if is_file:
+        parsed_files = [parser.parse_file(path)]
+    else:
+        parsed_files = _parse_paths(parser, entries, use_cache=use_cache)
+    
+    if cache_file:
+        with open(cache_file, 'wb') as f:
+            pickle.dump({"source": source, "parsed_files": parsed_files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return parsed_files
+
+
 @click.group()
 @click.version_option()
 def cli():
@@ -41,7 +144,11 @@ def cli():
 @click.option('--recursive/--no-recursive', default=True, help='Recursively scan directories')
 @click.option('--output', '-o', type=click.Path(), help='Output file for results (JSON format)')
 @click.option('--schema', '-s', type=click.Path(exists=True), help='Custom schema file to use for validation')
-def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str]):
+@click.option('--cache/--no-cache', default=True, help='Reuse parse results of unchanged files from previous runs')
+@click.option('--cache-file', type=click.Path(dir_okay=False),
+              help='Load parse results from this file if it was written for the same path, otherwise save them to it')
+def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str], cache: bool,
+         cache_file: Optional[str]):
     """
     Scan a file or directory for ADP metadata.
     
@@ -54,21 +161,20 @@ def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str
         else:
             parser = ADPParser()
         
-        if os.path.isfile(path):
+        # Stat the argument once; directory entries below it come from scandir
+        is_file = os.path.isfile(path)
+        if is_file:
             console.print(f"Scanning file: [bold blue]{path}[/bold blue]")
-            parsed_files = [parser.parse_file(path)]
         else:
             console.print(f"Scanning directory: [bold blue]{path}[/bold blue]")
-            parsed_files = parser.parse_directory(path, recursive=recursive)
+        parsed_files = _collect_parsed_files(parser, path, recursive, use_cache=cache,
+                                             cache_file=cache_file, is_file=is_file)
         
-        # Count metadata blocks by scope
-        scope_counts = {scope.value: 0 for scope in CodeScope}
-        total_blocks = 0
-        
-        for parsed_file in parsed_files:
-            for metadata_block in parsed_file.metadata_blocks:
-                scope_counts[metadata_block.scope] += 1
-                total_blocks += 1
+        # Count metadata blocks by scope (every known scope is reported, even at zero)
+        scope_counts = Counter(dict.fromkeys((scope.value for scope in CodeScope), 0))
+        all_blocks = chain.from_iterable(parsed_file.metadata_blocks for parsed_file in parsed_files)
+        scope_counts.update(map(attrgetter('scope'), all_blocks))
+        total_blocks = sum(scope_counts.values())
         
         # Display summary
         console.print(f"\n[bold green]Found {total_blocks} metadata blocks in {len(parsed_files)} files[/bold green]\n")
@@ -79,7 +185,7 @@ def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str
             table.add_column("Count", style="magenta")
             table.add_column("Percentage", style="green")
             
-            for scope, count in scope_counts.items():
+            for scope, count in scope_counts.most_common():
                 if count > 0:
                     percentage = (count / total_blocks) * 100
                     table.add_row(scope, str(count), f"{percentage:.1f}%")
@@ -88,29 +194,39 @@ def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str
             
             # Display file details
             console.print("\n[bold]Files with metadata:[/bold]")
-            files_table = Table()
-            files_table.add_column("File", style="blue")
-            files_table.add_column("Blocks", style="magenta")
-            
-            for parsed_file in parsed_files:
-                if parsed_file.has_metadata:
-                    files_table.add_row(
-                        parsed_file.file_path, 
-                        str(len(parsed_file.metadata_blocks))
-                    )
+            file_rows = [
+                (parsed_file.file_path, str(len(parsed_file.metadata_blocks)))
+                for parsed_file in parsed_files if parsed_file.has_metadata
+            ]
             
-            console.print(files_table)
+            if len(file_rows) <= _MAX_TABLE_ROWS:
+                files_table = Table()
+                files_table.add_column("File", style="blue")
+                files_table.add_column("Blocks", style="magenta")
+                for row in file_rows:
+                    files_table.add_row(*row)
+                console.print(files_table)
+            else:
+                # Laying out a rich Table this large costs more than the scan itself
+                console.print("\n".join(f"{file_path}: {blocks}" for file_path, blocks in file_rows),
+                              highlight=False, markup=False)
         
         # Save results to file if specified
         if output:
-            result = {
-                "summary": {
-                    "total_files": len(parsed_files),
-                    "total_blocks": total_blocks,
-                    "scope_counts": scope_counts
-                },
-                "files": [
-                    {
+            summary = {
+                "total_files": len(parsed_files),
+                "total_blocks": total_blocks,
+                "scope_counts": dict(scope_counts)
+            }
+            
+            # Stream one record per file instead of building the whole document in memory
+            with open(output, 'wb') as f:
+                f.write(b'{"summary": ' + dumps_bytes(summary) + b', "files": [')
+                separator = b'\n'
+                for pf in parsed_files:
+                    if not pf.has_metadata:
+                        continue
+                    record = {
                         "path": pf.file_path,
                         "blocks": [
                             {
@@ -121,12 +237,9 @@ def scan(path: str, recursive: bool, output: Optional[str], schema: Optional[str
                             for block in pf.metadata_blocks
                         ]
                     }
-                    for pf in parsed_files if pf.has_metadata
-                ]
-            }
-            
-            with open(output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2)
+                    f.write(separator + dumps_bytes(record))
+                    separator = b',\n'
+                f.write(b'\n]}\n')
             
             console.print(f"\nResults saved to: [bold]{output}[/bold]")
     
@@ -192,27 +305,27 @@ def validate(file_path: str, schema: Optional[str]):
 @click.option('--engine', '-e', type=click.Choice(['graphviz', 'matplotlib']), default='graphviz', 
               help='Visualization engine to use')
 @click.option('--recursive/--no-recursive', default=True, help='Recursively scan directories')
-def visualize(path: str, output: str, format: str, engine: str, recursive: bool):
+@click.option('--cache/--no-cache', default=True, help='Reuse parse results of unchanged files from previous runs')
+@click.option('--cache-file', type=click.Path(dir_okay=False),
+              help='Load parse results from this file if it was written for the same path, otherwise save them to it')
+def visualize(path: str, output: str, format: str, engine: str, recursive: bool, cache: bool,
+              cache_file: Optional[str]):
     """
     Generate a knowledge graph visualization from ADP metadata.
     
     PATH is the file or directory to process.
     """
+    # Imported here so commands that don't build graphs skip networkx/graphviz/matplotlib
+    from adp_py.core.graph import GraphBuilder
+    
     try:
         parser = ADPParser()
         builder = GraphBuilder()
         
         console.print(f"Building knowledge graph from: [bold blue]{path}[/bold blue]")
         
-        if os.path.isfile(path):
-            parsed_file = parser.parse_file(path)
-            if parsed_file.has_metadata:
-                builder.add_file(parsed_file)
-        else:
-            parsed_files = parser.parse_directory(path, recursive=recursive)
-            for parsed_file in parsed_files:
-                if parsed_file.has_metadata:
-                    builder.add_file(parsed_file)
+        parsed_files = _collect_parsed_files(parser, path, recursive, use_cache=cache, cache_file=cache_file)
+        builder.add_files(parsed_file for parsed_file in parsed_files if parsed_file.has_metadata)
         
         graph = builder.graph
         
@@ -222,11 +335,7 @@ def visualize(path: str, output: str, format: str, engine: str, recursive: bool)
         console.print(f"  Edges: {len(graph.edges)}")
         
         # Node type distribution
-        node_types = {}
-        for node_id, node in graph.nodes.items():
-            if node.type not in node_types:
-                node_types[node.type] = 0
-            node_types[node.type] += 1
+        node_types = graph.node_type_counts
         
         console.print("\n[bold]Node Types:[/bold]")
         for node_type, count in node_types.items():
@@ -289,18 +398,18 @@ def show(file_path: str, language: Optional[str]):
             console.print(f"[yellow]No ADP metadata found in {file_path}[/yellow]")
             return
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         console.print(f"[bold blue]ADP Metadata in {file_path}[/bold blue]\n")
         
+        # Render all blocks in a single print so rich lays them out in one pass
+        renderables = []
         for metadata_block in parsed_file.metadata_blocks:
-            console.print(f"[bold]Block at line {metadata_block.line_number} ({metadata_block.scope}):[/bold]")
+            renderables.append(f"[bold]Block at line {metadata_block.line_number} ({metadata_block.scope}):[/bold]")
             
             # Pretty-print the metadata
-            json_str = json.dumps(metadata_block.metadata, indent=2)
+            json_str = dumps(metadata_block.metadata, indent=True)
             syntax = Syntax(json_str, "json", theme="monokai", line_numbers=True)
-            console.print(Panel(syntax))
+            renderables.append(Panel(syntax))
+        console.print(Group(*renderables))
     
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
@@ -327,8 +436,15 @@ def debug(file_path: str, verbose: bool):
         console.print("\n[bold]File content:[/bold]")
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            console.print(content)
+            if os.fstat(f.fileno()).st_size < _DEBUG_MAX_FULL_CONTENT:
+                console.print(f.read())
+            else:
+                # Printing a large file through rich is slow, so only show its ends
+                head = ''.join(islice(f, _DEBUG_CONTEXT_LINES))
+                tail = ''.join(deque(f, maxlen=_DEBUG_CONTEXT_LINES))
+                console.print(head, end='')
+                console.print(f"[dim]... (first and last {_DEBUG_CONTEXT_LINES} lines shown) ...[/dim]")
+                console.print(tail)
         
         console.print("\n[bold]Parsing file...[/bold]")
         parsed_file = parser.parse_file(file_path)
@@ -338,7 +454,7 @@ def debug(file_path: str, verbose: bool):
             
             for i, metadata_block in enumerate(parsed_file.metadata_blocks):
                 console.print(f"\n[bold]Block {i+1} at line {metadata_block.line_number} ({metadata_block.scope}):[/bold]")
-                json_str = json.dumps(metadata_block.metadata, indent=2)
+                json_str = dumps(metadata_block.metadata, indent=True)
                 console.print(json_str)
         else:
             console.print("\n[bold red]✗[/bold red] No metadata blocks found")
@@ -362,7 +478,11 @@ def debug(file_path: str, verbose: bool):
 @click.option('--title', '-t', default="ADP Knowledge Graph", 
               help='Title for the visualization')
 @click.option('--recursive/--no-recursive', default=True, help='Recursively scan directories')
-def interactive(path: str, output: str, title: str, recursive: bool):
+@click.option('--cache/--no-cache', default=True, help='Reuse parse results of unchanged files from previous runs')
+@click.option('--cache-file', type=click.Path(dir_okay=False),
+              help='Load parse results from this file if it was written for the same path, otherwise save them to it')
+def interactive(path: str, output: str, title: str, recursive: bool, cache: bool,
+                cache_file: Optional[str]):
     """
     Generate an interactive HTML visualization of the knowledge graph.
     
@@ -377,21 +497,17 @@ def interactive(path: str, output: str, title: str, recursive: bool):
     - Detailed tooltips showing all node and edge metadata
     - Highlighting of connected nodes and edges
     """
+    # Imported here so commands that don't build graphs skip networkx/graphviz/matplotlib
+    from adp_py.core.graph import GraphBuilder
+    
     try:
         parser = ADPParser()
         builder = GraphBuilder()
         
         console.print(f"Building knowledge graph from: [bold blue]{path}[/bold blue]")
         
-        if os.path.isfile(path):
-            parsed_file = parser.parse_file(path)
-            if parsed_file.has_metadata:
-                builder.add_file(parsed_file)
-        else:
-            parsed_files = parser.parse_directory(path, recursive=recursive)
-            for parsed_file in parsed_files:
-                if parsed_file.has_metadata:
-                    builder.add_file(parsed_file)
+        parsed_files = _collect_parsed_files(parser, path, recursive, use_cache=cache, cache_file=cache_file)
+        builder.add_files(parsed_file for parsed_file in parsed_files if parsed_file.has_metadata)
         
         graph = builder.graph
         
@@ -401,12 +517,7 @@ def interactive(path: str, output: str, title: str, recursive: bool):
         console.print(f"  Edges: {len(graph.edges)}")
         
         # Node type distribution
-        node_types = {}
-        for node_id, node in graph.nodes.items():
-            node_type = node.type.value if hasattr(node.type, 'value') else node.type
-            if node_type not in node_types:
-                node_types[node_type] = 0
-            node_types[node_type] += 1
+        node_types = graph.node_type_counts
         
         console.print("\n[bold]Node Types:[/bold]")
         for node_type, count in sorted(node_types.items()):
@@ -2,6 +2,33 @@
 Core module for ADP functionality.
 """
 
-from adp_py.core.schema import ADPSchema, get_default_schema, load_schema, register_schema
-from adp_py.core.parser import ADPParser, ADPMetadata, ParsedFile
-from adp_py.core.graph import GraphBuilder, KnowledgeGraph, NodeType, EdgeType 
\ No newline at end of file
+import importlib
+
+# Public names and the submodule that defines them. Submodules are imported on
+# first access so that e.g. the parser can be used without loading the graph
+# module and its plotting dependencies.
+_LAZY_IMPORTS = {
+    'ADPSchema': 'adp_py.core.schema',
+    'get_default_schema': 'adp_py.core.schema',
+    'load_schema': 'adp_py.core.schema',
+    'register_schema': 'adp_py.core.schema',
+    'ADPParser': 'adp_py.core.parser',
+    'ADPMetadata': 'adp_py.core.parser',
+    'ParsedFile': 'adp_py.core.parser',
+    'GraphBuilder': 'adp_py.core.graph',
+    'KnowledgeGraph': 'adp_py.core.graph',
+    'NodeType': 'adp_py.core.graph',
+    'EdgeType': 'adp_py.core.graph',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Import the submodule defining a public name on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value 
\ No newline at end of file
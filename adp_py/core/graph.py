@@ -7,17 +7,23 @@
 """
 
 import os
-import json
+import re
+import sys
+import random
+import colorsys
+import logging
+from collections import Counter
+from functools import lru_cache
 from enum import Enum
-from typing import Dict, List, Any, Optional, Set, Tuple, Union
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-import graphviz
 
 from adp_py.core.parser import ParsedFile, CodeScope, ADPMetadata
-from adp_py.core.schema import get_schema, ADPSchema
+from adp_py.core.schema import get_schema, ADPSchema, DATACLASS_SLOTS
+from adp_py.utils.json_utils import dumps, dumps_bytes
+
+logger = logging.getLogger(__name__)
 
 
 class NodeType(str, Enum):
@@ -53,7 +59,277 @@ class EdgeType(str, Enum):
     PROCESSES_DATA = "processes_data"
 
 
-@dataclass
+# Matplotlib layer (row) of each node type, top to bottom
+_MATPLOTLIB_LAYERS = {
+    "file": 0,
+    "domain": 1,
+    "service": 2, 
+    "team": 2,
+    "class": 3,
+    "function": 4, 
+    "method": 4,
+    "variable": 5,
+    "tech_debt": 6,
+    "performance": 6,
+    "data": 6
+}
+
+# Layers with at most this many nodes skip the spring layout in visualize_matplotlib
+_SPRING_LAYOUT_MAX_EVEN_LAYER = 8
+
+# Graphviz node fill colors by node type
+_GRAPHVIZ_NODE_COLORS = {
+    "service": '#1f77b4',  # blue
+    "module": '#ff7f0e',   # orange
+    "class": '#2ca02c',    # green
+    "function": '#d62728', # red
+    "method": '#9467bd',   # purple
+    "variable": '#8c564b', # brown
+    "file": '#e377c2',     # pink
+    "domain": '#7f7f7f',   # grey
+    "concept": '#bcbd22',  # olive
+    "team": '#17becf',     # cyan
+    "tech_debt": '#000000', # black
+    "performance": '#ff9896', # light red
+    "data": '#aec7e8',     # light blue
+}
+
+# Graphviz node shapes by node type (other types are drawn as boxes)
+_GRAPHVIZ_NODE_SHAPES = {
+    "file": 'folder',
+    "class": 'ellipse',
+    "function": 'ellipse',
+    "method": 'ellipse',
+    "domain": 'hexagon',
+    "service": 'hexagon',
+    "tech_debt": 'diamond',
+}
+
+# Graphviz edge styling by edge type
+_GRAPHVIZ_EDGE_STYLES = {
+    "contains": {'color': '#0077cc', 'style': 'solid', 'weight': '10'},  # Strong blue
+    "uses": {'color': '#009900', 'style': 'solid', 'weight': '5'},       # Green
+    "depends_on": {'color': '#cc0000', 'style': 'solid', 'weight': '8'},  # Red
+    "calls": {'color': '#9900cc', 'style': 'solid', 'weight': '5'},      # Purple
+    "implements": {'color': '#ff6600', 'style': 'dashed', 'weight': '3'}, # Orange
+    "extends": {'color': '#996633', 'style': 'dashed', 'weight': '3'},   # Brown
+    "references": {'color': '#666666', 'style': 'dotted', 'weight': '1'}, # Grey
+    "owned_by": {'color': '#000000', 'style': 'dashed', 'weight': '3'},  # Black
+    "related_to": {'color': '#888888', 'style': 'dotted', 'weight': '1'}, # Grey
+    "has_tech_debt": {'color': '#ff0000', 'style': 'bold', 'weight': '2'}, # Red
+    "has_performance_issue": {'color': '#ff9900', 'style': 'bold', 'weight': '2'}, # Orange
+    "processes_data": {'color': '#0099cc', 'style': 'dashed', 'weight': '2'}, # Blue
+}
+
+
+def _graphviz_node_style(node_type: Union[NodeType, str]) -> Tuple[str, str, str]:
+    """Get the (fill color, shape, font color) Graphviz styling of a node type."""
+    return (
+        _GRAPHVIZ_NODE_COLORS.get(node_type, '#aaaaaa'),
+        _GRAPHVIZ_NODE_SHAPES.get(node_type, 'box'),
+        'white' if node_type in ('tech_debt', 'service') else 'black',
+    )
+
+
+# Styling of the built-in types, resolved once so rendering does a single lookup
+_GRAPHVIZ_NODE_STYLE_TABLE = {node_type.value: _graphviz_node_style(node_type.value) for node_type in NodeType}
+_GRAPHVIZ_EDGE_STYLE_TABLE = {
+    edge_type: (style['color'], style['style'], style['weight'])
+    for edge_type, style in _GRAPHVIZ_EDGE_STYLES.items()
+}
+_GRAPHVIZ_DEFAULT_EDGE_STYLE = ('#000000', 'solid', '1')
+
+
+# Cytoscape node colors by node type (modern palette)
+_CYTOSCAPE_NODE_COLORS = {
+    # Default node types
+    NodeType.SERVICE.value: "#3498db",    # bright blue
+    NodeType.MODULE.value: "#e74c3c",     # bright red
+    NodeType.CLASS.value: "#2ecc71",      # bright green
+    NodeType.FUNCTION.value: "#9b59b6",   # purple
+    NodeType.METHOD.value: "#8e44ad",     # dark purple
+    NodeType.VARIABLE.value: "#f1c40f",   # yellow
+    NodeType.FILE.value: "#1abc9c",       # turquoise
+    NodeType.DOMAIN.value: "#34495e",     # dark blue
+    NodeType.CONCEPT.value: "#95a5a6",    # light gray
+    NodeType.TEAM.value: "#16a085",       # green
+    NodeType.TECH_DEBT.value: "#e67e22",  # orange
+    NodeType.PERFORMANCE.value: "#d35400", # dark orange
+    NodeType.DATA.value: "#3498db",       # blue
+}
+
+# Cytoscape edge colors by edge type
+_CYTOSCAPE_EDGE_COLORS = {
+    EdgeType.CONTAINS.value: '#3498db',
+    EdgeType.USES.value: '#2ecc71',
+    EdgeType.DEPENDS_ON.value: '#e74c3c',
+    EdgeType.CALLS.value: '#9b59b6',
+    EdgeType.IMPLEMENTS.value: '#f39c12',
+    EdgeType.EXTENDS.value: '#d35400',
+    EdgeType.REFERENCES.value: '#7f8c8d',
+    EdgeType.OWNED_BY.value: '#2c3e50',
+    EdgeType.RELATED_TO.value: '#95a5a6',
+    EdgeType.HAS_TECH_DEBT.value: '#e67e22',
+    EdgeType.HAS_PERFORMANCE_ISSUE.value: '#d35400',
+    EdgeType.PROCESSES_DATA.value: '#3498db',
+}
+
+
+@lru_cache(maxsize=64)
+def _custom_node_colors(custom_types: FrozenSet[str]) -> Dict[str, str]:
+    """
+    Generate evenly distributed colors in HSV space for custom node types.
+    
+    Args:
+        custom_types: The custom node types.
+    
+    Returns:
+        Dictionary mapping each custom type to a hex color.
+    """
+    colors = {}
+    num_custom_types = len(custom_types)
+    for i, custom_type in enumerate(sorted(custom_types)):
+        h = i / float(num_custom_types + 1)
+        s = 0.7
+        v = 0.95
+        r, g, b = colorsys.hsv_to_rgb(h, s, v)
+        colors[custom_type] = "#{:02x}{:02x}{:02x}".format(int(r * 255), int(g * 255), int(b * 255))
+    return colors
+
+
+# Tooltip sections for node metadata, in display order
+_METADATA_GROUPS = ("core", "domain", "service", "dependencies", "tech_debt", "performance", "data", "other")
+
+
+@lru_cache(maxsize=None)
+def _metadata_group(key: str) -> str:
+    """
+    Get the tooltip section a node attribute is listed under.
+    
+    Args:
+        key: The flattened attribute key, without its prefix.
+    
+    Returns:
+        One of _METADATA_GROUPS.
+    """
+    if key == "domain" or key == "description":
+        return "core"
+    if key.startswith(("tech_debt", "techDebt", "tech-debt")):
+        return "tech_debt"
+    if key.startswith("performance"):
+        return "performance"
+    if key.startswith("data"):
+        return "data"
+    if key.startswith("service"):
+        return "service"
+    if key == "dependencies" or key.startswith(("depends_on", "imports", "requires")):
+        return "dependencies"
+    return "other"
+
+
+# Kinds of attribute values, as handled by KnowledgeGraph._add_attributes_to_data
+_SCALAR, _NONE, _DICT, _LIST, _OTHER = range(1, 6)
+
+# Kind of each value type seen so far; subclasses are classified on first sight
+_ATTRIBUTE_KINDS = {
+    str: _SCALAR,
+    int: _SCALAR,
+    float: _SCALAR,
+    bool: _SCALAR,
+    type(None): _NONE,
+    dict: _DICT,
+    list: _LIST,
+}
+
+
+def _attribute_kind(value: Any) -> int:
+    """Classify a value whose type is not yet in _ATTRIBUTE_KINDS, and remember its type."""
+    if isinstance(value, (str, int, float, bool)):
+        kind = _SCALAR
+    elif isinstance(value, dict):
+        kind = _DICT
+    elif isinstance(value, list):
+        kind = _LIST
+    else:
+        kind = _OTHER
+    _ATTRIBUTE_KINDS[type(value)] = kind
+    return kind
+
+# Characters that could cause issues in Graphviz node IDs
+_UNSAFE_GRAPHVIZ_ID_RE = re.compile(r'[^a-zA-Z0-9_]')
+# IDs that can be used as they are
+_SAFE_GRAPHVIZ_ID_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9_]*')
+
+
+def _sanitize_graphviz_id(node_id: str) -> str:
+    """
+    Make a node ID safe to use as a Graphviz node name.
+    
+    Args:
+        node_id: The original node ID.
+    
+    Returns:
+        The ID with unsafe characters replaced by underscores, starting with a letter.
+    """
+    if _SAFE_GRAPHVIZ_ID_RE.fullmatch(node_id):
+        return node_id
+    safe_id = _UNSAFE_GRAPHVIZ_ID_RE.sub('_', node_id)
+    # Ensure it starts with a letter
+    if safe_id and not safe_id[0].isalpha():
+        safe_id = 'n' + safe_id
+    return safe_id
+
+
+def _type_value(type_: Union[NodeType, EdgeType, str]) -> str:
+    """Get the string value of a node or edge type, which may be an enum or a custom string."""
+    return type_.value if isinstance(type_, Enum) else type_
+
+
+def _force_atlas_x(G: nx.DiGraph, pos: Dict[str, Tuple[float, float]],
+                   iterations: int = 50) -> Optional[Dict[str, float]]:
+    """
+    Compute horizontal node positions with a single Barnes-Hut ForceAtlas2 pass.
+    
+    Args:
+        G: The graph to lay out. Edge direction is ignored.
+        pos: Initial node positions.
+        iterations: Number of ForceAtlas2 iterations.
+    
+    Returns:
+        Dictionary mapping node IDs to x positions scaled to [-1, 1], like nx.spring_layout,
+        or None if fa2 or scipy is not installed.
+    """
+    try:
+        import scipy.sparse
+        from fa2 import ForceAtlas2
+    except ImportError:  # Optional speedup, see the "layout" extra in pyproject.toml
+        return None
+    import numpy as np
+    
+    nodes = list(G.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    rows = [index[u] for u, v in G.edges] + [index[v] for u, v in G.edges]
+    cols = [index[v] for u, v in G.edges] + [index[u] for u, v in G.edges]
+    # ForceAtlas2 expects a symmetric adjacency matrix
+    adjacency = scipy.sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(nodes), len(nodes)))
+    
+    force_atlas = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2, verbose=False)
+    positions = force_atlas.forceatlas2(adjacency, pos=np.array([pos[node] for node in nodes], dtype=float),
+                                        iterations=iterations)
+    
+    xs = np.array([x for x, _ in positions])
+    xs -= xs.mean()
+    extent = np.abs(xs).max()
+    if extent > 0:
+        xs /= extent
+    return dict(zip(nodes, xs.tolist()))
+
+
+# Graphs can hold very many nodes and edges, so their dataclasses use
+# DATACLASS_SLOTS. They are not frozen: their attribute dictionaries make them
+# unhashable either way, and a frozen dataclass sets every field through
+# object.__setattr__ when it is created.
+@dataclass(**DATACLASS_SLOTS)
 class Node:
     """A node in the knowledge graph."""
     id: str
@@ -61,45 +337,157 @@ class Node:
     label: str
     short_label: str = None
     attributes: Dict[str, Any] = field(default_factory=dict)
+    _type_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Resolve the type's string value once so serialization doesn't have to."""
+        self._type_str = _type_value(self.type)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        type_value = self.type.value if isinstance(self.type, NodeType) else self.type
         return {
             "id": self.id,
-            "type": type_value,
+            "type": self._type_str,
             "label": self.label,
             "short_label": self.short_label or self.label,
             "attributes": self.attributes
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Edge:
     """An edge in the knowledge graph."""
     source: str
     target: str
     type: Union[EdgeType, str]  # Can be either an enum value or a custom string type
     attributes: Dict[str, Any] = field(default_factory=dict)
+    _type_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Resolve the type's string value once so serialization doesn't have to."""
+        self._type_str = _type_value(self.type)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        type_value = self.type.value if isinstance(self.type, EdgeType) else self.type
         return {
             "source": self.source,
             "target": self.target,
-            "type": type_value,
+            "type": self._type_str,
             "attributes": self.attributes
         }
 
 
-@dataclass
+class EdgeList:
+    """
+    Edges stored as parallel lists, one per Edge field (struct of arrays).
+    
+    Supports the list operations used on KnowledgeGraph.edges (append, extend,
+    len, iteration and indexing), creating Edge objects only when they are read.
+    Export code reads the columns directly instead.
+    
+    Edges read by iteration or indexing are read-only snapshots: assigning to
+    their fields (edge.type = ...) is not stored back. Their attributes dict is
+    the stored one, so updating it in place does change the edge.
+    """
+    
+    __slots__ = ("sources", "targets", "types", "type_values", "attributes")
+    
+    def __init__(self, edges: Iterable[Edge] = ()):
+        """
+        Initialize the edge list.
+        
+        Args:
+            edges: Initial edges.
+        """
+        self.sources: List[str] = []
+        self.targets: List[str] = []
+        self.types: List[Union[EdgeType, str]] = []
+        self.type_values: List[str] = []
+        self.attributes: List[Dict[str, Any]] = []
+        self.extend(edges)
+    
+    def append(self, edge: Edge) -> None:
+        """Add an edge."""
+        self.sources.append(edge.source)
+        self.targets.append(edge.target)
+        self.types.append(edge.type)
+        self.type_values.append(edge._type_str)
+        self.attributes.append(edge.attributes)
+    
+    def extend(self, edges: Iterable[Edge]) -> None:
+        """Add many edges."""
+        if isinstance(edges, EdgeList):
+            # Column to column, without creating Edge objects
+            self.sources.extend(edges.sources)
+            self.targets.extend(edges.targets)
+            self.types.extend(edges.types)
+            self.type_values.extend(edges.type_values)
+            self.attributes.extend(edges.attributes)
+            return
+        append = self.append
+        for edge in edges:
+            append(edge)
+    
+    def __len__(self) -> int:
+        return len(self.sources)
+    
+    def __iter__(self) -> Iterator[Edge]:
+        return map(Edge, self.sources, self.targets, self.types, self.attributes)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Edge, List[Edge]]:
+        if isinstance(index, slice):
+            return list(map(Edge, self.sources[index], self.targets[index], self.types[index],
+                            self.attributes[index]))
+        return Edge(self.sources[index], self.targets[index], self.types[index], self.attributes[index])
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, EdgeList):
+            return (self.sources == other.sources and self.targets == other.targets
+                    and self.types == other.types and self.attributes == other.attributes)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"EdgeList({list(self)!r})"
+
+
+@dataclass(**DATACLASS_SLOTS)
 class KnowledgeGraph:
     """Knowledge graph representation of code and its metadata."""
     nodes: Dict[str, Node] = field(default_factory=dict)
-    edges: List[Edge] = field(default_factory=list)
+    # Edges read from this list are snapshots; see EdgeList
+    edges: EdgeList = field(default_factory=EdgeList)
     custom_node_types: Set[str] = field(default_factory=set)
     custom_edge_types: Set[str] = field(default_factory=set)
+    _type_counts: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Store edges column-wise and count the types of any nodes the graph was created with."""
+        if not isinstance(self.edges, EdgeList):
+            self.edges = EdgeList(self.edges)
+        self._type_counts.update(_type_value(node.type) for node in self.nodes.values())
+    
+    @property
+    def node_type_counts(self) -> Counter:
+        """Number of nodes of each type, keyed by type value (types with no nodes left are omitted)."""
+        return +self._type_counts
+    
+    def __contains__(self, node_id: str) -> bool:
+        """Check whether the graph has a node with the given ID."""
+        return node_id in self.nodes
+    
+    def get_node(self, node_id: str) -> Optional[Node]:
+        """
+        Look up a node by ID.
+        
+        Args:
+            node_id: The ID of the node.
+        
+        Returns:
+            The node, or None if the graph has no node with this ID.
+        """
+        return self.nodes.get(node_id)
     
     def add_node(self, node: Node) -> None:
         """
@@ -108,6 +496,10 @@ class KnowledgeGraph:
         Args:
             node: The node to add.
         """
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            self._type_counts[_type_value(previous.type)] -= 1
+        self._type_counts[_type_value(node.type)] += 1
         self.nodes[node.id] = node
     
     def add_edge(self, edge: Edge) -> None:
@@ -119,11 +511,66 @@ class KnowledgeGraph:
         """
         self.edges.append(edge)
     
+    def add_nodes(self, nodes: Iterable[Node]) -> None:
+        """
+        Add many nodes to the graph in one update.
+        
+        Args:
+            nodes: The nodes to add. Later nodes replace earlier ones with the same ID.
+        """
+        self._merge_nodes({node.id: node for node in nodes})
+    
+    def _merge_nodes(self, batch: Dict[str, Node]) -> None:
+        """
+        Add a dictionary of nodes keyed by ID, replacing nodes with the same ID.
+        
+        Merging a dictionary lets dict.update() size the node table once for the
+        whole batch.
+        
+        Args:
+            batch: The nodes to add, keyed by ID.
+        """
+        # Nodes being replaced no longer count towards their old type
+        if self.nodes:
+            for node_id in batch.keys() & self.nodes.keys():
+                self._type_counts[_type_value(self.nodes[node_id].type)] -= 1
+        self._type_counts.update(node._type_str for node in batch.values())
+        self.nodes.update(batch)
+    
+    def add_edges(self, edges: Iterable[Edge]) -> None:
+        """
+        Add many edges to the graph in one update.
+        
+        Args:
+            edges: The edges to add.
+        """
+        self.edges.extend(edges)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
+        # Same layout as Node.to_dict/Edge.to_dict, inlined to skip a method call per element
+        edges = self.edges
         return {
-            "nodes": [node.to_dict() for node in self.nodes.values()],
-            "edges": [edge.to_dict() for edge in self.edges]
+            "nodes": [
+                {
+                    "id": node.id,
+                    "type": node._type_str,
+                    "label": node.label,
+                    "short_label": node.short_label or node.label,
+                    "attributes": node.attributes
+                }
+                for node in self.nodes.values()
+            ],
+            "edges": [
+                {
+                    "source": source,
+                    "target": target,
+                    "type": type_value,
+                    "attributes": attributes
+                }
+                for source, target, type_value, attributes in zip(
+                    edges.sources, edges.targets, edges.type_values, edges.attributes)
+            ]
         }
     
     def to_json(self, file_path: str) -> None:
@@ -133,8 +580,8 @@ class KnowledgeGraph:
         Args:
             file_path: Path to the output file.
         """
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(dumps_bytes(self.to_dict(), indent=True))
     
     def to_networkx(self) -> nx.DiGraph:
         """
@@ -145,23 +592,19 @@ class KnowledgeGraph:
         """
         G = nx.DiGraph()
         
-        # Add nodes with attributes
-        for node_id, node in self.nodes.items():
-            G.add_node(
-                node_id,
-                label=node.label,
-                type=node.type,
-                **node.attributes
-            )
+        # Add nodes and edges with attributes in one batch each. label and type are
+        # applied last so an attribute of the same name cannot shadow them.
+        G.add_nodes_from(
+            (node_id, {**node.attributes, "label": node.label, "type": node.type})
+            for node_id, node in self.nodes.items()
+        )
         
-        # Add edges with attributes
-        for edge in self.edges:
-            G.add_edge(
-                edge.source,
-                edge.target,
-                type=edge.type,
-                **edge.attributes
-            )
+        edges = self.edges
+        G.add_edges_from(
+            (source, target, {**attributes, "type": edge_type})
+            for source, target, edge_type, attributes in zip(edges.sources, edges.targets, edges.types,
+                                                             edges.attributes)
+        )
         
         return G
     
@@ -175,6 +618,11 @@ class KnowledgeGraph:
             figsize: Size of the figure.
             title: Title of the visualization.
         """
+        # Plotting dependencies, see the "viz" extra in pyproject.toml. Imported here
+        # because matplotlib alone takes a noticeable fraction of a second to load.
+        import numpy as np
+        import matplotlib.pyplot as plt
+        
         G = self.to_networkx()
         
         # Set node labels to use short_label if available
@@ -188,36 +636,24 @@ class KnowledgeGraph:
                 node_labels[node_id] = data.get('label', node_id)
         
         # Create color map for node types
-        node_types = {data['type'] for _, data in G.nodes(data=True)}
-        colors = plt.cm.tab20(range(len(node_types)))
-        color_map = {t: c for t, c in zip(node_types, colors)}
+        node_types = sorted({data['type'] for _, data in G.nodes(data=True)})
+        type_index = {t: i for i, t in enumerate(node_types)}
+        type_colors = plt.cm.tab20(np.arange(len(node_types)))
         
-        # Get node colors
-        node_colors = [color_map[G.nodes[n]['type']] for n in G.nodes]
+        # Get node colors with one gather from the per-type colors
+        node_type_indices = np.fromiter((type_index[data['type']] for _, data in G.nodes(data=True)),
+                                        dtype=np.intp, count=G.number_of_nodes())
+        node_colors = type_colors[node_type_indices]
         
         # Create hierarchical layout based on node types and their relationships
         # Files at the top, then domains, services, classes, functions, variables
-        layer_types = {
-            "file": 0,
-            "domain": 1,
-            "service": 2, 
-            "team": 2,
-            "class": 3,
-            "function": 4, 
-            "method": 4,
-            "variable": 5,
-            "tech_debt": 6,
-            "performance": 6,
-            "data": 6
-        }
-        
-        # Assign positions based on layers
+        # (see _MATPLOTLIB_LAYERS)
         pos = {}
         nodes_by_layer = {}
         
         # Group nodes by layer
         for node, data in G.nodes(data=True):
-            layer = layer_types.get(data['type'], 0)
+            layer = _MATPLOTLIB_LAYERS.get(data['type'], 0)
             if layer not in nodes_by_layer:
                 nodes_by_layer[layer] = []
             nodes_by_layer[layer].append(node)
@@ -229,28 +665,33 @@ class KnowledgeGraph:
         # Position nodes in each layer
         for layer, nodes in nodes_by_layer.items():
             y = -layer * 2  # Negative to have top-to-bottom layout with more spacing
-            for i, node in enumerate(sorted(nodes)):
-                # Evenly space nodes horizontally, centered
-                x = (i - (len(nodes) - 1) / 2) * (width_scale / max(1, len(nodes)))
-                pos[node] = (x, y)
+            n = len(nodes)
+            # Evenly space nodes horizontally, centered
+            xs = (np.arange(n) - (n - 1) / 2) * (width_scale / max(1, n))
+            pos.update(zip(sorted(nodes), zip(xs.tolist(), [y] * n)))
         
         # Apply force-directed adjustments to spread nodes horizontally within layers
         # but maintain the vertical hierarchy
-        fixed_y = {}
-        for node, (x, y) in pos.items():
-            fixed_y[node] = y  # Remember the vertical position
+        fixed_y = {node: y for node, (_, y) in pos.items()}  # Remember the vertical position
         
-        # Apply spring layout only within each layer to avoid edge crossings
-        for layer, nodes in nodes_by_layer.items():
-            if len(nodes) > 1:
-                subgraph = G.subgraph(nodes)
-                sub_pos = nx.spring_layout(subgraph, k=2.0, iterations=50, 
-                                          pos={n: (pos[n][0], 0) for n in nodes})
-                
-                # Update x positions while keeping y positions fixed
-                for node in nodes:
-                    if node in sub_pos:
-                        pos[node] = (sub_pos[node][0] * width_scale / 2, fixed_y[node])
+        # One ForceAtlas2 pass over the whole graph, then snap back to the layer rows
+        force_x = _force_atlas_x(G, pos) if G.number_of_nodes() > 1 else None
+        if force_x is not None:
+            for node, x in force_x.items():
+                pos[node] = (x * width_scale / 2, fixed_y[node])
+        else:
+            # Apply spring layout only within each layer to avoid edge crossings. Small
+            # layers keep their evenly spaced positions, which are already good.
+            for layer, nodes in nodes_by_layer.items():
+                if len(nodes) > _SPRING_LAYOUT_MAX_EVEN_LAYER:
+                    subgraph = G.subgraph(nodes)
+                    sub_pos = nx.spring_layout(subgraph, k=2.0, iterations=50, seed=0,
+                                              pos={n: (pos[n][0], 0) for n in nodes})
+                    
+                    # Update x positions while keeping y positions fixed
+                    for node in nodes:
+                        if node in sub_pos:
+                            pos[node] = (sub_pos[node][0] * width_scale / 2, fixed_y[node])
         
         # Create high-quality figure with better resolution
         plt.figure(figsize=figsize, dpi=300, facecolor='white')
@@ -267,34 +708,35 @@ class KnowledgeGraph:
                                linewidths=2, edgecolors='white')
         
         # Draw edges with colors based on type, using curved edges to reduce overlap
-        edge_types = {G.edges[e]['type'] for e in G.edges}
+        edge_list = list(G.edges(data='type'))
+        # Types in order of first appearance, so colors are stable between runs
+        edge_types = list(dict.fromkeys(edge_type for _, _, edge_type in edge_list))
         edge_colors = plt.cm.tab10(range(len(edge_types)))
         edge_color_map = {t: c for t, c in zip(edge_types, edge_colors)}
         
-        for edge_type, color in edge_color_map.items():
-            edges_of_type = [(u, v) for u, v, data in G.edges(data=True) if data['type'] == edge_type]
-            if edges_of_type:
-                # Use curved edges with different curvature based on direction
-                for u, v in edges_of_type:
-                    # Determine if edge goes up or down in the hierarchy
-                    source_layer = layer_types.get(G.nodes[u]['type'], 0)
-                    target_layer = layer_types.get(G.nodes[v]['type'], 0)
-                    
-                    # Adjust curvature based on direction and distance
-                    if source_layer == target_layer:
-                        rad = 0.3  # Horizontal connections get more curve
-                    else:
-                        rad = 0.1  # Vertical connections get less curve
-                    
-                    nx.draw_networkx_edges(
-                        G, pos, 
-                        edgelist=[(u, v)], 
-                        edge_color=[color], 
-                        width=1.5, 
-                        alpha=0.7,
-                        connectionstyle=f'arc3,rad={rad}',
-                        arrowsize=15
-                    )
+        # Layer of every node, computed once rather than twice per edge
+        node_layer = {node: _MATPLOTLIB_LAYERS.get(data['type'], 0) for node, data in G.nodes(data=True)}
+        
+        # Classify all edges at once: horizontal connections get more curve, vertical ones less
+        source_layers = np.fromiter((node_layer[u] for u, _, _ in edge_list), dtype=np.intp, count=len(edge_list))
+        target_layers = np.fromiter((node_layer[v] for _, v, _ in edge_list), dtype=np.intp, count=len(edge_list))
+        rads = np.where(source_layers == target_layers, 0.3, 0.1).tolist()
+        
+        # Group edges by type and curvature so each group is drawn with one call
+        edge_batches: Dict[Tuple[Any, float], List[Tuple[str, str]]] = {}
+        for (u, v, edge_type), rad in zip(edge_list, rads):
+            edge_batches.setdefault((edge_type, rad), []).append((u, v))
+        
+        for (edge_type, rad), edgelist in edge_batches.items():
+            nx.draw_networkx_edges(
+                G, pos, 
+                edgelist=edgelist, 
+                edge_color=[edge_color_map[edge_type]] * len(edgelist), 
+                width=1.5, 
+                alpha=0.7,
+                connectionstyle=f'arc3,rad={rad}',
+                arrowsize=15
+            )
         
         # Draw labels with better positioning and fonts
         nx.draw_networkx_labels(
@@ -308,7 +750,7 @@ class KnowledgeGraph:
         )
         
         # Create legend for node types
-        node_patches = [plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=color_map[nt], 
+        node_patches = [plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=type_colors[type_index[nt]], 
                                   markersize=10, label=f'Node: {nt}') for nt in node_types]
         
         # Create legend for edge types
@@ -327,20 +769,19 @@ class KnowledgeGraph:
         else:
             plt.show()
     
-    def visualize_graphviz(self, output_path: str = None, format: str = 'png') -> None:
+    def visualize_graphviz(self, output_path: str = None, format: str = 'svg') -> None:
         """
         Visualize the graph using Graphviz.
         
         Args:
             output_path: Path to save the visualization. If None, returns the Graphviz object.
-            format: Output format (png, svg, pdf, etc.).
+            format: Output format (svg, png, pdf, dot, etc.).
         
         Returns:
             The Graphviz object if output_path is None.
         """
-        import tempfile
-        import shutil
-        import re
+        # See the "viz" extra in pyproject.toml
+        import graphviz
         
         # Create Graphviz graph
         dot = graphviz.Digraph(
@@ -377,37 +818,15 @@ class KnowledgeGraph:
             }
         )
         
-        # Node type colors
-        type_colors = {
-            "service": '#1f77b4',  # blue
-            "module": '#ff7f0e',   # orange
-            "class": '#2ca02c',    # green
-            "function": '#d62728', # red
-            "method": '#9467bd',   # purple
-            "variable": '#8c564b', # brown
-            "file": '#e377c2',     # pink
-            "domain": '#7f7f7f',   # grey
-            "concept": '#bcbd22',  # olive
-            "team": '#17becf',     # cyan
-            "tech_debt": '#000000', # black
-            "performance": '#ff9896', # light red
-            "data": '#aec7e8',     # light blue
-        }
-        
-        # Helper function to sanitize node IDs for Graphviz
-        def sanitize_id(node_id):
-            # Replace any characters that could cause issues in Graphviz
-            safe_id = re.sub(r'[^a-zA-Z0-9_]', '_', node_id)
-            # Ensure it starts with a letter
-            if safe_id and not safe_id[0].isalpha():
-                safe_id = 'n' + safe_id
-            return safe_id
-        
-        # Map original node IDs to sanitized IDs
-        node_id_map = {node_id: sanitize_id(node_id) for node_id in self.nodes.keys()}
+        # Map original node IDs to sanitized IDs and group the nodes by type in one pass
+        node_id_map = {}
+        nodes_by_type: Dict[Union[NodeType, str], List[Tuple[str, Node]]] = {}
+        for node_id, node in self.nodes.items():
+            node_id_map[node_id] = _sanitize_graphviz_id(node_id)
+            nodes_by_type.setdefault(node.type, []).append((node_id, node))
         
         # Create subgraphs for each type to improve clustering
-        for node_type in set(node.type for node in self.nodes.values()):
+        for node_type, type_nodes in nodes_by_type.items():
             with dot.subgraph(name=f'cluster_{node_type}') as c:
                 c.attr(label=node_type.capitalize(), 
                        style='filled,rounded', 
@@ -415,64 +834,38 @@ class KnowledgeGraph:
                        fontsize='16',
                        color='#dddddd')
                 
+                # Styling is the same for every node of this type
+                color, shape, fontcolor = (_GRAPHVIZ_NODE_STYLE_TABLE.get(node_type)
+                                           or _graphviz_node_style(node_type))
+                
                 # Add nodes of this type to the subgraph
-                for node_id, node in self.nodes.items():
-                    if node.type == node_type:
-                        # Get the appropriate color for this node type
-                        color = type_colors.get(node.type, '#aaaaaa')
-                        
-                        # Use short_label if available
-                        display_label = node.short_label if node.short_label else node.label
-                        
-                        # Set shape based on node type
-                        shape = 'box'
-                        if node.type == 'file':
-                            shape = 'folder'
-                        elif node.type in ['class', 'function', 'method']:
-                            shape = 'ellipse' 
-                        elif node.type in ['domain', 'service']:
-                            shape = 'hexagon'
-                        elif node.type == 'tech_debt':
-                            shape = 'diamond'
-                        
-                        # Add node with styling using sanitized ID
-                        c.node(
-                            node_id_map[node_id],
-                            label=display_label,
-                            fillcolor=color,
-                            fontcolor='white' if node.type in ['tech_debt', 'service'] else 'black',
-                            shape=shape,
-                            penwidth='1.5'
-                        )
-        
-        # Edge type styling with better colors and styles
-        edge_styles = {
-            "contains": {'color': '#0077cc', 'style': 'solid', 'weight': '10'},  # Strong blue
-            "uses": {'color': '#009900', 'style': 'solid', 'weight': '5'},       # Green
-            "depends_on": {'color': '#cc0000', 'style': 'solid', 'weight': '8'},  # Red
-            "calls": {'color': '#9900cc', 'style': 'solid', 'weight': '5'},      # Purple
-            "implements": {'color': '#ff6600', 'style': 'dashed', 'weight': '3'}, # Orange
-            "extends": {'color': '#996633', 'style': 'dashed', 'weight': '3'},   # Brown
-            "references": {'color': '#666666', 'style': 'dotted', 'weight': '1'}, # Grey
-            "owned_by": {'color': '#000000', 'style': 'dashed', 'weight': '3'},  # Black
-            "related_to": {'color': '#888888', 'style': 'dotted', 'weight': '1'}, # Grey
-            "has_tech_debt": {'color': '#ff0000', 'style': 'bold', 'weight': '2'}, # Red
-            "has_performance_issue": {'color': '#ff9900', 'style': 'bold', 'weight': '2'}, # Orange
-            "processes_data": {'color': '#0099cc', 'style': 'dashed', 'weight': '2'}, # Blue
-        }
+                for node_id, node in type_nodes:
+                    # Use short_label if available
+                    display_label = node.short_label if node.short_label else node.label
+                    
+                    # Add node with styling using sanitized ID
+                    c.node(
+                        node_id_map[node_id],
+                        label=display_label,
+                        fillcolor=color,
+                        fontcolor=fontcolor,
+                        shape=shape,
+                        penwidth='1.5'
+                    )
         
         # Add edges with styling using sanitized IDs
-        for edge in self.edges:
-            style = edge_styles.get(edge.type, {'color': '#000000', 'style': 'solid', 'weight': '1'})
+        edges = self.edges
+        for source, target, edge_type in zip(edges.sources, edges.targets, edges.types):
+            color, style, weight = _GRAPHVIZ_EDGE_STYLE_TABLE.get(edge_type, _GRAPHVIZ_DEFAULT_EDGE_STYLE)
             try:
                 dot.edge(
-                    node_id_map[edge.source], 
-                    node_id_map[edge.target], 
-                    label=edge.type, 
-                    color=style['color'], 
-                    style=style['style'],
+                    node_id_map[source], 
+                    node_id_map[target], 
+                    label=edge_type, 
+                    color=color, 
+                    style=style,
                     penwidth='1.5',
-                    weight=style['weight'],
+                    weight=weight,
                     arrowsize='0.8'
                 )
             except KeyError:
@@ -480,24 +873,15 @@ class KnowledgeGraph:
                 continue
         
         if output_path:
-            # Use a temporary file for rendering
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.gv')
-            temp_name = temp_file.name
-            temp_file.close()
-            
             try:
-                # First attempt: render the graph with default settings but high DPI in graph attributes
-                rendered_file = dot.render(temp_name, format=format, cleanup=True)
-                
-                # Copy the rendered file to the desired output path
-                shutil.copy(rendered_file, output_path)
-                
-                # Clean up temporary files
-                try:
-                    os.remove(rendered_file)
-                    os.remove(temp_name)
-                except:
-                    pass
+                if format in ('dot', 'gv'):
+                    # The source is the output, no need to run Graphviz
+                    data = dot.source.encode('utf-8')
+                else:
+                    # Render in memory and write the result once, without temporary files
+                    data = dot.pipe(format=format)
+                with open(output_path, 'wb') as f:
+                    f.write(data)
             except Exception as e:
                 print(f"Error generating Graphviz visualization: {e}")
                 # Fallback to matplotlib rendering
@@ -505,66 +889,51 @@ class KnowledgeGraph:
         
         return dot
 
-    def to_cytoscape_json(self) -> Dict[str, Any]:
+    def to_cytoscape_json(self, short_edge_ids: bool = False) -> Dict[str, Any]:
         """
         Convert to Cytoscape.js compatible JSON format with support for custom types.
         
+        Args:
+            short_edge_ids: Number the edges ("e0", "e1", ...) instead of deriving
+                their IDs from the source, type and target.
+        
         Returns:
             A dictionary with elements in Cytoscape.js format.
         """
         elements = []
         
-        # Node type colors (modern palette)
-        type_colors = {
-            # Default node types
-            NodeType.SERVICE.value: "#3498db",    # bright blue
-            NodeType.MODULE.value: "#e74c3c",     # bright red
-            NodeType.CLASS.value: "#2ecc71",      # bright green
-            NodeType.FUNCTION.value: "#9b59b6",   # purple
-            NodeType.METHOD.value: "#8e44ad",     # dark purple
-            NodeType.VARIABLE.value: "#f1c40f",   # yellow
-            NodeType.FILE.value: "#1abc9c",       # turquoise
-            NodeType.DOMAIN.value: "#34495e",     # dark blue
-            NodeType.CONCEPT.value: "#95a5a6",    # light gray
-            NodeType.TEAM.value: "#16a085",       # green
-            NodeType.TECH_DEBT.value: "#e67e22",  # orange
-            NodeType.PERFORMANCE.value: "#d35400", # dark orange
-            NodeType.DATA.value: "#3498db",       # blue
-        }
-        
-        # Generate colors for any custom node types
-        import colorsys
-        import random
+        type_colors = dict(_CYTOSCAPE_NODE_COLORS)
         
         # Add custom node types to the colors dictionary
         if self.custom_node_types:
-            num_custom_types = len(self.custom_node_types)
-            if num_custom_types > 0:
-                # Generate evenly distributed colors in HSV space
-                for i, custom_type in enumerate(sorted(self.custom_node_types)):
-                    h = i / float(num_custom_types + 1)
-                    s = 0.7
-                    v = 0.95
-                    r, g, b = colorsys.hsv_to_rgb(h, s, v)
-                    color = "#{:02x}{:02x}{:02x}".format(int(r * 255), int(g * 255), int(b * 255))
-                    type_colors[custom_type] = color
+            type_colors.update(_custom_node_colors(frozenset(self.custom_node_types)))
         
         # Generate nodes with classes and styling
+        node_types = set()
         for node_id, node in self.nodes.items():
             # Get node type as string
             node_type = node.type.value if isinstance(node.type, NodeType) else node.type
+            node_types.add(node_type)
             
             node_data = {
                 "id": node_id,
                 "label": node.label,
                 "short_label": node.short_label or node.label,
                 "type": node_type,
+                "color": type_colors.get(node_type, "#888"),
             }
             
             # Include all attributes as data for tooltips
             # Process nested attributes more flexibly
             self._add_attributes_to_data(node_data, node.attributes)
             
+            # Group the attribute keys by tooltip section once here, not on every hover
+            groups = {}
+            for key in node_data:
+                if key.startswith("attr_"):
+                    groups.setdefault(_metadata_group(key[5:]), []).append(key)
+            node_data["groups"] = {name: groups[name] for name in _METADATA_GROUPS if name in groups}
+            
             # Create node with styling based on type
             elements.append({
                 "data": node_data,
@@ -572,96 +941,147 @@ class KnowledgeGraph:
             })
         
         # Generate edges with classes and styling
+        edge_colors = dict(_CYTOSCAPE_EDGE_COLORS)
         edge_types = set()
-        for edge in self.edges:
-            # Get edge type as string
-            edge_type = edge.type.value if isinstance(edge.type, EdgeType) else edge.type
+        rand = random.random
+        edges = self.edges
+        for i, (source, target, edge_type, attributes) in enumerate(zip(edges.sources, edges.targets,
+                                                                        edges.type_values, edges.attributes)):
             edge_types.add(edge_type)
             
+            color = edge_colors.get(edge_type)
+            if color is None:
+                # Generate a random color for edge types without a predefined one
+                h = rand()
+                s = 0.7
+                v = 0.95
+                r, g, b = colorsys.hsv_to_rgb(h, s, v)
+                color = "#{:02x}{:02x}{:02x}".format(int(r * 255), int(g * 255), int(b * 255))
+                edge_colors[edge_type] = color
+            
             edge_data = {
-                "id": f"{edge.source}-{edge_type}-{edge.target}",
-                "source": edge.source,
-                "target": edge.target,
-                "type": edge_type
+                "id": f"e{i}" if short_edge_ids else f"{source}-{edge_type}-{target}",
+                "source": source,
+                "target": target,
+                "type": edge_type,
+                "color": color
             }
             
-            # Include attributes
-            self._add_attributes_to_data(edge_data, edge.attributes)
+            # Include attributes, and list their keys so tooltips need not scan the data
+            if attributes:
+                self._add_attributes_to_data(edge_data, attributes)
+                edge_data["attrs"] = [key for key in edge_data if key.startswith("attr_")]
             
             elements.append({
                 "data": edge_data,
                 "classes": edge_type
             })
         
-        # Generate colors for any edge types that don't have predefined colors
-        edge_colors = {
-            EdgeType.CONTAINS.value: '#3498db',
-            EdgeType.USES.value: '#2ecc71',
-            EdgeType.DEPENDS_ON.value: '#e74c3c',
-            EdgeType.CALLS.value: '#9b59b6',
-            EdgeType.IMPLEMENTS.value: '#f39c12',
-            EdgeType.EXTENDS.value: '#d35400',
-            EdgeType.REFERENCES.value: '#7f8c8d',
-            EdgeType.OWNED_BY.value: '#2c3e50',
-            EdgeType.RELATED_TO.value: '#95a5a6',
-            EdgeType.HAS_TECH_DEBT.value: '#e67e22',
-            EdgeType.HAS_PERFORMANCE_ISSUE.value: '#d35400',
-            EdgeType.PROCESSES_DATA.value: '#3498db',
-        }
-        
-        # Add custom edge types to the edge colors dictionary
-        for edge_type in edge_types:
-            if edge_type not in edge_colors:
-                # Generate a random color for this edge type
-                h = random.random()
-                s = 0.7
-                v = 0.95
-                r, g, b = colorsys.hsv_to_rgb(h, s, v)
-                color = "#{:02x}{:02x}{:02x}".format(int(r * 255), int(g * 255), int(b * 255))
-                edge_colors[edge_type] = color
-        
         return {
             "elements": elements, 
             "type_colors": type_colors,
             "edge_colors": edge_colors,
             "custom_node_types": list(self.custom_node_types),
-            "custom_edge_types": list(self.custom_edge_types)
+            "custom_edge_types": list(self.custom_edge_types),
+            "present_node_types": sorted(node_types),
+            "present_edge_types": sorted(edge_types)
         }
     
     def _add_attributes_to_data(self, data_dict: Dict[str, Any], attributes: Dict[str, Any], prefix: str = "attr_") -> None:
         """
-        Recursively add attributes to the data dictionary.
+        Flatten attributes into the data dictionary.
+        
+        Nested dictionaries are flattened with underscore notation, lists of simple
+        values are joined into a string, and top-level lists of dictionaries are
+        flattened item by item. Walks the attributes with an explicit stack rather
+        than recursion.
         
         Args:
             data_dict: The data dictionary to add attributes to.
             attributes: The attributes to add.
             prefix: Prefix for attribute keys.
         """
-        for key, value in attributes.items():
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                data_dict[f"{prefix}{key}"] = value
-            elif isinstance(value, dict):
-                # For nested dictionaries, flatten with underscore notation
-                for sub_key, sub_value in value.items():
-                    if isinstance(sub_value, (str, int, float, bool)) or sub_value is None:
-                        data_dict[f"{prefix}{key}_{sub_key}"] = sub_value
-                    elif isinstance(sub_value, dict):
-                        # If it's a nested dictionary, use recursive call
-                        self._add_attributes_to_data(data_dict, {f"{key}_{sub_key}": sub_value}, prefix)
-                    elif isinstance(sub_value, list) and all(isinstance(item, (str, int, float, bool)) for item in sub_value):
-                        data_dict[f"{prefix}{key}_{sub_key}"] = ", ".join(str(item) for item in sub_value)
-            elif isinstance(value, list):
-                if all(isinstance(item, (str, int, float, bool)) for item in value):
-                    # If all items are simple types, join as string
-                    data_dict[f"{prefix}{key}"] = ", ".join(str(item) for item in value)
-                elif all(isinstance(item, dict) for item in value):
-                    # If items are dictionaries, process each separately
-                    for i, item in enumerate(value):
-                        item_key = f"{key}_{i+1}"
-                        for item_subkey, item_value in item.items():
-                            if isinstance(item_value, (str, int, float, bool)) or item_value is None:
-                                data_dict[f"{prefix}{item_key}_{item_subkey}"] = item_value
+        kinds = _ATTRIBUTE_KINDS
+        # Each entry is (key prefix, remaining items, whether at the top level)
+        stack = [("", iter(attributes.items()), True)]
+        while stack:
+            key_prefix, items, top_level = stack[-1]
+            for key, value in items:
+                name = f"{key_prefix}{key}"
+                kind = kinds.get(type(value)) or _attribute_kind(value)
+                if kind <= _NONE:
+                    data_dict[prefix + name] = value
+                elif kind == _DICT:
+                    # Descend right away so keys keep their depth-first order
+                    stack.append((f"{name}_", iter(value.items()), False))
+                    break
+                elif kind == _LIST:
+                    item_kinds = [kinds.get(type(item)) or _attribute_kind(item) for item in value]
+                    if all(item_kind == _SCALAR for item_kind in item_kinds):
+                        # If all items are simple types, join as string
+                        data_dict[prefix + name] = ", ".join(str(item) for item in value)
+                    elif top_level and all(item_kind == _DICT for item_kind in item_kinds):
+                        # If items are dictionaries, process each separately
+                        for i, item in enumerate(value):
+                            for item_subkey, item_value in item.items():
+                                item_kind = kinds.get(type(item_value)) or _attribute_kind(item_value)
+                                if item_kind <= _NONE:
+                                    data_dict[f"{prefix}{name}_{i+1}_{item_subkey}"] = item_value
+            else:
+                stack.pop()
 
+    def _hierarchical_positions(self, node_sep: float = 110.0, rank_sep: float = 130.0) -> Dict[str, Tuple[float, float]]:
+        """
+        Compute a top-down layered layout, like the dagre layout of the interactive view.
+        
+        Cycles are collapsed first, nodes are ranked by their longest path from a
+        source and ordered within each rank by the mean position of their
+        predecessors in the rank above.
+        
+        Args:
+            node_sep: Horizontal distance between neighbouring nodes in a rank.
+            rank_sep: Vertical distance between ranks.
+        
+        Returns:
+            Dictionary mapping node IDs to (x, y) positions.
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes)
+        nodes = self.nodes
+        G.add_edges_from(
+            (source, target) for source, target in zip(self.edges.sources, self.edges.targets)
+            if source in nodes and target in nodes
+        )
+        
+        # Rank the strongly connected components, then their members
+        condensed = nx.condensation(G)
+        component_of = condensed.graph["mapping"]
+        component_rank = {}
+        for rank, generation in enumerate(nx.topological_generations(condensed)):
+            for component in generation:
+                component_rank[component] = rank
+        
+        ranks = [[] for _ in range(len(set(component_rank.values())))]
+        for node_id in nodes:
+            ranks[component_rank[component_of[node_id]]].append(node_id)
+        
+        positions = {}
+        for rank, layer in enumerate(ranks):
+            if rank > 0:
+                # Order by barycenter of the already placed predecessors; nodes without
+                # any keep their relative order at the end of the rank
+                def barycenter(node_id: str) -> float:
+                    xs = [positions[p][0] for p in G.predecessors(node_id) if p in positions]
+                    return sum(xs) / len(xs) if xs else float("inf")
+                layer.sort(key=barycenter)
+            
+            offset = (len(layer) - 1) / 2
+            y = rank * rank_sep
+            for i, node_id in enumerate(layer):
+                positions[node_id] = ((i - offset) * node_sep, y)
+        
+        return positions
+    
     def visualize_interactive(self, output_path: str = None, title: str = "ADP Knowledge Graph") -> None:
         """
         Create an interactive visualization using Cytoscape.js.
@@ -674,145 +1094,764 @@ class KnowledgeGraph:
             output_path = "adp_knowledge_graph.html"
         
         # Get data in cytoscape format
-        graph_data = self.to_cytoscape_json()
+        graph_data = self.to_cytoscape_json(short_edge_ids=True)
+        
+        # Lay the graph out once here, so the page opens without running a layout, and
+        # swap the long node IDs, which every edge repeats twice, for short numeric ones.
+        # Node elements come first, in the order of self.nodes; edges are already numbered.
+        elements = graph_data["elements"]
+        num_nodes = len(self.nodes)
+        positions = self._hierarchical_positions()
+        short_ids = {}
+        for i, element in enumerate(elements[:num_nodes]):
+            data = element["data"]
+            x, y = positions[data["id"]]
+            element["position"] = {"x": x, "y": y}
+            short_ids[data["id"]] = str(i)
+            data["id"] = str(i)
+        for element in elements[num_nodes:]:
+            data = element["data"]
+            data["source"] = short_ids.get(data["source"], data["source"])
+            data["target"] = short_ids.get(data["target"], data["target"])
+        graph_data["positions_precomputed"] = True
+        
+        # Embedded as a string for JSON.parse, which browsers parse faster than an object literal
+        data = dumps(graph_data).translate(_JS_STRING_ESCAPES)
+        
+        # Write the page around the graph data rather than building it as one string,
+        # encoding the data a chunk at a time so no full encoded copy is ever held
+        with open(output_path, 'wb') as f:
+            f.write(title.encode('utf-8').join(_HTML_HEADER_PARTS))
+            f.write(b"JSON.parse('")
+            f.writelines(data[i:i + _HTML_WRITE_CHUNK_SIZE].encode('utf-8')
+                         for i in range(0, len(data), _HTML_WRITE_CHUNK_SIZE))
+            f.write(b"')")
+            f.write(_HTML_FOOTER_BYTES)
         
-        # Generate HTML template with embedded Cytoscape.js
-        html_template = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{title}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 0;
-            background-color: #f9f9f9;
-            color: #333;
-        }}
-        #cy {{
-            width: 100%;
-            height: 85vh;
-            display: block;
-            background-color: #ffffff;
-            border-radius: 8px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            padding: 15px 20px;
-            background-color: #34495e;
-            color: white;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            border-bottom: 1px solid #2c3e50;
-        }}
-        .controls {{
-            padding: 10px 20px;
-            background-color: #ecf0f1;
-            border-bottom: 1px solid #ddd;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            align-items: center;
-        }}
-        button, select {{
-            padding: 8px 12px;
-            border: none;
-            border-radius: 4px;
-            background-color: #3498db;
-            color: white;
-            cursor: pointer;
-            font-size: 14px;
-            transition: background-color 0.2s;
-        }}
-        button:hover {{
-            background-color: #2980b9;
-        }}
-        .search-container {{
-            display: flex;
-            align-items: center;
-            margin-left: auto;
-        }}
-        #search {{
-            padding: 8px 12px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            margin-right: 5px;
-            width: 200px;
-        }}
-        .legend {{
-            position: absolute;
-            top: 70px;
-            right: 20px;
-            background-color: rgba(255, 255, 255, 0.9);
-            border-radius: 8px;
-            padding: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            z-index: 1000;
-            max-height: 80vh;
-            overflow-y: auto;
-            font-size: 12px;
-            width: 200px;
-        }}
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 5px;
-        }}
-        .legend-color {{
-            width: 16px;
-            height: 16px;
-            margin-right: 8px;
-            border-radius: 3px;
-        }}
-        .tooltip {{
-            position: absolute;
-            background-color: #fff;
-            border-radius: 8px;
-            padding: 15px;
-            box-shadow: 0 3px 14px rgba(0,0,0,0.25);
-            max-width: 400px;
-            z-index: 1001;
-            font-size: 13px;
-            display: none;
-            pointer-events: none;
-            overflow-y: auto;
-            max-height: 60vh;
-            transition: opacity 0.2s;
-        }}
-        .tooltip h3 {{
-            margin-top: 0;
-            margin-bottom: 8px;
-            font-size: 16px;
-            border-bottom: 1px solid #eee;
-            padding-bottom: 8px;
-            color: #2c3e50;
-        }}
-        .tooltip h4 {{
-            margin: 12px 0 6px 0;
-            font-size: 14px;
-            color: #2980b9;
-            border-bottom: 1px dashed #eee;
-            padding-bottom: 4px;
-        }}
-        .tooltip p {{
-            margin: 4px 0;
-            display: flex;
-            align-items: baseline;
-        }}
-        .tooltip-label {{
+        print(f"Interactive visualization saved to {output_path}")
+        print(f"Open this HTML file in a web browser to view the interactive graph")
+        
+        return output_path
+
+
+# Node type of the primary node for each metadata block scope
+_SCOPE_NODE_TYPES = {
+    "file": NodeType.FILE,
+    "class": NodeType.CLASS,
+    "function": NodeType.FUNCTION,
+    "method": NodeType.METHOD,
+    "variable": NodeType.VARIABLE,
+}
+
+# Metadata categories that become nodes of a known type.
+# Category name: (node type, edge type, node prefix)
+_KNOWN_CATEGORIES = {
+    "tech_debt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
+    "techDebt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
+    "tech-debt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
+    "performance": (NodeType.PERFORMANCE, EdgeType.HAS_PERFORMANCE_ISSUE, "perf"),
+    "data_handling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
+    "dataHandling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
+    "data-handling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
+}
+_KNOWN_CATEGORY_KEYS = frozenset(_KNOWN_CATEGORIES)
+
+# Schema properties handled by the builder itself rather than as custom entities
+_BUILTIN_PROPERTIES = frozenset({"domain", "dependencies", "name", "service"})
+
+# ID prefix of the primary node for each node type
+_NODE_ID_PREFIXES = {node_type: f"{node_type.value}:" for node_type in NodeType}
+
+# Synonymous metadata keys for each kind of connection, in processing order
+_DEPENDENCY_KEYS = ("dependencies", "depends_on", "imports", "requires")
+_SERVICE_KEYS = ("service", "serviceBoundary", "service-boundary", "service_boundary")
+_TEAM_KEYS = ("teamOwner", "team_owner", "team", "owner")
+_EXTENDS_KEYS = ("extends", "parent", "inherits", "superclass")
+_IMPLEMENTS_KEYS = ("implements", "interfaces")
+_CALLS_KEYS = ("calls", "invokes", "uses_functions")
+
+# Keys whose string value labels a category node, by priority, and the fallback
+# label for each node type
+_CATEGORY_LABEL_KEYS = ("name", "issue", "title", "type", "consideration", "dataType")
+_CATEGORY_DEFAULT_LABELS = {node_type: node_type.value.replace("_", " ").capitalize() for node_type in NodeType}
+
+# Values of the built-in types; anything else is registered as a custom type
+_NODE_TYPE_VALUES = frozenset(node_type.value for node_type in NodeType)
+_EDGE_TYPE_VALUES = frozenset(edge_type.value for edge_type in EdgeType)
+
+
+class GraphBuilder:
+    """Builder for creating knowledge graphs from ADP metadata."""
+    
+    def __init__(self, schema_name: str = None):
+        """
+        Initialize the graph builder.
+        
+        Args:
+            schema_name: Name of the schema to use. If None, uses the active schema.
+        """
+        self.graph = KnowledgeGraph()
+        self.processed_files = set()
+        self.schema = get_schema(schema_name)
+        # Schema properties that may describe custom entities, filtered once up front
+        self._custom_schema_properties = tuple(
+            prop_name for prop_name in self.schema.schema.get("properties", {})
+            if prop_name not in _KNOWN_CATEGORIES and prop_name not in _BUILTIN_PROPERTIES
+        )
+        self._custom_schema_property_keys = frozenset(self._custom_schema_properties)
+        self.custom_node_types = set()
+        self.custom_edge_types = set()
+        # Nodes and edges produced while processing files, written to the graph in bulk
+        self._pending_nodes: Dict[str, Node] = {}
+        self._pending_edges = EdgeList()
+        # IDs of all nodes in the graph or staged for it, so existence is a single probe.
+        # Shared nodes are checked for before they are built rather than inserted with
+        # setdefault(), which would construct a Node for every reference to them.
+        self._node_ids: Set[str] = set(self.graph.nodes)
+        # (source, target, type) of every edge, since blocks often repeat a reference
+        # (the same dependency under two synonymous keys, say). EdgeType values are
+        # strings, so enum and string types of the same value compare equal.
+        self._edge_keys: Set[Tuple[str, str, Union[EdgeType, str]]] = set(
+            zip(self.graph.edges.sources, self.graph.edges.targets, self.graph.edges.types)
+        )
+        # Node type and handler for each metadata block scope. File-scope blocks get
+        # their own handler, as they are not connected to the file they describe.
+        self._scope_handlers = {
+            scope: (node_type, self._process_metadata_file if node_type is NodeType.FILE
+                    else self._process_metadata_child)
+            for scope, node_type in _SCOPE_NODE_TYPES.items()
+        }
+        # One shared attribute dictionary per distinct flat category entry
+        self._shared_category_data: Dict[Tuple[Tuple[str, type, Any], ...], Dict[str, Any]] = {}
+    
+    def _stage_node(self, node: Node) -> None:
+        """Stage a node for the next bulk write, replacing any staged node with the same ID."""
+        self._pending_nodes[node.id] = node
+        self._node_ids.add(node.id)
+    
+    def _stage_edge(self, source: str, target: str, edge_type: Union[EdgeType, str]) -> None:
+        """
+        Stage an edge for the next bulk write, unless the graph already has it.
+        
+        Args:
+            source: The ID of the source node.
+            target: The ID of the target node.
+            edge_type: The type of the edge.
+        """
+        edge_key = (source, target, edge_type)
+        if edge_key in self._edge_keys:
+            return
+        self._edge_keys.add(edge_key)
+        self._pending_edges.append(Edge(source=source, target=target, type=edge_type))
+    
+    def _has_node(self, node_id: str) -> bool:
+        """Check whether a node exists in the graph or is staged for it."""
+        return node_id in self._node_ids
+    
+    def _flush(self) -> None:
+        """Write all staged nodes and edges to the graph."""
+        if self._pending_nodes:
+            # Staged nodes are already keyed by ID, so hand the dictionary over as is
+            self.graph._merge_nodes(self._pending_nodes)
+            self._pending_nodes = {}
+        if self._pending_edges:
+            self.graph.add_edges(self._pending_edges)
+            self._pending_edges = EdgeList()
+    
+    def add_file(self, parsed_file: ParsedFile) -> None:
+        """
+        Add a file to the knowledge graph.
+        
+        Args:
+            parsed_file: The parsed file to add.
+        """
+        self._stage_file(parsed_file)
+        self._flush()
+    
+    def add_files(self, parsed_files: Iterable[ParsedFile]) -> None:
+        """
+        Add many files to the knowledge graph with a single bulk write.
+        
+        Args:
+            parsed_files: The parsed files to add.
+        """
+        # Files are staged serially, in order. The first file mentioning a shared node
+        # decides its attributes, and per file the work is cheaper than pickling the
+        # metadata to a worker process and the nodes back (parsing, the expensive
+        # part, is already spread over processes by the CLI).
+        for parsed_file in parsed_files:
+            self._stage_file(parsed_file)
+        self._flush()
+    
+    def _stage_file(self, parsed_file: ParsedFile) -> None:
+        """
+        Stage the nodes and edges for a file without writing them to the graph.
+        
+        Args:
+            parsed_file: The parsed file to add.
+        """
+        file_path = parsed_file.file_path
+        if file_path in self.processed_files:
+            return
+        
+        # Add file node
+        file_name = os.path.basename(file_path)
+        # Sanitize file path for use as node ID
+        sanitized_path = file_path.replace('/', '_').replace('\\', '_')
+        file_id = f"file:{sanitized_path}"
+        self._stage_node(Node(
+            id=file_id,
+            type=NodeType.FILE,
+            label=file_path,
+            short_label=file_name,
+            attributes={"path": file_path}
+        ))
+        
+        # Process metadata blocks, skipping scopes without a node type. Blocks stay in
+        # file order rather than being grouped by scope, because the first block that
+        # mentions a shared node (a service, say) decides that node's attributes.
+        scope_handler_of = self._scope_handlers.get
+        for metadata_block in parsed_file.metadata_blocks:
+            scope_handler = scope_handler_of(metadata_block.scope)
+            if scope_handler is None:
+                continue
+            node_type, process_metadata = scope_handler
+            
+            # Generate a unique ID for the metadata block
+            block_id = f"{file_id}:{metadata_block.line_number}"
+            process_metadata(metadata_block, block_id, file_id, file_name, node_type)
+        
+        self.processed_files.add(file_path)
+    
+    def _process_metadata_file(self, metadata_block: ADPMetadata, block_id: str, file_id: str, file_name: str, node_type: NodeType) -> None:
+        """
+        Process a file-scope metadata block.
+        
+        Args:
+            metadata_block: The metadata block to process.
+            block_id: The ID of the metadata block.
+            file_id: The ID of the file.
+            file_name: The name of the file.
+            node_type: The type of node for this metadata.
+        """
+        metadata = metadata_block.metadata
+        node_id = self._stage_metadata_node(metadata, block_id, file_name, node_type)
+        
+        # Process connections based on available metadata
+        self._process_connections(metadata, node_id, file_id, node_type)
+        
+        # Process custom node types (domains, concepts, etc.)
+        self._process_custom_nodes(metadata, node_id)
+    
+    def _process_metadata_child(self, metadata_block: ADPMetadata, block_id: str, file_id: str, file_name: str, node_type: NodeType) -> None:
+        """
+        Process the metadata block of a scope inside a file (a class, function, ...).
+        
+        Args:
+            metadata_block: The metadata block to process.
+            block_id: The ID of the metadata block.
+            file_id: The ID of the file.
+            file_name: The name of the file.
+            node_type: The type of node for this metadata.
+        """
+        metadata = metadata_block.metadata
+        node_id = self._stage_metadata_node(metadata, block_id, file_name, node_type)
+        
+        # Connect to file
+        self._stage_edge(file_id, node_id, EdgeType.CONTAINS)
+        
+        # Process connections based on available metadata
+        self._process_connections(metadata, node_id, file_id, node_type)
+        
+        # Process custom node types (domains, concepts, etc.)
+        self._process_custom_nodes(metadata, node_id)
+    
+    def _stage_metadata_node(self, metadata: Dict[str, Any], block_id: str, file_name: str, node_type: NodeType) -> str:
+        """
+        Stage the primary node of a metadata block.
+        
+        Args:
+            metadata: The metadata dictionary.
+            block_id: The ID of the metadata block.
+            file_name: The name of the file.
+            node_type: The type of node for this metadata.
+        
+        Returns:
+            The ID of the node.
+        """
+        # Lazy %-formatting, so the metadata is only rendered when debug logging is on
+        logger.debug("Processing metadata block: %s", metadata)
+        
+        # Use name from metadata if available, otherwise check scope_name, then fallback to default naming
+        node_name = metadata.get("name")
+        if node_name is None:
+            # Try scope_name as an alternative
+            node_name = metadata.get("scope_name")
+            if node_name is None:
+                # If both name and scope_name are not available, use default naming
+                node_name = f"{node_type.value.capitalize()} in {file_name}"
+        logger.debug("Using node name: %s", node_name)
+        
+        # Generate a unique ID for this node
+        node_id = _NODE_ID_PREFIXES[node_type] + block_id
+        
+        # Add node to graph. The node shares the parsed block's dictionary rather than
+        # a slimmed copy: a copy would only add memory while the parsed files are alive,
+        # and keys already turned into nodes and edges (domain, dependencies, service)
+        # are still exported and shown in the interactive view's tooltips.
+        self._stage_node(Node(
+            id=node_id,
+            type=node_type,
+            label=f"{node_name} ({file_name})",
+            short_label=node_name,
+            attributes=metadata  # Include all metadata as attributes
+        ))
+        return node_id
+    
+    def _process_connections(self, metadata: Dict[str, Any], node_id: str, file_id: str, node_type: NodeType) -> None:
+        """
+        Process connections based on available metadata.
+        
+        Args:
+            metadata: The metadata dictionary.
+            node_id: The ID of the current node.
+            file_id: The ID of the file containing this node.
+            node_type: The type of current node.
+        """
+        # IDs of shared nodes (domains, modules, services, ...) are interned, since the
+        # same ID is rebuilt for every block referring to it and stored in every edge
+        
+        # Domain connections
+        if "domain" in metadata:
+            domain_id = sys.intern(f"domain:{metadata['domain']}")
+            domain_label = metadata['domain']
+            
+            # Add domain node if not exists
+            if not self._has_node(domain_id):
+                self._stage_node(Node(
+                    id=domain_id,
+                    type=NodeType.DOMAIN,
+                    label=domain_label,
+                    short_label=domain_label
+                ))
+            
+            # Connect node to domain
+            self._stage_edge(node_id, domain_id, EdgeType.RELATED_TO)
+        
+        # Each group of synonymous keys is only walked if the metadata has one of them,
+        # which keys().isdisjoint() checks in a single C-level pass
+        # Metadata values come from JSON parsing, so exact type checks are safe here
+        keys = metadata.keys()
+        
+        # Process dependencies (flexible key names)
+        for key in (_DEPENDENCY_KEYS if not keys.isdisjoint(_DEPENDENCY_KEYS) else ()):
+            deps = metadata.get(key)
+            if type(deps) is list:
+                for dep in deps:
+                    # Create dependency nodes based on type
+                    if isinstance(dep, str):
+                        # Simple string dependency
+                        if '.' in dep:
+                            # Likely a module or class
+                            dep_type = NodeType.MODULE
+                            dep_id = sys.intern(f"module:{dep}")
+                        else:
+                            # Likely a file
+                            dep_type = NodeType.FILE
+                            sanitized_dep = dep.replace('/', '_').replace('\\', '_')
+                            dep_id = sys.intern(f"file:{sanitized_dep}")
+                        
+                        # Add dependency node if not exists
+                        if not self._has_node(dep_id):
+                            # Last path component, treating both separators alike
+                            dep_name = dep[max(dep.rfind('/'), dep.rfind('\\')) + 1:]
+                            self._stage_node(Node(
+                                id=dep_id,
+                                type=dep_type,
+                                label=dep,
+                                short_label=dep_name
+                            ))
+                        
+                        # Connect node to dependency
+                        self._stage_edge(node_id, dep_id, EdgeType.DEPENDS_ON)
+        
+        # Process service boundary information (flexible schema)
+        for service_key in (_SERVICE_KEYS if not keys.isdisjoint(_SERVICE_KEYS) else ()):
+            if service_key in metadata:
+                service_info = metadata[service_key]
+                
+                # Handle both string and dictionary formats
+                if isinstance(service_info, str):
+                    service_name = service_info
+                    service_data = {}
+                elif isinstance(service_info, dict):
+                    service_name = service_info.get("service") or service_info.get("name")
+                    service_data = service_info
+                else:
+                    continue
+                
+                if service_name:
+                    service_id = sys.intern(f"service:{service_name}")
+                    
+                    # Add service node if not exists
+                    if not self._has_node(service_id):
+                        self._stage_node(Node(
+                            id=service_id,
+                            type=NodeType.SERVICE,
+                            label=service_name,
+                            short_label=service_name,
+                            attributes=service_data
+                        ))
+                    
+                    # Connect node to service
+                    self._stage_edge(node_id, service_id, EdgeType.DEPENDS_ON)
+                    
+                    # Process team ownership (several possible key names)
+                    team_name = next((service_data[team_key] for team_key in _TEAM_KEYS if team_key in service_data),
+                                     None)
+                    
+                    if team_name:
+                        team_id = sys.intern(f"team:{team_name}")
+                        
+                        # Add team node if not exists
+                        if not self._has_node(team_id):
+                            self._stage_node(Node(
+                                id=team_id,
+                                type=NodeType.TEAM,
+                                label=team_name,
+                                short_label=team_name
+                            ))
+                        
+                        # Connect service to team
+                        self._stage_edge(service_id, team_id, EdgeType.OWNED_BY)
+        
+        # Process class relationships (inheritance, implementation)
+        if node_type == NodeType.CLASS:
+            # Inheritance (multiple possible key names)
+            for extends_key in (_EXTENDS_KEYS if not keys.isdisjoint(_EXTENDS_KEYS) else ()):
+                if extends_key in metadata:
+                    parent_class = metadata[extends_key]
+                    if isinstance(parent_class, str):
+                        parent_id = sys.intern(f"class:{parent_class}")
+                        
+                        # Add parent class node if not exists
+                        if not self._has_node(parent_id):
+                            self._stage_node(Node(
+                                id=parent_id,
+                                type=NodeType.CLASS,
+                                label=parent_class,
+                                short_label=parent_class
+                            ))
+                        
+                        # Connect class to parent
+                        self._stage_edge(node_id, parent_id, EdgeType.EXTENDS)
+            
+            # Interface implementation (multiple possible key names)
+            for implements_key in (_IMPLEMENTS_KEYS if not keys.isdisjoint(_IMPLEMENTS_KEYS) else ()):
+                interfaces = metadata.get(implements_key)
+                if type(interfaces) is list:
+                    for interface in interfaces:
+                        interface_id = sys.intern(f"class:{interface}")
+                        
+                        # Add interface node if not exists
+                        if not self._has_node(interface_id):
+                            self._stage_node(Node(
+                                id=interface_id,
+                                type=NodeType.CLASS,
+                                label=interface,
+                                short_label=interface,
+                                attributes={"is_interface": True}
+                            ))
+                        
+                        # Connect class to interface
+                        self._stage_edge(node_id, interface_id, EdgeType.IMPLEMENTS)
+        
+        # Process function/method relationships
+        if node_type in (NodeType.FUNCTION, NodeType.METHOD):
+            # Function calls (multiple possible key names)
+            for calls_key in (_CALLS_KEYS if not keys.isdisjoint(_CALLS_KEYS) else ()):
+                called_fns = metadata.get(calls_key)
+                if type(called_fns) is list:
+                    for called_fn in called_fns:
+                        if isinstance(called_fn, str):
+                            # Simple string function reference
+                            called_id = sys.intern(f"function:{called_fn}")
+                            
+                            # Add called function node if not exists
+                            if not self._has_node(called_id):
+                                self._stage_node(Node(
+                                    id=called_id,
+                                    type=NodeType.FUNCTION,
+                                    label=called_fn,
+                                    short_label=called_fn
+                                ))
+                            
+                            # Connect function to called function
+                            self._stage_edge(node_id, called_id, EdgeType.CALLS)
+    
+    def _process_custom_nodes(self, metadata: Dict[str, Any], node_id: str) -> None:
+        """
+        Process custom node types from metadata.
+        
+        Args:
+            metadata: The metadata dictionary.
+            node_id: The ID of the current node.
+        """
+        # Process each known category if present in metadata. Categories are walked in
+        # table order, since synonyms share node IDs and the last one present wins.
+        has_categories = not metadata.keys().isdisjoint(_KNOWN_CATEGORY_KEYS)
+        for category_key, (node_type, edge_type, prefix) in (_KNOWN_CATEGORIES.items() if has_categories else ()):
+            category_data = metadata.get(category_key)
+            
+            # Handle both list and dictionary formats
+            if type(category_data) is list:
+                for index, item in enumerate(category_data):
+                    self._add_custom_node(node_id, item, node_type, edge_type, f"{prefix}:{index}")
+            elif type(category_data) is dict:
+                self._add_custom_node(node_id, category_data, node_type, edge_type, prefix)
+        
+        # Most blocks only use core keys, so skip the schema walk unless the metadata
+        # has at least one custom property. The walk itself stays in schema order.
+        if metadata.keys().isdisjoint(self._custom_schema_property_keys):
+            return
+        
+        # Look for any custom properties in the schema and create nodes/edges as appropriate
+        for prop_name in self._custom_schema_properties:
+            # Check if the property is in the metadata
+            if prop_name in metadata:
+                prop_value = metadata[prop_name]
+                
+                # Handle objects that might represent entities
+                if isinstance(prop_value, dict) and "name" in prop_value:
+                    # This looks like an entity with a name
+                    entity_name = prop_value["name"]
+                    entity_type = prop_name.replace("_", "-").replace(" ", "-")
+                    
+                    # Register custom node type
+                    if entity_type not in _NODE_TYPE_VALUES:
+                        self.custom_node_types.add(entity_type)
+                    
+                    # Create custom node
+                    entity_id = sys.intern(f"{entity_type}:{entity_name}")
+                    if not self._has_node(entity_id):
+                        self._stage_node(Node(
+                            id=entity_id,
+                            type=entity_type,  # Use string for custom type
+                            label=entity_name,
+                            short_label=entity_name,
+                            attributes=prop_value
+                        ))
+                    
+                    # Create relationship
+                    relationship_type = f"has_{entity_type}"
+                    if relationship_type not in _EDGE_TYPE_VALUES:
+                        self.custom_edge_types.add(relationship_type)
+                    
+                    self._stage_edge(node_id, entity_id, relationship_type)  # Use string for custom type
+    
+    def _add_custom_node(self, parent_id: str, data: Dict[str, Any], node_type: NodeType, edge_type: EdgeType, prefix: str) -> None:
+        """
+        Add a custom node based on metadata.
+        
+        Args:
+            parent_id: The ID of the parent node.
+            data: The data for the custom node.
+            node_type: The type of node.
+            edge_type: The type of edge to connect parent and custom node.
+            prefix: Prefix for the custom node ID.
+        """
+        # Determine label based on data content
+        label = None
+        # List items need not be dictionaries
+        if isinstance(data, dict):
+            for key in _CATEGORY_LABEL_KEYS:
+                value = data.get(key)
+                if isinstance(value, str):
+                    label = value
+                    break
+        
+        if not label:
+            # Use node type as fallback label
+            label = _CATEGORY_DEFAULT_LABELS[node_type]
+        
+        # Create unique ID for this custom node
+        custom_id = f"{parent_id}:{prefix}"
+        
+        # The same tech debt, performance or data entry tends to repeat across many
+        # blocks; nodes of equal entries share one attribute dictionary. Value types
+        # are part of the key so that, say, 1 and True are not merged.
+        if isinstance(data, dict):
+            try:
+                key = tuple((name, type(value), value) for name, value in data.items())
+                data = self._shared_category_data.setdefault(key, data)
+            except TypeError:
+                # Nested values are unhashable, keep this entry's own dictionary
+                pass
+        
+        # Add custom node
+        self._stage_node(Node(
+            id=custom_id,
+            type=node_type,
+            label=label,
+            short_label=label,
+            attributes=data
+        ))
+        
+        # Connect parent to custom node
+        self._stage_edge(parent_id, custom_id, edge_type)
+    
+    def build_from_parsed_files(self, parsed_files: List[ParsedFile]) -> KnowledgeGraph:
+        """
+        Build a knowledge graph from parsed files.
+        
+        Args:
+            parsed_files: List of parsed files.
+        
+        Returns:
+            The built knowledge graph.
+        """
+        self.add_files(parsed_files)
+        return self.graph 
+
+
+# HTML page written by KnowledgeGraph.visualize_interactive, split around the
+# embedded graph data. The header contains {title} fields for the page title.
+_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 0;
+            background-color: #f9f9f9;
+            color: #333;
+        }
+        #cy {
+            width: 100%;
+            height: 85vh;
+            display: block;
+            background-color: #ffffff;
+            border-radius: 8px;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        }
+        .header {
+            padding: 15px 20px;
+            background-color: #34495e;
+            color: white;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            border-bottom: 1px solid #2c3e50;
+        }
+        .controls {
+            padding: 10px 20px;
+            background-color: #ecf0f1;
+            border-bottom: 1px solid #ddd;
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+        }
+        button, select {
+            padding: 8px 12px;
+            border: none;
+            border-radius: 4px;
+            background-color: #3498db;
+            color: white;
+            cursor: pointer;
+            font-size: 14px;
+            transition: background-color 0.2s;
+        }
+        button:hover {
+            background-color: #2980b9;
+        }
+        .search-container {
+            display: flex;
+            align-items: center;
+            margin-left: auto;
+        }
+        #search {
+            padding: 8px 12px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            margin-right: 5px;
+            width: 200px;
+        }
+        .legend {
+            position: absolute;
+            top: 70px;
+            right: 20px;
+            background-color: rgba(255, 255, 255, 0.9);
+            border-radius: 8px;
+            padding: 10px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            z-index: 1000;
+            max-height: 80vh;
+            overflow-y: auto;
+            font-size: 12px;
+            width: 200px;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            margin-bottom: 5px;
+        }
+        .legend-color {
+            width: 16px;
+            height: 16px;
+            margin-right: 8px;
+            border-radius: 3px;
+        }
+        .tooltip {
+            position: absolute;
+            background-color: #fff;
+            border-radius: 8px;
+            padding: 15px;
+            box-shadow: 0 3px 14px rgba(0,0,0,0.25);
+            max-width: 400px;
+            z-index: 1001;
+            font-size: 13px;
+            display: none;
+            pointer-events: none;
+            overflow-y: auto;
+            max-height: 60vh;
+            transition: opacity 0.2s;
+        }
+        .tooltip h3 {
+            margin-top: 0;
+            margin-bottom: 8px;
+            font-size: 16px;
+            border-bottom: 1px solid #eee;
+            padding-bottom: 8px;
+            color: #2c3e50;
+        }
+        .tooltip h4 {
+            margin: 12px 0 6px 0;
+            font-size: 14px;
+            color: #2980b9;
+            border-bottom: 1px dashed #eee;
+            padding-bottom: 4px;
+        }
+        .tooltip p {
+            margin: 4px 0;
+            display: flex;
+            align-items: baseline;
+        }
+        .tooltip-label {
             font-weight: 600;
             display: inline-block;
             min-width: 100px;
             color: #555;
             flex-shrink: 0;
-        }}
-        .tooltip-value {{
+        }
+        .tooltip-value {
             word-break: break-word;
             flex-grow: 1;
-        }}
-        .badge {{
+        }
+        .badge {
             display: inline-block;
             background-color: #3498db;
             color: white;
@@ -821,26 +1860,26 @@ class KnowledgeGraph:
             font-size: 11px;
             margin-right: 5px;
             font-weight: normal;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-weight: 600;
             margin-top: 10px;
             margin-bottom: 5px;
             color: #555;
-        }}
-        .metadata-section {{
+        }
+        .metadata-section {
             margin-left: 10px;
             padding-left: 10px;
             border-left: 3px solid #f0f0f0;
-        }}
-        .edge-tooltip {{
+        }
+        .edge-tooltip {
             background-color: #f8f8f8;
             border-left: 4px solid #3498db;
-        }}
-        #snapshot {{
+        }
+        #snapshot {
             margin-left: 10px;
-        }}
-        #loading {{
+        }
+        #loading {
             position: absolute;
             top: 50%;
             left: 50%;
@@ -852,8 +1891,8 @@ class KnowledgeGraph:
             text-align: center;
             z-index: 1000;
             display: none;
-        }}
-        .spinner {{
+        }
+        .spinner {
             border: 4px solid #f3f3f3;
             border-top: 4px solid #3498db;
             border-radius: 50%;
@@ -861,16 +1900,17 @@ class KnowledgeGraph:
             height: 30px;
             animation: spin 2s linear infinite;
             margin: 0 auto 10px auto;
-        }}
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
+        }
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
     </style>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/cytoscape/3.25.0/cytoscape.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/cytoscape@3.31.0/dist/cytoscape.min.js"></script>
     <script src="https://cdnjs.cloudflare.com/ajax/libs/dagre/0.8.5/dagre.min.js"></script>
     <script src="https://cdn.jsdelivr.net/npm/cytoscape-dagre@2.5.0/cytoscape-dagre.min.js"></script>
     <script src="https://cdn.jsdelivr.net/npm/cytoscape-popper@2.0.0/cytoscape-popper.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/flatbush@4.4.0/flatbush.min.js"></script>
     <script src="https://unpkg.com/file-saver@2.0.5/dist/FileSaver.min.js"></script>
     <script src="https://html2canvas.hertzen.com/dist/html2canvas.min.js"></script>
 </head>
@@ -897,23 +1937,69 @@ class KnowledgeGraph:
     <div id="cy"></div>
     <div class="legend" id="legend"></div>
     <div class="tooltip" id="tooltip"></div>
+    <template id="nodeTooltipTpl"><h3></h3><p><span class="tooltip-label">Type:</span> <span class="badge"></span></p></template>
+    <template id="edgeTooltipTpl"><h3></h3><p><span class="tooltip-label">From:</span> <span class="tooltip-value"></span></p><p><span class="tooltip-label">To:</span> <span class="tooltip-value"></span></p></template>
+    <template id="tooltipRowTpl"><p><span class="tooltip-label"></span> <span class="tooltip-value"></span></p></template>
+    <template id="tooltipSectionTpl"><h4></h4><div class="metadata-section"></div></template>
     <div id="loading">
         <div class="spinner"></div>
         <div>Processing layout...</div>
     </div>
+    
+    <script type="text/js-worker" id="dagreWorker">
+        importScripts('https://cdnjs.cloudflare.com/ajax/libs/dagre/0.8.5/dagre.min.js');
+        
+        self.onmessage = function(event) {
+            const {nodes, edges, options} = event.data;
+            const g = new dagre.graphlib.Graph({multigraph: true});
+            g.setGraph(options);
+            g.setDefaultEdgeLabel(() => ({}));
+            nodes.forEach(([id, width, height]) => g.setNode(id, {width: width, height: height}));
+            edges.forEach(([source, target, id]) => g.setEdge(source, target, {}, id));
+            dagre.layout(g);
+            
+            const positions = new Float32Array(nodes.length * 2);
+            nodes.forEach(([id], i) => {
+                const node = g.node(id);
+                positions[2 * i] = node.x;
+                positions[2 * i + 1] = node.y;
+            });
+            self.postMessage(positions, [positions.buffer]);
+        };
+    </script>
 
     <script>
         // Graph data from Python
-        const graphData = {json.dumps(graph_data, indent=2)};
+        const graphData = """
+
+_HTML_FOOTER = """;
+        
+        // Elements used by the handlers below, looked up once
+        const tooltip = document.getElementById('tooltip');
+        const loading = document.getElementById('loading');
+        const legend = document.getElementById('legend');
+        const filterSelect = document.getElementById('filterByType');
+        const searchInput = document.getElementById('search');
+        
+        // Large graphs are drawn with the WebGL renderer, Canvas2D gets sluggish past ~1k nodes
+        const WEBGL_MIN_NODES = 1000;
+        let nodeCount = 0;
+        for (const el of graphData.elements) {
+            if (el.data.source === undefined) nodeCount++;
+        }
         
         // Initialize Cytoscape
-        const cy = cytoscape({{
+        const cy = cytoscape({
             container: document.getElementById('cy'),
             elements: graphData.elements,
+            renderer: {
+                name: 'canvas',
+                webgl: nodeCount >= WEBGL_MIN_NODES
+            },
             style: [
-                {{
+                {
                     selector: 'node',
-                    style: {{
+                    style: {
                         'label': 'data(short_label)',
                         'text-valign': 'center',
                         'text-halign': 'center',
@@ -921,21 +2007,21 @@ class KnowledgeGraph:
                         'color': '#fff',
                         'text-outline-width': 1,
                         'text-outline-color': '#555',
-                        'background-color': '#888',
+                        'background-color': 'data(color)',
                         'border-width': 1,
                         'border-color': '#555',
                         'text-wrap': 'wrap',
                         'text-max-width': '80px'
-                    }}
-                }},
-                {{
+                    }
+                },
+                {
                     selector: 'edge',
-                    style: {{
+                    style: {
                         'curve-style': 'bezier',
                         'target-arrow-shape': 'triangle',
                         'arrow-scale': 0.8,
-                        'line-color': '#ccc',
-                        'target-arrow-color': '#ccc',
+                        'line-color': 'data(color)',
+                        'target-arrow-color': 'data(color)',
                         'opacity': 0.7,
                         'label': 'data(type)',
                         'font-size': '10px',
@@ -944,1004 +2030,721 @@ class KnowledgeGraph:
                         'text-outline-width': 2,
                         'text-outline-color': '#fff',
                         'color': '#555'
-                    }}
-                }},
+                    }
+                },
             ],
-            layout: {{
-                name: 'dagre',
-                padding: 30,
-                nodeSep: 80,
-                rankSep: 100,
-                rankDir: 'TB',
-                animate: true,
-                animationDuration: 500,
-                fit: true
-            }}
-        }});
-        
-        // Set node colors based on type
-        Object.entries(graphData.type_colors).forEach(([type, color]) => {{
-            cy.style().selector(`node.${type}`).style({{'background-color': color}}).update();
-        }});
-        
-        // Set edge colors based on type
-        Object.entries(graphData.edge_colors).forEach(([type, color]) => {{
-            cy.style().selector(`edge.${type}`).style({{
-                'line-color': color, 
-                'target-arrow-color': color
-            }}).update();
-        }});
+            // Positions are precomputed in Python, or come from the hierarchical
+            // layout in the worker below
+            layout: {
+                name: 'preset',
+                fit: true,
+                padding: 30
+            }
+        });
+        
+        // Node and edge colors come from each element's data. Add the highlight styles
+        // in one batch and restyle once at the end.
+        cy.startBatch();
         
         // Add style for highlighted elements
         cy.style()
             .selector('node.highlight')
-            .style({{
+            .style({
                 'border-width': 3,
                 'border-color': '#ff0',
                 'border-style': 'double'
-            }})
+            })
             .selector('node.semitransparent')
-            .style({{
+            .style({
                 'opacity': 0.3
-            }})
+            })
             .selector('edge.highlight')
-            .style({{
+            .style({
                 'width': 4,
                 'line-color': '#ff0',
                 'target-arrow-color': '#ff0',
                 'opacity': 1
-            }})
+            })
             .selector('edge.semitransparent')
-            .style({{
+            .style({
                 'opacity': 0.1
-            }})
+            })
             .selector('node:selected')
-            .style({{
+            .style({
                 'border-width': 3,
                 'border-color': '#ff0',
                 'border-style': 'double'
-            }})
+            })
             .selector('edge:selected')
-            .style({{
+            .style({
                 'width': 4,
                 'line-color': '#ff0',
                 'target-arrow-color': '#ff0'
-            }})
+            })
+            .selector('node.culled')
+            .style({
+                'display': 'none'
+            })
             .update();
+        cy.endBatch();
+        
+        // Dimming everything outside a highlight is a switch to a stylesheet with
+        // extra rules ("dim mode"), not a class added to every other element
+        const baseStyle = cy.style().json();
+        const dimStyle = baseStyle.concat([
+            {selector: 'node', style: {'opacity': 0.3}},
+            {selector: 'edge', style: {'opacity': 0.1}},
+            {selector: 'node.highlight, edge.highlight', style: {'opacity': 1}}
+        ]);
+        let dimMode = false;
+        
+        function setDimMode(enabled) {
+            if (enabled === dimMode) return;
+            dimMode = enabled;
+            cy.container().classList.toggle('dim-mode', enabled);
+            cy.style(enabled ? dimStyle : baseStyle);
+        }
         
-        // Add node types to filter dropdown
-        const nodeTypes = [...new Set(graphData.elements
-            .filter(el => el.data.type)
-            .map(el => el.data.type))];
-            
-        const filterSelect = document.getElementById('filterByType');
-        nodeTypes.sort().forEach(type => {{
-            const option = document.createElement('option');
-            option.value = type;
-            option.textContent = type.charAt(0).toUpperCase() + type.slice(1).replace(/_/g, ' ');
-            filterSelect.appendChild(option);
-        }});
-        
-        // Create legend
-        function createLegend() {{
-            const legend = document.getElementById('legend');
-            legend.innerHTML = '<h3>Node Types</h3>';
-            
-            // Add entries for known node types and any custom ones
-            const allNodeTypes = nodeTypes;
-            
-            allNodeTypes.sort().forEach(type => {{
-                const color = graphData.type_colors[type] || '#888';
-                
-                if (cy.nodes('.' + type).length > 0) {{
-                    const item = document.createElement('div');
-                    item.className = 'legend-item';
-                    
-                    const colorBox = document.createElement('div');
-                    colorBox.className = 'legend-color';
-                    colorBox.style.backgroundColor = color;
-                    
-                    const label = document.createElement('span');
-                    label.textContent = type.charAt(0).toUpperCase() + type.slice(1).replace(/_/g, ' ');
-                    
-                    item.appendChild(colorBox);
-                    item.appendChild(label);
-                    legend.appendChild(item);
-                }}
-            }});
-            
-            legend.innerHTML += '<h3>Edge Types</h3>';
-            const edgeTypes = [...new Set(cy.edges().map(e => e.data('type')))];
-            
-            edgeTypes.sort().forEach(type => {{
-                const color = graphData.edge_colors[type] || '#ccc';
-                
-                const item = document.createElement('div');
-                item.className = 'legend-item';
-                
-                const colorBox = document.createElement('div');
-                colorBox.className = 'legend-color';
-                colorBox.style.backgroundColor = color;
-                
-                const label = document.createElement('span');
-                label.textContent = type.replace(/_/g, ' ');
-                
-                item.appendChild(colorBox);
-                item.appendChild(label);
-                legend.appendChild(item);
-            }});
-        }}
-        
-        createLegend();
-        
-        // Helper function to format attribute keys for display
-        function formatAttributeKey(key) {{
-            // Remove attr_ prefix and replace underscores with spaces
-            return key.replace(/^attr_/, '')
-                     .replace(/_/g, ' ')
-                     // Capitalize first letter of each word
-                     .replace(/(\b\w)/g, match => match.toUpperCase());
-        }}
-        
-        // Group metadata attributes by category
-        function groupMetadataAttributes(data) {{
-            const groups = {{
-                // Core properties that should appear at the top
-                core: [],
-                // Known categories
-                domain: [],
-                service: [],
-                dependencies: [],
-                tech_debt: [],
-                performance: [],
-                data: [],
-                // Everything else goes here
-                other: []
-            }};
-            
-            // Get all attribute keys (those starting with attr_)
-            const attributes = Object.entries(data).filter(([key]) => key.startsWith('attr_'));
-            
-            attributes.forEach(([key, value]) => {{
-                const cleanKey = key.replace(/^attr_/, '');
-                
-                // Check which group this attribute belongs to
-                if (cleanKey === 'domain' || cleanKey === 'description') {{
-                    groups.core.push([key, value]);
-                }} else if (cleanKey.startsWith('tech_debt') || 
-                           cleanKey.startsWith('techDebt') || 
-                           cleanKey.startsWith('tech-debt')) {{
-                    groups.tech_debt.push([key, value]);
-                }} else if (cleanKey.startsWith('performance')) {{
-                    groups.performance.push([key, value]);
-                }} else if (cleanKey.startsWith('data') || 
-                           cleanKey.startsWith('dataHandling') || 
-                           cleanKey.startsWith('data-handling')) {{
-                    groups.data.push([key, value]);
-                }} else if (cleanKey.startsWith('service') || 
-                           cleanKey.startsWith('serviceBoundary') ||
-                           cleanKey.startsWith('service-boundary')) {{
-                    groups.service.push([key, value]);
-                }} else if (cleanKey === 'dependencies' || 
-                           cleanKey.startsWith('depends_on') || 
-                           cleanKey.startsWith('imports') ||
-                           cleanKey.startsWith('requires')) {{
-                    groups.dependencies.push([key, value]);
-                }} else {{
-                    groups.other.push([key, value]);
-                }}
-            }});
-            
-            return groups;
-        }}
-        
-        // Tooltip for node metadata
-        function showNodeTooltip(node, event) {{
-            const tooltip = document.getElementById('tooltip');
-            const data = node.data();
-            
-            let content = `<h3>${{data.label}}</h3>`;
-            content += `<p><span class="tooltip-label">Type:</span> <span class="badge">${{data.type}}</span></p>`;
-            
-            // Group and organize the metadata
-            const groups = groupMetadataAttributes(data);
-            
-            // Add core properties first
-            if (groups.core.length > 0) {{
-                groups.core.forEach(([key, value]) => {{
-                    const attrName = formatAttributeKey(key);
-                    const valueDisplay = typeof value === 'string' && value.length > 100 ? 
-                                      value.substring(0, 100) + '...' : value;
-                    content += `<p><span class="tooltip-label">${{attrName}}:</span> <span class="tooltip-value">${{valueDisplay}}</span></p>`;
-                }});
-            }}
-            
-            // Add each metadata group
-            const groupLabels = {{
-                domain: 'Domain',
-                service: 'Service',
-                dependencies: 'Dependencies',
-                tech_debt: 'Technical Debt',
-                performance: 'Performance',
-                data: 'Data Handling',
-                other: 'Other Metadata'
-            }};
-            
-            Object.entries(groups).forEach(([groupName, attributes]) => {{
-                // Skip the core group (already processed) and empty groups
-                if (groupName === 'core' || attributes.length === 0) return;
-                
-                content += `<h4>${{groupLabels[groupName]}}</h4>`;
-                content += '<div class="metadata-section">';
-                
-                attributes.forEach(([key, value]) => {{
-                    const attrName = formatAttributeKey(key);
-                    const valueDisplay = typeof value === 'string' && value.length > 100 ? 
-                                      value.substring(0, 100) + '...' : value;
-                    content += `<p><span class="tooltip-label">${{attrName}}:</span> <span class="tooltip-value">${{valueDisplay}}</span></p>`;
-                }});
-                
-                content += '</div>';
-            }});
-            
-            tooltip.innerHTML = content;
-            tooltip.style.left = `${{event.renderedPosition.x + 10}}px`;
-            tooltip.style.top = `${{event.renderedPosition.y + 10}}px`;
-            tooltip.style.display = 'block';
-            
-            // Adjust tooltip position if it goes off screen
-            const tooltipRect = tooltip.getBoundingClientRect();
-            const viewportWidth = window.innerWidth;
-            const viewportHeight = window.innerHeight;
-            
-            if (tooltipRect.right > viewportWidth) {{
-                tooltip.style.left = `${{event.renderedPosition.x - tooltipRect.width - 10}}px`;
-            }}
-            
-            if (tooltipRect.bottom > viewportHeight) {{
-                tooltip.style.top = `${{event.renderedPosition.y - tooltipRect.height - 10}}px`;
-            }}
-        }}
-        
-        function showEdgeTooltip(edge, event) {{
-            const tooltip = document.getElementById('tooltip');
-            const data = edge.data();
-            
-            let content = `<h3>Relationship: ${{data.type.replace(/_/g, ' ')}}</h3>`;
-            content += `<p><span class="tooltip-label">From:</span> <span class="tooltip-value">${{edge.source().data('short_label')}}</span></p>`;
-            content += `<p><span class="tooltip-label">To:</span> <span class="tooltip-value">${{edge.target().data('short_label')}}</span></p>`;
-            
-            // Add additional metadata if present
-            const attributes = Object.entries(data).filter(([key]) => key.startsWith('attr_'));
-            if (attributes.length > 0) {{
-                content += '<h4>Metadata</h4>';
-                content += '<div class="metadata-section">';
-                attributes.forEach(([key, value]) => {{
-                    const attrName = formatAttributeKey(key);
-                    content += `<p><span class="tooltip-label">${{attrName}}:</span> <span class="tooltip-value">${{value}}</span></p>`;
-                }});
-                content += '</div>';
-            }}
-            
-            tooltip.innerHTML = content;
-            tooltip.className = 'tooltip edge-tooltip';
-            tooltip.style.left = `${{event.renderedPosition.x + 10}}px`;
-            tooltip.style.top = `${{event.renderedPosition.y + 10}}px`;
-            tooltip.style.display = 'block';
-            
-            // Adjust tooltip position if it goes off screen
-            const tooltipRect = tooltip.getBoundingClientRect();
-            const viewportWidth = window.innerWidth;
-            const viewportHeight = window.innerHeight;
-            
-            if (tooltipRect.right > viewportWidth) {{
-                tooltip.style.left = `${{event.renderedPosition.x - tooltipRect.width - 10}}px`;
-            }}
-            
-            if (tooltipRect.bottom > viewportHeight) {{
-                tooltip.style.top = `${{event.renderedPosition.y - tooltipRect.height - 10}}px`;
-            }}
-        }}
-        
-        function hideTooltip() {{
-            const tooltip = document.getElementById('tooltip');
-            tooltip.style.display = 'none';
-            tooltip.className = 'tooltip'; // Reset tooltip class
-        }}
-        
-        // Highlight connected elements
-        function highlightConnectedElements(node) {{
-            // Reset all elements
-            cy.elements().removeClass('highlight semitransparent');
-            
-            // If no node is selected, clear highlight
-            if (!node) return;
-            
-            // Get connected edges and nodes
-            const connectedEdges = node.connectedEdges();
-            const connectedNodes = connectedEdges.connectedNodes();
-            
-            // Add the original node to the connected nodes
-            const allConnected = connectedNodes.union(node);
-            
-            // Highlight connected elements
-            allConnected.addClass('highlight');
-            connectedEdges.addClass('highlight');
-            
-            // Make all other elements semi-transparent
-            cy.elements().not(allConnected.union(connectedEdges)).addClass('semitransparent');
-        }}
-        
-        // Event listeners
-        cy.on('mouseover', 'node', function(evt) {{
-            showNodeTooltip(evt.target, evt);
-        }});
-        
-        cy.on('mouseover', 'edge', function(evt) {{
-            showEdgeTooltip(evt.target, evt);
-        }});
-        
-        cy.on('mouseout', function() {{
-            hideTooltip();
-        }});
-        
-        cy.on('tap', 'node', function(evt) {{
-            highlightConnectedElements(evt.target);
-        }});
-        
-        cy.on('tap', function(evt) {{
-            if (evt.target === cy) {{
-                // Clicked on background, clear highlights
-                cy.elements().removeClass('highlight semitransparent');
-                hideTooltip();
-            }}
-        }});
-        
-        // Layout buttons
-        document.getElementById('fit').addEventListener('click', function() {{
-            cy.fit();
-        }});
-        
-        document.getElementById('hierarchical').addEventListener('click', function() {{
-            document.getElementById('loading').style.display = 'block';
-            setTimeout(() => {{
-                cy.layout({{
-                    name: 'dagre',
-                    rankDir: 'TB',
-                    nodeSep: 80,
-                    rankSep: 100,
-                    padding: 30,
-                    animate: true,
-                    animationDuration: 800
-                }}).run();
-                
-                setTimeout(() => {{
-                    document.getElementById('loading').style.display = 'none';
-                }}, 900);
-            }}, 50);
-        }});
-        
-        document.getElementById('concentric').addEventListener('click', function() {{
-            document.getElementById('loading').style.display = 'block';
-            setTimeout(() => {{
-                cy.layout({{
-                    name: 'concentric',
-                    concentric: function(node) {{
-                        // More important nodes in the center
-                        const typeRank = {{
-                            'domain': 10,
-                            'service': 9,
-                            'team': 8,
-                            'file': 7,
-                            'class': 6,
-                            'function': 5,
-                            'method': 4,
-                            'variable': 3,
-                            'tech_debt': 2,
-                            'performance': 2,
-                            'data': 1
-                        }};
-                        return typeRank[node.data('type')] || 0;
-                    }},
-                    levelWidth: function() {{ return 1; }},
-                    animate: true,
-                    animationDuration: 800
-                }}).run();
-                
-                setTimeout(() => {{
-                    document.getElementById('loading').style.display = 'none';
-                }}, 900);
-            }}, 50);
-        }});
-        
-        document.getElementById('force').addEventListener('click', function() {{
-            document.getElementById('loading').style.display = 'block';
-            setTimeout(() => {{
-                cy.layout({{
-                    name: 'cose',
-                    idealEdgeLength: 150,
-                    nodeOverlap: 20,
-                    refresh: 20,
-                    fit: true,
-                    padding: 30,
-                    randomize: false,
-                    componentSpacing: 100,
-                    nodeRepulsion: 400000,
-                    edgeElasticity: 100,
-                    nestingFactor: 5,
-                    gravity: 80,
-                    numIter: 1000,
-                    animate: 'end',
-                    animationDuration: 800
-                }}).run();
-                
-                setTimeout(() => {{
-                    document.getElementById('loading').style.display = 'none';
-                }}, 1000);
-            }}, 50);
-        }});
-        
-        // Filter by node type
-        document.getElementById('filterByType').addEventListener('change', function() {{
-            const selectedType = this.value;
-            
-            if (selectedType === 'all') {{
-                cy.elements().removeClass('semitransparent');
-                return;
-            }}
-            
-            // Filter nodes by selected type
-            const selectedNodes = cy.nodes('.' + selectedType);
-            const connectedEdges = selectedNodes.connectedEdges();
-            
-            // Make non-matching elements semi-transparent
-            cy.elements().addClass('semitransparent');
-            selectedNodes.removeClass('semitransparent');
-            connectedEdges.removeClass('semitransparent');
-        }});
-        
-        document.getElementById('resetFilter').addEventListener('click', function() {{
-            cy.elements().removeClass('highlight semitransparent');
-            document.getElementById('filterByType').value = 'all';
-        }});
-        
-        // Toggle legend
-        document.getElementById('toggleLegend').addEventListener('click', function() {{
-            const legend = document.getElementById('legend');
-            legend.style.display = legend.style.display === 'none' ? 'block' : 'none';
-        }});
+        // Viewport culling for large graphs. Node positions go into a spatial index
+        // after each layout and nodes outside the visible extent get the 'culled'
+        // class, so Cytoscape neither draws nor hit-tests them.
+        const CULL_MIN_NODES = 2000;
+        const CULL_PADDING = 40;
+        const cullNodes = nodeCount >= CULL_MIN_NODES && typeof Flatbush !== 'undefined' ? cy.nodes() : null;
+        let cullIndex = null;
+        let cullVisible = null;
+        let cullFrame = null;
+        let layoutRunning = false;
+        
+        function buildCullIndex() {
+            cullIndex = new Flatbush(cullNodes.length);
+            cullNodes.forEach(node => {
+                const pos = node.position();
+                cullIndex.add(pos.x - CULL_PADDING, pos.y - CULL_PADDING,
+                              pos.x + CULL_PADDING, pos.y + CULL_PADDING);
+            });
+            cullIndex.finish();
+        }
         
-        // Search functionality
-        document.getElementById('searchBtn').addEventListener('click', function() {{
-            const searchTerm = document.getElementById('search').value.toLowerCase();
-            if (!searchTerm) return;
-            
-            // Reset highlighting
-            cy.elements().removeClass('highlight semitransparent');
+        function cullToViewport() {
+            cullFrame = null;
+            if (layoutRunning || !cullIndex) return;
             
-            // Build search index from all node data
-            const searchableNodes = cy.nodes().filter(node => {{
-                const data = node.data();
-                
-                // Check label and short_label
-                if (data.label.toLowerCase().includes(searchTerm) || 
-                    (data.short_label && data.short_label.toLowerCase().includes(searchTerm))) {{
-                    return true;
-                }}
-                
-                // Search in all attributes
-                for (const [key, value] of Object.entries(data)) {{
-                    if (key.startsWith('attr_') && 
-                        typeof value === 'string' && 
-                        value.toLowerCase().includes(searchTerm)) {{
-                        return true;
-                    }}
-                }}
-                
-                return false;
-            }});
+            const ext = cy.extent();
+            const visible = new Uint8Array(cullNodes.length);
+            for (const i of cullIndex.search(ext.x1, ext.y1, ext.x2, ext.y2)) {
+                visible[i] = 1;
+            }
             
-            if (searchableNodes.length > 0) {{
-                // Highlight matching nodes
-                searchableNodes.addClass('highlight');
-                
-                // Make non-matching elements semi-transparent
-                cy.elements().not(searchableNodes).addClass('semitransparent');
-                
-                // Center the view on the first match
-                cy.animate({{
-                    fit: {{
-                        eles: searchableNodes,
-                        padding: 50
-                    }},
-                    duration: 500
-                }});
-            }}
-        }});
+            // Only touch nodes whose visibility changed since the last pass
+            cy.batch(() => {
+                for (let i = 0; i < visible.length; i++) {
+                    if (visible[i] !== cullVisible[i]) {
+                        cullNodes[i].toggleClass('culled', !visible[i]);
+                    }
+                }
+            });
+            cullVisible = visible;
+        }
         
-        // Also trigger search on Enter key
-        document.getElementById('search').addEventListener('keyup', function(event) {{
-            if (event.key === 'Enter') {{
-                document.getElementById('searchBtn').click();
-            }}
-        }});
+        function scheduleCull() {
+            if (cullFrame === null) {
+                cullFrame = requestAnimationFrame(cullToViewport);
+            }
+        }
         
-        // Save snapshot
-        document.getElementById('snapshot').addEventListener('click', function() {{
-            // Create a PNG snapshot of the current view
-            const png = cy.png({{
-                output: 'blob',
-                bg: 'white',
-                full: false,
-                scale: 2,
-                quality: 1
-            }});
-            
-            // Save the image
-            saveAs(png, 'knowledge_graph.png');
-        }});
+        // Show every node again, needed before layouts and fits over the whole graph
+        function uncullAll() {
+            if (!cullNodes) return;
+            cullNodes.removeClass('culled');
+            cullVisible = new Uint8Array(cullNodes.length).fill(1);
+        }
         
-        // Fit the graph to the viewport initially
-        cy.ready(() => {{
-            cy.fit();
-        }});
-    </script>
-</body>
-</html>
-        """
+        if (cullNodes && cullNodes.length > 0) {
+            cullVisible = new Uint8Array(cullNodes.length).fill(1);
+            cy.on('layoutstart', () => {
+                layoutRunning = true;
+            });
+            cy.on('layoutstop', () => {
+                layoutRunning = false;
+                buildCullIndex();
+                scheduleCull();
+            });
+            cy.on('free', 'node', () => {
+                buildCullIndex();
+                scheduleCull();
+            });
+            cy.on('viewport', scheduleCull);
+            buildCullIndex();
+        }
         
-        # Write HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        // Display names for attribute keys and types. There are only a handful of
+        // distinct keys and types, so each is formatted once and then looked up.
+        const attributeKeyNames = new Map();
+        const nodeTypeNames = new Map();
+        const edgeTypeNames = new Map();
         
-        print(f"Interactive visualization saved to {output_path}")
-        print(f"Open this HTML file in a web browser to view the interactive graph")
+        // Helper function to format attribute keys for display
+        function formatAttributeKey(key) {
+            let name = attributeKeyNames.get(key);
+            if (name === undefined) {
+                // Remove attr_ prefix and replace underscores with spaces
+                name = key.replace(/^attr_/, '')
+                          .replace(/_/g, ' ')
+                          // Capitalize first letter of each word
+                          .replace(/(\\b\\w)/g, match => match.toUpperCase());
+                attributeKeyNames.set(key, name);
+            }
+            return name;
+        }
         
-        return output_path
-
-
-class GraphBuilder:
-    """Builder for creating knowledge graphs from ADP metadata."""
-    
-    def __init__(self, schema_name: str = None):
-        """
-        Initialize the graph builder.
+        function formatNodeType(type) {
+            let name = nodeTypeNames.get(type);
+            if (name === undefined) {
+                name = type.charAt(0).toUpperCase() + type.slice(1).replace(/_/g, ' ');
+                nodeTypeNames.set(type, name);
+            }
+            return name;
+        }
         
-        Args:
-            schema_name: Name of the schema to use. If None, uses the active schema.
-        """
-        self.graph = KnowledgeGraph()
-        self.processed_files = set()
-        self.schema = get_schema(schema_name)
-        self.custom_node_types = set()
-        self.custom_edge_types = set()
-    
-    def add_file(self, parsed_file: ParsedFile) -> None:
-        """
-        Add a file to the knowledge graph.
+        function formatEdgeType(type) {
+            let name = edgeTypeNames.get(type);
+            if (name === undefined) {
+                name = type.replace(/_/g, ' ');
+                edgeTypeNames.set(type, name);
+            }
+            return name;
+        }
         
-        Args:
-            parsed_file: The parsed file to add.
-        """
-        file_path = parsed_file.file_path
-        if file_path in self.processed_files:
-            return
+        // Add node types to filter dropdown; the type lists come sorted from Python
+        const nodeTypes = graphData.present_node_types;
         
-        # Add file node
-        file_name = os.path.basename(file_path)
-        # Sanitize file path for use as node ID
-        sanitized_path = file_path.replace('/', '_').replace('\\', '_')
-        file_id = f"file:{sanitized_path}"
-        self.graph.add_node(Node(
-            id=file_id,
-            type=NodeType.FILE,
-            label=file_path,
-            short_label=file_name,
-            attributes={"path": file_path}
-        ))
+        nodeTypes.forEach(type => {
+            const option = document.createElement('option');
+            option.value = type;
+            option.textContent = formatNodeType(type);
+            filterSelect.appendChild(option);
+        });
         
-        # Process metadata blocks
-        for metadata_block in parsed_file.metadata_blocks:
-            # Generate a unique ID for the metadata block
-            block_id = f"{file_id}:{metadata_block.line_number}"
+        // Create legend
+        function createLegend() {
+            legend.innerHTML = '<h3>Node Types</h3>';
             
-            # Process different scopes
-            if metadata_block.scope == "file":
-                self._process_metadata(metadata_block, block_id, file_id, file_name, NodeType.FILE)
-            elif metadata_block.scope == "class":
-                self._process_metadata(metadata_block, block_id, file_id, file_name, NodeType.CLASS)
-            elif metadata_block.scope in ["function", "method"]:
-                node_type = NodeType.METHOD if metadata_block.scope == "method" else NodeType.FUNCTION
-                self._process_metadata(metadata_block, block_id, file_id, file_name, node_type)
-            elif metadata_block.scope == "variable":
-                self._process_metadata(metadata_block, block_id, file_id, file_name, NodeType.VARIABLE)
-        
-        self.processed_files.add(file_path)
-    
-    def _process_metadata(self, metadata_block: ADPMetadata, block_id: str, file_id: str, file_name: str, node_type: NodeType) -> None:
-        """
-        Process metadata with flexible approach to handle any schema.
+            // Add entries for the node types present in the graph, known or custom
+            nodeTypes.forEach(type => {
+                const color = graphData.type_colors[type] || '#888';
+                
+                const item = document.createElement('div');
+                item.className = 'legend-item';
+                
+                const colorBox = document.createElement('div');
+                colorBox.className = 'legend-color';
+                colorBox.style.backgroundColor = color;
+                
+                const label = document.createElement('span');
+                label.textContent = formatNodeType(type);
+                
+                item.appendChild(colorBox);
+                item.appendChild(label);
+                legend.appendChild(item);
+            });
+            
+            legend.innerHTML += '<h3>Edge Types</h3>';
+            const edgeTypes = graphData.present_edge_types;
+            
+            edgeTypes.forEach(type => {
+                const color = graphData.edge_colors[type] || '#ccc';
+                
+                const item = document.createElement('div');
+                item.className = 'legend-item';
+                
+                const colorBox = document.createElement('div');
+                colorBox.className = 'legend-color';
+                colorBox.style.backgroundColor = color;
+                
+                const label = document.createElement('span');
+                label.textContent = formatEdgeType(type);
+                
+                item.appendChild(colorBox);
+                item.appendChild(label);
+                legend.appendChild(item);
+            });
+        }
         
-        Args:
-            metadata_block: The metadata block to process.
-            block_id: The ID of the metadata block.
-            file_id: The ID of the file.
-            file_name: The name of the file.
-            node_type: The type of node for this metadata.
-        """
-        metadata = metadata_block.metadata
-        print(f"Processing metadata block: {metadata}")
+        createLegend();
         
-        # Create the primary node for this metadata block
-        # Use name from metadata if available, otherwise check scope_name, then fallback to default naming
-        node_name = metadata.get("name")
-        if node_name is not None:
-            print(f"Using explicit 'name' from metadata: {node_name}")
-        else:
-            # Try scope_name as an alternative
-            node_name = metadata.get("scope_name")
-            if node_name is not None:
-                print(f"Using 'scope_name' as alternative: {node_name}")
-            else:
-                # If both name and scope_name are not available, use default naming
-                node_name = f"{node_type.value.capitalize()} in {file_name}"
-                print(f"Using default naming convention: {node_name}")
+        // Tooltip skeletons, cloned per hover and filled in through textContent so
+        // the HTML parser never runs on (and never interprets) attribute values
+        const nodeTooltipTpl = document.getElementById('nodeTooltipTpl').content;
+        const edgeTooltipTpl = document.getElementById('edgeTooltipTpl').content;
+        const tooltipRowTpl = document.getElementById('tooltipRowTpl').content;
+        const tooltipSectionTpl = document.getElementById('tooltipSectionTpl').content;
+        
+        function tooltipRow(label, value) {
+            const row = tooltipRowTpl.cloneNode(true);
+            row.querySelector('.tooltip-label').textContent = `${label}:`;
+            row.querySelector('.tooltip-value').textContent = `${value}`;
+            return row;
+        }
         
-        # Generate a unique ID for this node
-        node_id = f"{node_type.value}:{block_id}"
+        function tooltipSection(title, attributes, formatValue) {
+            const section = tooltipSectionTpl.cloneNode(true);
+            section.querySelector('h4').textContent = title;
+            const body = section.querySelector('.metadata-section');
+            attributes.forEach(([key, value]) => {
+                body.appendChild(tooltipRow(formatAttributeKey(key), formatValue(value)));
+            });
+            return section;
+        }
         
-        # Add node to graph
-        self.graph.add_node(Node(
-            id=node_id,
-            type=node_type,
-            label=f"{node_name} ({file_name})",
-            short_label=node_name,
-            attributes=metadata  # Include all metadata as attributes
-        ))
+        // Shorten long string values in node tooltips
+        function truncateValue(value) {
+            return typeof value === 'string' && value.length > 100 ? 
+                   value.substring(0, 100) + '...' : value;
+        }
         
-        # Connect to file
-        if node_type != NodeType.FILE:  # Don't connect file to itself
-            self.graph.add_edge(Edge(
-                source=file_id,
-                target=node_id,
-                type=EdgeType.CONTAINS
-            ))
+        // Tooltip updates are coalesced to at most one per animation frame
+        let tooltipFrame = null;
         
-        # Process connections based on available metadata
-        self._process_connections(metadata, node_id, file_id, node_type)
+        function scheduleTooltip(fn) {
+            if (tooltipFrame !== null) {
+                cancelAnimationFrame(tooltipFrame);
+            }
+            tooltipFrame = requestAnimationFrame(() => {
+                tooltipFrame = null;
+                fn();
+            });
+        }
         
-        # Process custom node types (domains, concepts, etc.)
-        self._process_custom_nodes(metadata, node_id)
-    
-    def _process_connections(self, metadata: Dict[str, Any], node_id: str, file_id: str, node_type: NodeType) -> None:
-        """
-        Process connections based on available metadata.
+        // Show the tooltip next to a position, then move it back on screen if it
+        // overflows. The overflow check reads layout a frame later so it does not
+        // force a reflow right after the content was written.
+        function placeTooltip(tooltip, position) {
+            tooltip.style.left = `${position.x + 10}px`;
+            tooltip.style.top = `${position.y + 10}px`;
+            tooltip.style.display = 'block';
+            
+            scheduleTooltip(() => {
+                const tooltipRect = tooltip.getBoundingClientRect();
+                
+                if (tooltipRect.right > window.innerWidth) {
+                    tooltip.style.left = `${position.x - tooltipRect.width - 10}px`;
+                }
+                
+                if (tooltipRect.bottom > window.innerHeight) {
+                    tooltip.style.top = `${position.y - tooltipRect.height - 10}px`;
+                }
+            });
+        }
         
-        Args:
-            metadata: The metadata dictionary.
-            node_id: The ID of the current node.
-            file_id: The ID of the file containing this node.
-            node_type: The type of current node.
-        """
-        # Domain connections
-        if "domain" in metadata:
-            domain_id = f"domain:{metadata['domain']}"
-            domain_label = metadata['domain']
+        // Tooltip for node metadata
+        function showNodeTooltip(node, event) {
+            const data = node.data();
             
-            # Add domain node if not exists
-            if domain_id not in self.graph.nodes:
-                self.graph.add_node(Node(
-                    id=domain_id,
-                    type=NodeType.DOMAIN,
-                    label=domain_label,
-                    short_label=domain_label
-                ))
+            const content = nodeTooltipTpl.cloneNode(true);
+            content.querySelector('h3').textContent = data.label;
+            content.querySelector('.badge').textContent = data.type;
             
-            # Connect node to domain
-            self.graph.add_edge(Edge(
-                source=node_id,
-                target=domain_id,
-                type=EdgeType.RELATED_TO
-            ))
-        
-        # Process dependencies (flexible key names)
-        for key in ["dependencies", "depends_on", "imports", "requires"]:
-            if key in metadata and isinstance(metadata[key], list):
-                for dep in metadata[key]:
-                    # Create dependency nodes based on type
-                    if isinstance(dep, str):
-                        # Simple string dependency
-                        dep_parts = dep.split('.')
-                        if len(dep_parts) > 1:
-                            # Likely a module or class
-                            dep_type = NodeType.MODULE
-                            dep_id = f"module:{dep}"
-                        else:
-                            # Likely a file
-                            dep_type = NodeType.FILE
-                            sanitized_dep = dep.replace('/', '_').replace('\\', '_')
-                            dep_id = f"file:{sanitized_dep}"
-                        
-                        dep_name = os.path.basename(dep)
-                        
-                        # Add dependency node if not exists
-                        if dep_id not in self.graph.nodes:
-                            self.graph.add_node(Node(
-                                id=dep_id,
-                                type=dep_type,
-                                label=dep,
-                                short_label=dep_name
-                            ))
-                        
-                        # Connect node to dependency
-                        self.graph.add_edge(Edge(
-                            source=node_id,
-                            target=dep_id,
-                            type=EdgeType.DEPENDS_ON
-                        ))
-        
-        # Process service boundary information (flexible schema)
-        for service_key in ["service", "serviceBoundary", "service-boundary", "service_boundary"]:
-            if service_key in metadata:
-                service_info = metadata[service_key]
-                
-                # Handle both string and dictionary formats
-                if isinstance(service_info, str):
-                    service_name = service_info
-                    service_data = {}
-                elif isinstance(service_info, dict):
-                    service_name = service_info.get("service") or service_info.get("name")
-                    service_data = service_info
-                else:
-                    continue
+            // Metadata keys come pre-grouped by section from Python
+            const groups = data.groups;
+            
+            // Add core properties first
+            (groups.core || []).forEach(key => {
+                content.appendChild(tooltipRow(formatAttributeKey(key), truncateValue(data[key])));
+            });
+            
+            // Add each metadata group
+            const groupLabels = {
+                domain: 'Domain',
+                service: 'Service',
+                dependencies: 'Dependencies',
+                tech_debt: 'Technical Debt',
+                performance: 'Performance',
+                data: 'Data Handling',
+                other: 'Other Metadata'
+            };
+            
+            Object.entries(groups).forEach(([groupName, keys]) => {
+                // Skip the core group (already processed); empty groups are never emitted
+                if (groupName === 'core') return;
                 
-                if service_name:
-                    service_id = f"service:{service_name}"
-                    
-                    # Add service node if not exists
-                    if service_id not in self.graph.nodes:
-                        self.graph.add_node(Node(
-                            id=service_id,
-                            type=NodeType.SERVICE,
-                            label=service_name,
-                            short_label=service_name,
-                            attributes=service_data
-                        ))
-                    
-                    # Connect node to service
-                    self.graph.add_edge(Edge(
-                        source=node_id,
-                        target=service_id,
-                        type=EdgeType.DEPENDS_ON
-                    ))
-                    
-                    # Process team ownership (several possible key names)
-                    team_name = None
-                    for team_key in ["teamOwner", "team_owner", "team", "owner"]:
-                        if isinstance(service_info, dict) and team_key in service_info:
-                            team_name = service_info[team_key]
-                            break
-                    
-                    if team_name:
-                        team_id = f"team:{team_name}"
-                        
-                        # Add team node if not exists
-                        if team_id not in self.graph.nodes:
-                            self.graph.add_node(Node(
-                                id=team_id,
-                                type=NodeType.TEAM,
-                                label=team_name,
-                                short_label=team_name
-                            ))
-                        
-                        # Connect service to team
-                        self.graph.add_edge(Edge(
-                            source=service_id,
-                            target=team_id,
-                            type=EdgeType.OWNED_BY
-                        ))
+                const attributes = keys.map(key => [key, data[key]]);
+                content.appendChild(tooltipSection(groupLabels[groupName], attributes, truncateValue));
+            });
+            
+            // Swap in the new content as a single DOM mutation
+            tooltip.replaceChildren(content);
+            placeTooltip(tooltip, event.renderedPosition);
+        }
+        
+        function showEdgeTooltip(edge, event) {
+            const data = edge.data();
+            
+            const content = edgeTooltipTpl.cloneNode(true);
+            content.querySelector('h3').textContent = `Relationship: ${formatEdgeType(data.type)}`;
+            const [sourceValue, targetValue] = content.querySelectorAll('.tooltip-value');
+            sourceValue.textContent = edge.source().data('short_label');
+            targetValue.textContent = edge.target().data('short_label');
+            
+            // Add additional metadata if present
+            const attributes = (data.attrs || []).map(key => [key, data[key]]);
+            if (attributes.length > 0) {
+                content.appendChild(tooltipSection('Metadata', attributes, value => value));
+            }
+            
+            tooltip.replaceChildren(content);
+            tooltip.className = 'tooltip edge-tooltip';
+            placeTooltip(tooltip, event.renderedPosition);
+        }
         
-        # Process class relationships (inheritance, implementation)
-        if node_type == NodeType.CLASS:
-            # Inheritance (multiple possible key names)
-            for extends_key in ["extends", "parent", "inherits", "superclass"]:
-                if extends_key in metadata:
-                    parent_class = metadata[extends_key]
-                    if isinstance(parent_class, str):
-                        parent_id = f"class:{parent_class}"
-                        
-                        # Add parent class node if not exists
-                        if parent_id not in self.graph.nodes:
-                            self.graph.add_node(Node(
-                                id=parent_id,
-                                type=NodeType.CLASS,
-                                label=parent_class,
-                                short_label=parent_class
-                            ))
-                        
-                        # Connect class to parent
-                        self.graph.add_edge(Edge(
-                            source=node_id,
-                            target=parent_id,
-                            type=EdgeType.EXTENDS
-                        ))
+        function hideTooltip() {
+            // Drop any tooltip update still waiting for its frame
+            if (tooltipFrame !== null) {
+                cancelAnimationFrame(tooltipFrame);
+                tooltipFrame = null;
+            }
+            tooltip.style.display = 'none';
+            tooltip.className = 'tooltip'; // Reset tooltip class
+        }
+        
+        // Remove highlights and dimming; only the elements carrying a class are touched
+        function clearHighlight() {
+            cy.batch(() => {
+                cy.elements('.highlight, .semitransparent').removeClass('highlight semitransparent');
+            });
+            setDimMode(false);
+        }
+        
+        // Highlight connected elements
+        function highlightConnectedElements(node) {
+            // Reset all elements
+            clearHighlight();
             
-            # Interface implementation (multiple possible key names)
-            for implements_key in ["implements", "interfaces"]:
-                if implements_key in metadata and isinstance(metadata[implements_key], list):
-                    for interface in metadata[implements_key]:
-                        interface_id = f"class:{interface}"
-                        
-                        # Add interface node if not exists
-                        if interface_id not in self.graph.nodes:
-                            self.graph.add_node(Node(
-                                id=interface_id,
-                                type=NodeType.CLASS,
-                                label=interface,
-                                short_label=interface,
-                                attributes={"is_interface": True}
-                            ))
-                        
-                        # Connect class to interface
-                        self.graph.add_edge(Edge(
-                            source=node_id,
-                            target=interface_id,
-                            type=EdgeType.IMPLEMENTS
-                        ))
+            // If no node is selected, clear highlight
+            if (!node) return;
+            
+            // Get connected edges and nodes
+            const connectedEdges = node.connectedEdges();
+            const connectedNodes = connectedEdges.connectedNodes();
+            
+            // Add the original node to the connected nodes
+            const allConnected = connectedNodes.union(node);
+            
+            // Highlight connected elements
+            cy.batch(() => {
+                allConnected.addClass('highlight');
+                connectedEdges.addClass('highlight');
+            });
+            
+            // Make all other elements semi-transparent
+            setDimMode(true);
+        }
         
-        # Process function/method relationships
-        if node_type in [NodeType.FUNCTION, NodeType.METHOD]:
-            # Function calls (multiple possible key names)
-            for calls_key in ["calls", "invokes", "uses_functions"]:
-                if calls_key in metadata and isinstance(metadata[calls_key], list):
-                    for called_fn in metadata[calls_key]:
-                        if isinstance(called_fn, str):
-                            # Simple string function reference
-                            called_id = f"function:{called_fn}"
-                            
-                            # Add called function node if not exists
-                            if called_id not in self.graph.nodes:
-                                self.graph.add_node(Node(
-                                    id=called_id,
-                                    type=NodeType.FUNCTION,
-                                    label=called_fn,
-                                    short_label=called_fn
-                                ))
-                            
-                            # Connect function to called function
-                            self.graph.add_edge(Edge(
-                                source=node_id,
-                                target=called_id,
-                                type=EdgeType.CALLS
-                            ))
-    
-    def _process_custom_nodes(self, metadata: Dict[str, Any], node_id: str) -> None:
-        """
-        Process custom node types from metadata.
+        // Event listeners
+        cy.on('mouseover', 'node', function(evt) {
+            scheduleTooltip(() => showNodeTooltip(evt.target, evt));
+        });
         
-        Args:
-            metadata: The metadata dictionary.
-            node_id: The ID of the current node.
-        """
-        # Generic approach to handle any known metadata categories
-        known_categories = {
-            # Category name: (node type, edge type, node prefix)
-            "tech_debt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
-            "techDebt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
-            "tech-debt": (NodeType.TECH_DEBT, EdgeType.HAS_TECH_DEBT, "tech_debt"),
-            "performance": (NodeType.PERFORMANCE, EdgeType.HAS_PERFORMANCE_ISSUE, "perf"),
-            "data_handling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
-            "dataHandling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
-            "data-handling": (NodeType.DATA, EdgeType.PROCESSES_DATA, "data"),
+        cy.on('mouseover', 'edge', function(evt) {
+            scheduleTooltip(() => showEdgeTooltip(evt.target, evt));
+        });
+        
+        cy.on('mouseout', function() {
+            hideTooltip();
+        });
+        
+        cy.on('tap', 'node', function(evt) {
+            highlightConnectedElements(evt.target);
+        });
+        
+        cy.on('tap', function(evt) {
+            if (evt.target === cy) {
+                // Clicked on background, clear highlights
+                clearHighlight();
+                hideTooltip();
+            }
+        });
+        
+        // The hierarchical (dagre) layout runs in a Web Worker so the page stays
+        // responsive while it is computed. Positions come back as a transferable
+        // Float32Array of x, y pairs in node order.
+        const DAGRE_OPTIONS = {rankdir: 'TB', nodesep: 80, ranksep: 100};
+        let layoutWorker = null;
+        
+        function createLayoutWorker() {
+            const source = document.getElementById('dagreWorker').textContent;
+            return new Worker(URL.createObjectURL(new Blob([source], {type: 'text/javascript'})));
         }
         
-        # Process each known category if present in metadata
-        for category_key, (node_type, edge_type, prefix) in known_categories.items():
-            if category_key in metadata:
-                category_data = metadata[category_key]
-                
-                # Handle both list and dictionary formats
-                if isinstance(category_data, list):
-                    for index, item in enumerate(category_data):
-                        self._add_custom_node(node_id, item, node_type, edge_type, f"{prefix}:{index}")
-                elif isinstance(category_data, dict):
-                    self._add_custom_node(node_id, category_data, node_type, edge_type, prefix)
+        function runDagreLayout(animationDuration) {
+            loading.style.display = 'block';
+            uncullAll();
+            
+            const nodes = cy.nodes();
+            const layoutOptions = {
+                padding: 30,
+                fit: true,
+                animate: true,
+                animationDuration: animationDuration,
+                stop: () => {
+                    loading.style.display = 'none';
+                }
+            };
+            
+            // Lay out on the main thread if the worker cannot be used
+            const runInPage = () => {
+                cy.layout(Object.assign({
+                    name: 'dagre',
+                    rankDir: DAGRE_OPTIONS.rankdir,
+                    nodeSep: DAGRE_OPTIONS.nodesep,
+                    rankSep: DAGRE_OPTIONS.ranksep
+                }, layoutOptions)).run();
+            };
+            
+            try {
+                layoutWorker = layoutWorker || createLayoutWorker();
+            } catch (e) {
+                runInPage();
+                return;
+            }
+            
+            layoutWorker.onmessage = event => {
+                const positions = event.data;
+                const byId = {};
+                nodes.forEach((node, i) => {
+                    byId[node.id()] = {x: positions[2 * i], y: positions[2 * i + 1]};
+                });
+                nodes.layout(Object.assign({name: 'preset', positions: byId}, layoutOptions)).run();
+            };
+            layoutWorker.onerror = () => {
+                layoutWorker = null;
+                runInPage();
+            };
+            layoutWorker.postMessage({
+                nodes: nodes.map(node => [node.id(), node.outerWidth(), node.outerHeight()]),
+                edges: cy.edges().map(edge => [edge.data('source'), edge.data('target'), edge.id()]),
+                options: DAGRE_OPTIONS
+            });
+        }
         
-        # Look for any custom properties in the schema and create nodes/edges as appropriate
-        schema_properties = self.schema.schema.get("properties", {})
-        for prop_name, prop_spec in schema_properties.items():
-            # Skip properties we've already handled
-            if prop_name in known_categories or prop_name in ["domain", "dependencies", "name", "service"]:
-                continue
+        if (!graphData.positions_precomputed) {
+            runDagreLayout(500);
+        }
+        
+        // Layout buttons
+        document.getElementById('fit').addEventListener('click', function() {
+            uncullAll();
+            cy.fit();
+        });
+        
+        document.getElementById('hierarchical').addEventListener('click', function() {
+            runDagreLayout(800);
+        });
+        
+        document.getElementById('concentric').addEventListener('click', function() {
+            loading.style.display = 'block';
+            setTimeout(() => {
+                uncullAll();
+                cy.layout({
+                    name: 'concentric',
+                    concentric: function(node) {
+                        // More important nodes in the center
+                        const typeRank = {
+                            'domain': 10,
+                            'service': 9,
+                            'team': 8,
+                            'file': 7,
+                            'class': 6,
+                            'function': 5,
+                            'method': 4,
+                            'variable': 3,
+                            'tech_debt': 2,
+                            'performance': 2,
+                            'data': 1
+                        };
+                        return typeRank[node.data('type')] || 0;
+                    },
+                    levelWidth: function() { return 1; },
+                    animate: true,
+                    animationDuration: 800
+                }).run();
                 
-            # Check if the property is in the metadata
-            if prop_name in metadata:
-                prop_value = metadata[prop_name]
+                setTimeout(() => {
+                    loading.style.display = 'none';
+                }, 900);
+            }, 50);
+        });
+        
+        document.getElementById('force').addEventListener('click', function() {
+            loading.style.display = 'block';
+            setTimeout(() => {
+                uncullAll();
+                cy.layout({
+                    name: 'cose',
+                    idealEdgeLength: 150,
+                    nodeOverlap: 20,
+                    refresh: 20,
+                    fit: true,
+                    padding: 30,
+                    randomize: false,
+                    componentSpacing: 100,
+                    nodeRepulsion: 400000,
+                    edgeElasticity: 100,
+                    nestingFactor: 5,
+                    gravity: 80,
+                    numIter: 1000,
+                    animate: 'end',
+                    animationDuration: 800
+                }).run();
                 
-                # Handle objects that might represent entities
-                if isinstance(prop_value, dict) and "name" in prop_value:
-                    # This looks like an entity with a name
-                    entity_name = prop_value["name"]
-                    entity_type = prop_name.replace("_", "-").replace(" ", "-")
-                    
-                    # Register custom node type
-                    if entity_type not in [t.value for t in NodeType]:
-                        self.custom_node_types.add(entity_type)
-                    
-                    # Create custom node
-                    entity_id = f"{entity_type}:{entity_name}"
-                    if entity_id not in self.graph.nodes:
-                        self.graph.add_node(Node(
-                            id=entity_id,
-                            type=entity_type,  # Use string for custom type
-                            label=entity_name,
-                            short_label=entity_name,
-                            attributes=prop_value
-                        ))
-                    
-                    # Create relationship
-                    relationship_type = f"has_{entity_type}"
-                    if relationship_type not in [t.value for t in EdgeType]:
-                        self.custom_edge_types.add(relationship_type)
-                    
-                    self.graph.add_edge(Edge(
-                        source=node_id,
-                        target=entity_id,
-                        type=relationship_type  # Use string for custom type
-                    ))
-    
-    def _add_custom_node(self, parent_id: str, data: Dict[str, Any], node_type: NodeType, edge_type: EdgeType, prefix: str) -> None:
-        """
-        Add a custom node based on metadata.
+                setTimeout(() => {
+                    loading.style.display = 'none';
+                }, 1000);
+            }, 50);
+        });
         
-        Args:
-            parent_id: The ID of the parent node.
-            data: The data for the custom node.
-            node_type: The type of node.
-            edge_type: The type of edge to connect parent and custom node.
-            prefix: Prefix for the custom node ID.
-        """
-        # Determine label based on data content
-        label = None
-        for key in ["name", "issue", "title", "type", "consideration", "dataType"]:
-            if key in data and isinstance(data[key], str):
-                label = data[key]
-                break
+        // Filter by node type
+        filterSelect.addEventListener('change', function() {
+            const selectedType = this.value;
+            
+            if (selectedType === 'all') {
+                cy.elements().removeClass('semitransparent');
+                return;
+            }
+            
+            // Filter nodes by selected type
+            const selectedNodes = cy.nodes('.' + selectedType);
+            const connectedEdges = selectedNodes.connectedEdges();
+            
+            // Make non-matching elements semi-transparent
+            cy.elements().addClass('semitransparent');
+            selectedNodes.removeClass('semitransparent');
+            connectedEdges.removeClass('semitransparent');
+        });
         
-        if not label:
-            # Use node type as fallback label
-            label = node_type.value.replace("_", " ").capitalize()
+        document.getElementById('resetFilter').addEventListener('click', function() {
+            clearHighlight();
+            filterSelect.value = 'all';
+        });
         
-        # Create unique ID for this custom node
-        custom_id = f"{parent_id}:{prefix}"
+        // Toggle legend
+        document.getElementById('toggleLegend').addEventListener('click', function() {
+            legend.style.display = legend.style.display === 'none' ? 'block' : 'none';
+        });
         
-        # Add custom node
-        self.graph.add_node(Node(
-            id=custom_id,
-            type=node_type,
-            label=label,
-            short_label=label,
-            attributes=data
-        ))
+        // Search functionality. Each node's label and string attributes are lowercased
+        // into one string once, so a search is a single includes() per node.
+        const SEARCH_DEBOUNCE_MS = 150;
+        const SEARCH_FIELD_SEPARATOR = '\\0';
+        let searchIndexBuilt = false;
+        let searchTimer = null;
         
-        # Connect parent to custom node
-        self.graph.add_edge(Edge(
-            source=parent_id,
-            target=custom_id,
-            type=edge_type
-        ))
-    
-    def build_from_parsed_files(self, parsed_files: List[ParsedFile]) -> KnowledgeGraph:
-        """
-        Build a knowledge graph from parsed files.
+        function buildSearchIndex() {
+            cy.nodes().forEach(node => {
+                const data = node.data();
+                const fields = [data.label, data.short_label || ''];
+                for (const keys of Object.values(data.groups)) {
+                    for (const key of keys) {
+                        if (typeof data[key] === 'string') {
+                            fields.push(data[key]);
+                        }
+                    }
+                }
+                node.scratch('_search', fields.join(SEARCH_FIELD_SEPARATOR).toLowerCase());
+            });
+            searchIndexBuilt = true;
+        }
         
-        Args:
-            parsed_files: List of parsed files.
+        function runSearch() {
+            clearTimeout(searchTimer);
+            searchTimer = null;
+            
+            const searchTerm = searchInput.value.toLowerCase();
+            if (!searchTerm) return;
+            
+            // Reset highlighting
+            clearHighlight();
+            
+            if (!searchIndexBuilt) {
+                buildSearchIndex();
+            }
+            const searchableNodes = cy.nodes().filter(node => node.scratch('_search').includes(searchTerm));
+            
+            if (searchableNodes.length > 0) {
+                // Highlight matching nodes
+                searchableNodes.addClass('highlight');
+                
+                // Make non-matching elements semi-transparent
+                setDimMode(true);
+                
+                // Center the view on the first match
+                uncullAll();
+                cy.animate({
+                    fit: {
+                        eles: searchableNodes,
+                        padding: 50
+                    },
+                    duration: 500
+                });
+            }
+        }
         
-        Returns:
-            The built knowledge graph.
-        """
-        for parsed_file in parsed_files:
-            self.add_file(parsed_file)
+        document.getElementById('searchBtn').addEventListener('click', runSearch);
+        
+        // Search as the user types, once typing pauses
+        searchInput.addEventListener('input', function() {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(runSearch, SEARCH_DEBOUNCE_MS);
+        });
+        
+        // Also trigger search on Enter key
+        searchInput.addEventListener('keyup', function(event) {
+            if (event.key === 'Enter') {
+                runSearch();
+            }
+        });
+        
+        // Save snapshot
+        document.getElementById('snapshot').addEventListener('click', function() {
+            // Create a PNG snapshot of the current view
+            const png = cy.png({
+                output: 'blob',
+                bg: 'white',
+                full: false,
+                scale: 2,
+                quality: 1
+            });
+            
+            // Save the image
+            saveAs(png, 'knowledge_graph.png');
+        });
         
-        return self.graph 
\ No newline at end of file
+        // Fit the graph to the viewport initially
+        cy.ready(() => {
+            uncullAll();
+            cy.fit();
+        });
+    </script>
+</body>
+</html>
+"""
+
+# Escapes that make a JSON document safe inside a single-quoted JS string in a
+# <script> element, applied in a single str.translate pass. '<' is escaped so the
+# data can never close the element; line breaks need no entry because JSON
+# output never contains them unescaped, but U+2028/U+2029 can appear verbatim.
+_JS_STRING_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    "'": "\\'",
+    '<': '\\u003c',
+    '\u2028': '\\u2028',
+    '\u2029': '\\u2029',
+})
+
+# Header split at its title fields, so filling them in is a single join, and
+# the footer, both encoded once
+_HTML_HEADER_PARTS = _HTML_HEADER.encode('utf-8').split(b"{title}")
+_HTML_FOOTER_BYTES = _HTML_FOOTER.encode('utf-8')
+
+# Characters of embedded graph data encoded and written at a time
+_HTML_WRITE_CHUNK_SIZE = 1 << 20
@@ -9,12 +9,20 @@
 import re
 import os
 import json
+import mmap
+import bisect
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
-from adp_py.core.schema import ADPSchema, get_schema, ADPMetadata
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra in pyproject.toml
+    orjson = None
+
+from adp_py.core.schema import ADPSchema, get_schema, ADPMetadata, DATACLASS_SLOTS
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -28,7 +36,8 @@ class CodeScope(str, Enum):
     VARIABLE = "variable"
 
 
-@dataclass
+# One ParsedFile is kept per scanned file
+@dataclass(**DATACLASS_SLOTS)
 class ParsedFile:
     """Representation of a parsed file with ADP metadata."""
     file_path: str
@@ -40,45 +49,102 @@ class ParsedFile:
         return len(self.metadata_blocks) > 0
 
 
-# Language-specific comment patterns
+# Version of the parse results, bumped whenever the same file starts parsing
+# differently so that results persisted by earlier versions are not reused
+PARSER_VERSION = 4
+
+# Language-specific comment patterns. The multiline patterns set the DOTALL flag inline
+# ("(?s)") so that "." spans lines there while the single line patterns stay on one line.
 COMMENT_PATTERNS = {
     "py": {
         "single": r"#\s*@ai-metadata\s*({.*})",  # Single line comment
         "multi_start": r'"""',  # Start of multiline comment
         "multi_end": r'"""',    # End of multiline comment
-        "multi_pattern": r'"""(?:\s*\n)?(?:[\s\S]*?)@ai-metadata\s*(\{[\s\S]*?\})',  # Multiline comment with metadata
+        "multi_pattern": r'(?s)"""(?:\s*\n)?.*?@ai-metadata\s*(\{.*?\})',  # Multiline comment with metadata
         "line_comment": r"#"    # Line comment marker
     },
     "js": {
         "single": r"//\s*@ai-metadata\s*({.*})",  # Single line comment
         "multi_start": r"/\*\*",  # Start of multiline comment
         "multi_end": r"\*/",      # End of multiline comment
-        "multi_pattern": r"/\*\*[\s\S]*?@ai-metadata\s*({[\s\S]*?})[\s\S]*?\*/",  # Multiline comment with metadata
+        "multi_pattern": r"(?s)/\*\*.*?@ai-metadata\s*({.*?}).*?\*/",  # Multiline comment with metadata
         "line_comment": r"\*"      # Line comment marker
     },
     "ts": {
         "single": r"//\s*@ai-metadata\s*({.*})",  # Single line comment
         "multi_start": r"/\*\*",  # Start of multiline comment
         "multi_end": r"\*/",      # End of multiline comment
-        "multi_pattern": r"/\*\*[\s\S]*?@ai-metadata\s*({[\s\S]*?})[\s\S]*?\*/",  # Multiline comment with metadata
+        "multi_pattern": r"(?s)/\*\*.*?@ai-metadata\s*({.*?}).*?\*/",  # Multiline comment with metadata
         "line_comment": r"\*"      # Line comment marker
     },
     "java": {
         "single": r"//\s*@ai-metadata\s*({.*})",  # Single line comment
         "multi_start": r"/\*\*",  # Start of multiline comment
         "multi_end": r"\*/",      # End of multiline comment
-        "multi_pattern": r"/\*\*[\s\S]*?@ai-metadata\s*({[\s\S]*?})[\s\S]*?\*/",  # Multiline comment with metadata
+        "multi_pattern": r"(?s)/\*\*.*?@ai-metadata\s*({.*?}).*?\*/",  # Multiline comment with metadata
         "line_comment": r"\*"      # Line comment marker
     },
     "cs": {
         "single": r"//\s*@ai-metadata\s*({.*})",  # Single line comment
         "multi_start": r"/\*\*",  # Start of multiline comment
         "multi_end": r"\*/",      # End of multiline comment
-        "multi_pattern": r"/\*\*[\s\S]*?@ai-metadata\s*({[\s\S]*?})[\s\S]*?\*/",  # Multiline comment with metadata
+        "multi_pattern": r"(?s)/\*\*.*?@ai-metadata\s*({.*?}).*?\*/",  # Multiline comment with metadata
         "line_comment": r"\*"      # Line comment marker
     },
 }
 
+# COMMENT_PATTERNS compiled once at import, under the same language and pattern names
+_COMPILED_PATTERNS = {
+    language: {name: re.compile(pattern) for name, pattern in patterns.items()}
+    for language, patterns in COMMENT_PATTERNS.items()
+}
+
+# Multiline comment delimiters, as plain strings for str.find(). Python blocks have no
+# closing delimiter of their own: the docstring quotes are not matched up.
+_MULTILINE_DELIMITERS = {
+    "py": ('"""', None),
+    "js": ("/**", "*/"),
+    "ts": ("/**", "*/"),
+    "java": ("/**", "*/"),
+    "cs": ("/**", "*/"),
+}
+
+_METADATA_MARKER = "@ai-metadata"
+_METADATA_MARKER_BYTES = _METADATA_MARKER.encode('ascii')
+
+# Whitespace and the opening brace of the JSON object after the marker
+_JSON_START_RE = re.compile(r"\s*\{")
+
+_JSON_DECODER = json.JSONDecoder()
+
+# orjson's JSONDecodeError subclasses json's, so either loads() fails the same way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_NEWLINE_RE = re.compile(r"\n")
+
+# String fields recovered from metadata JSON that cannot be parsed at all
+_SALVAGE_FIELD_RE = re.compile(r'"(domain|name|description|service|teamOwner)"\s*:\s*"([^"]+)"')
+
+# Python definition following a metadata block, found line by line in the whole text
+# (whitespace other than line breaks only, so that a match stays on its line)
+_DEF_OR_CLASS_RE = re.compile(r'^[^\S\n]*(def|class)[^\S\n]+\w+', re.MULTILINE)
+
+# Declarations recognized by determine_scope
+_CLASS_RE = re.compile(r"class\s+\w+")
+_PY_DEF_RE = re.compile(r"def\s+\w+")
+_PY_DECORATOR_RE = re.compile(r"@\w+")
+_JS_FUNCTION_RE = re.compile(r"(async\s+)?function\s+\w+")
+_JS_ARROW_FUNCTION_RE = re.compile(r"const\s+\w+\s*=\s*(\(.*\)|async\s*\(.*\))\s*=>")
+_JAVA_CLASS_RE = re.compile(r"(public|private|protected)?\s*(static)?\s*class\s+\w+")
+_JAVA_METHOD_RE = re.compile(r"(public|private|protected)?\s*(static)?\s*\w+\s+\w+\s*\(")
+
+# Below this many files, worker start-up costs more than parallel parsing saves
+_PARALLEL_MIN_FILES = 8
+
+# Directories that hold version control data, dependencies or caches rather than
+# the project's own sources
+_SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__", "venv", ".venv"})
+
 # File extension to language mapping
 EXTENSION_TO_LANGUAGE = {
     ".py": "py",
@@ -90,6 +156,10 @@ EXTENSION_TO_LANGUAGE = {
     ".cs": "cs",
 }
 
+# Supported extensions for a single str.endswith() call, which rules out most files
+# in a walk before the full get_language_from_file_path() check
+_SOURCE_SUFFIXES = tuple(EXTENSION_TO_LANGUAGE)
+
 
 def get_language_from_file_path(file_path: str) -> Optional[str]:
     """
@@ -101,8 +171,147 @@ def get_language_from_file_path(file_path: str) -> Optional[str]:
     Returns:
         The language identifier or None if the language is not supported.
     """
-    _, ext = os.path.splitext(file_path.lower())
-    return EXTENSION_TO_LANGUAGE.get(ext)
+    # Called for every file walked, so look the text after the last dot up directly.
+    # Extensions hold no separators, so a dot in a directory name never matches.
+    dot = file_path.rfind('.')
+    language = EXTENSION_TO_LANGUAGE.get(file_path[dot:].lower()) if dot != -1 else None
+    if language is not None and (dot == 0 or file_path[dot - 1] in '/\\.'):
+        # Possibly a dotfile such as ".py", which os.path.splitext does not treat as
+        # having an extension; let it decide
+        _, ext = os.path.splitext(file_path.lower())
+        return EXTENSION_TO_LANGUAGE.get(ext)
+    return language
+
+
+def iter_source_files(root: str, recursive: bool = True) -> Iterator[os.DirEntry]:
+    """
+    Yield entries of supported source files below a directory.
+    
+    Uses os.scandir so that file type information cached on each DirEntry is
+    reused instead of issuing a separate stat() call per entry. The entries are
+    yielded as-is so callers can reuse their cached stat data as well. Version
+    control, dependency and cache directories (_SKIP_DIRS) are not descended into.
+    
+    Args:
+        root: Directory to walk.
+        recursive: Whether to descend into subdirectories.
+    
+    Yields:
+        DirEntry objects for files with a supported language extension.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and entry.name not in _SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif (entry.name.lower().endswith(_SOURCE_SUFFIXES)
+                          and entry.is_file() and get_language_from_file_path(entry.name)):
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {directory}: {e}")
+            continue
+        # Reverse so subdirectories are visited in listing order (like os.walk)
+        stack.extend(reversed(subdirs))
+
+
+def _iter_multiline_metadata(text: str, opener: str, closer: Optional[str]) -> Iterator[Tuple[int, str, Optional[Dict[str, Any]]]]:
+    """
+    Find the metadata JSON objects in multiline comments.
+    
+    The marker and delimiters are located with str.find() and the JSON object is
+    read by orjson or the JSON decoder, so the scan is linear in the length of the
+    text. It yields the same blocks as the old "opener, anything, marker, lazy
+    {...}" regex, except that nested objects are read in full instead of up to
+    the first "}".
+    
+    Args:
+        text: The code text to search.
+        opener: String starting a multiline comment.
+        closer: String ending a multiline comment, or None if a block ends with its JSON.
+    
+    Yields:
+        Tuples of (offset of the comment opener, JSON text, decoded object). The
+        decoded object is None if the text is not valid JSON, in which case the
+        JSON text runs up to the first "}".
+    """
+    position = 0
+    while True:
+        start = text.find(opener, position)
+        if start == -1:
+            return
+        
+        # First marker after the opener that is followed by an object
+        marker = text.find(_METADATA_MARKER, start + len(opener))
+        while marker != -1:
+            json_start = _JSON_START_RE.match(text, marker + len(_METADATA_MARKER))
+            if json_start:
+                break
+            marker = text.find(_METADATA_MARKER, marker + 1)
+        if marker == -1:
+            return
+        
+        brace = json_start.end() - 1
+        metadata = None
+        if orjson is not None:
+            # The object is usually all that is left of the comment, and orjson parses
+            # it faster than the JSON decoder can. If it isn't, fall back to the decoder.
+            comment_end = text.find(closer or opener, brace)
+            if comment_end != -1:
+                json_text = text[brace:comment_end].rstrip()
+                try:
+                    metadata = orjson.loads(json_text)
+                    end = brace + len(json_text)
+                except orjson.JSONDecodeError:
+                    pass
+        if metadata is None:
+            try:
+                metadata, end = _JSON_DECODER.raw_decode(text, brace)
+            except ValueError:
+                # Leave malformed JSON to the caller's repair heuristics
+                end = text.find('}', brace + 1) + 1
+                if end == 0:
+                    return
+                metadata = None
+        
+        if closer is None:
+            position = end
+        else:
+            comment_end = text.find(closer, end)
+            if comment_end == -1:
+                return
+            position = comment_end + len(closer)
+        
+        yield start, text[brace:end], metadata
+
+
+def _find_definitions(text: str, newline_offsets: List[int]) -> Tuple[List[int], List[str]]:
+    """
+    Find the function and class definitions in code text.
+    
+    This is a single regex scan rather than ast.parse(), which is over ten times
+    slower on large modules and fails on files with syntax errors.
+    
+    Args:
+        text: The code text to search.
+        newline_offsets: Offsets of all line breaks in the text.
+    
+    Returns:
+        The 0-based line indices of the definitions in ascending order, and the
+        scope ("function" or "class") of each.
+    """
+    line_indices = []
+    scopes = []
+    for match in _DEF_OR_CLASS_RE.finditer(text):
+        line_index = bisect.bisect_left(newline_offsets, match.start())
+        line_end = newline_offsets[line_index] if line_index < len(newline_offsets) else len(text)
+        line_indices.append(line_index)
+        scopes.append("function" if "def " in text[match.start():line_end] else "class")
+    return line_indices, scopes
 
 
 def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str, Any]]:
@@ -120,17 +329,26 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
         logger.warning(f"Unsupported language: {language}")
         return []
 
-    patterns = COMMENT_PATTERNS[language]
+    # Without the marker there is nothing for any pattern to find
+    if _METADATA_MARKER not in text:
+        return []
+
+    patterns = _COMPILED_PATTERNS[language]
     metadata_blocks = []
 
-    # Extract single line metadata
+    # Offsets of all line breaks, so the line of a match is one bisection away
+    newline_offsets = [match.start() for match in _NEWLINE_RE.finditer(text)]
+
+    # Extract single line metadata. No language in COMMENT_PATTERNS defines a
+    # "single_pattern" (only "single"), so this pass is currently skipped and the
+    # multiline scan below is the only pass over the text.
     if "single_pattern" in patterns:
-        single_matches = re.finditer(patterns["single_pattern"], text)
+        single_matches = patterns["single_pattern"].finditer(text)
         for match in single_matches:
             json_str = match.group(1).strip()
             try:
-                metadata = json.loads(json_str)
-                line_num = len(text[:match.start()].split('\n'))
+                metadata = _json_loads(json_str)
+                line_num = bisect.bisect_left(newline_offsets, match.start()) + 1
                 metadata_blocks.append({
                     "metadata": metadata,
                     "line": line_num,
@@ -141,14 +359,22 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
                 logger.warning(f"Failed to parse JSON from single line comment: {e}")
 
     # Extract multi-line metadata
-    if "multi_pattern" in patterns:
-        logger.debug(f"Searching for multiline metadata with pattern: {patterns['multi_pattern'][:50]}")
-        multi_matches = re.finditer(patterns["multi_pattern"], text)
+    if language in _MULTILINE_DELIMITERS:
+        opener, closer = _MULTILINE_DELIMITERS[language]
         match_count = 0
-        for match in multi_matches:
+        for start, json_str, metadata in _iter_multiline_metadata(text, opener, closer):
             match_count += 1
-            json_str = match.group(1).strip()
             logger.debug(f"Match {match_count} raw text: {json_str}")
+            line_num = bisect.bisect_left(newline_offsets, start) + 1
+            
+            if metadata is not None:
+                metadata_blocks.append({
+                    "metadata": metadata,
+                    "line": line_num,
+                    "type": "multi"
+                })
+                logger.debug(f"Found multiline metadata at line {line_num}")
+                continue
             
             # Clean up the JSON string
             cleaned_json = json_str.strip()
@@ -161,8 +387,7 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
                 cleaned_json = cleaned_json + '}'
             
             try:
-                metadata = json.loads(cleaned_json)
-                line_num = len(text[:match.start()].split('\n'))
+                metadata = _json_loads(cleaned_json)
                 metadata_blocks.append({
                     "metadata": metadata,
                     "line": line_num,
@@ -181,8 +406,7 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
                     fixed_json = fixed_json + '}'
                 
                 try:
-                    metadata = json.loads(fixed_json)
-                    line_num = len(text[:match.start()].split('\n'))
+                    metadata = _json_loads(fixed_json)
                     metadata_blocks.append({
                         "metadata": metadata,
                         "line": line_num,
@@ -196,46 +420,23 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
                     # Create a minimal valid JSON with just the domain
                     minimal_metadata = {}
                     
-                    # Try to extract domain using regex
-                    domain_match = re.search(r'"domain"\s*:\s*"([^"]+)"', cleaned_json)
-                    if domain_match:
-                        domain = domain_match.group(1)
-                        logger.debug(f"Manually extracted domain: {domain}")
-                        minimal_metadata["domain"] = domain
-                    
-                    # Try to extract name using regex
-                    name_match = re.search(r'"name"\s*:\s*"([^"]+)"', cleaned_json)
-                    if name_match:
-                        name = name_match.group(1)
-                        logger.debug(f"Manually extracted name: {name}")
-                        minimal_metadata["name"] = name
+                    # Find the first value of each field we can recover, in one pass
+                    salvaged = {}
+                    for field_match in _SALVAGE_FIELD_RE.finditer(cleaned_json):
+                        salvaged.setdefault(field_match.group(1), field_match.group(2))
                     
-                    # Try to extract description using regex
-                    desc_match = re.search(r'"description"\s*:\s*"([^"]+)"', cleaned_json)
-                    if desc_match:
-                        description = desc_match.group(1)
-                        logger.debug(f"Manually extracted description: {description}")
-                        minimal_metadata["description"] = description
+                    for key in ("domain", "name", "description"):
+                        if key in salvaged:
+                            logger.debug(f"Manually extracted {key}: {salvaged[key]}")
+                            minimal_metadata[key] = salvaged[key]
                     
-                    # Try to extract service boundary information
-                    service_match = re.search(r'"service"\s*:\s*"([^"]+)"', cleaned_json)
-                    if service_match:
-                        service = service_match.group(1)
-                        logger.debug(f"Manually extracted service: {service}")
-                        if "serviceBoundary" not in minimal_metadata:
-                            minimal_metadata["serviceBoundary"] = {}
-                        minimal_metadata["serviceBoundary"]["service"] = service
-                    
-                    team_match = re.search(r'"teamOwner"\s*:\s*"([^"]+)"', cleaned_json)
-                    if team_match:
-                        team = team_match.group(1)
-                        logger.debug(f"Manually extracted team owner: {team}")
-                        if "serviceBoundary" not in minimal_metadata:
-                            minimal_metadata["serviceBoundary"] = {}
-                        minimal_metadata["serviceBoundary"]["teamOwner"] = team
+                    # Service boundary information
+                    for key in ("service", "teamOwner"):
+                        if key in salvaged:
+                            logger.debug(f"Manually extracted {key}: {salvaged[key]}")
+                            minimal_metadata.setdefault("serviceBoundary", {})[key] = salvaged[key]
                     
                     if minimal_metadata:
-                        line_num = len(text[:match.start()].split('\n'))
                         metadata_blocks.append({
                             "metadata": minimal_metadata,
                             "line": line_num,
@@ -246,19 +447,21 @@ def extract_metadata_from_text(text: str, language: str = "py") -> List[Dict[str
         logger.debug(f"Found {match_count} potential metadata blocks")
 
     if metadata_blocks:
-        # Determine scope for each metadata block
+        # Determine scope for each metadata block. Definitions are collected in one
+        # pass over the text, the first time a block needs them.
+        definition_lines = None
         for block in metadata_blocks:
             line_num = block["line"]
             # Simple heuristic: if it's at the top of the file, it's file scope
             if line_num <= 5:
                 block["scope"] = "file"
             else:
+                if definition_lines is None:
+                    definition_lines, definition_scopes = _find_definitions(text, newline_offsets)
                 # Find the next function or class definition after the metadata
-                lines = text.split("\n")
-                for i in range(line_num, len(lines)):
-                    if re.match(r'^\s*(def|class)\s+\w+', lines[i]):
-                        block["scope"] = "function" if "def " in lines[i] else "class"
-                        break
+                index = bisect.bisect_left(definition_lines, line_num)
+                if index < len(definition_lines):
+                    block["scope"] = definition_scopes[index]
                 else:
                     block["scope"] = "file"  # Default to file scope if no function/class found
             
@@ -289,35 +492,35 @@ def determine_scope(content: str, position: int, language: str) -> str:
     # Determine scope based on language and code after the metadata
     if language == "py":
         # Python scope detection
-        if re.match(r"class\s+\w+", code_after):
+        if _CLASS_RE.match(code_after):
             scope = "class"
-        elif re.match(r"def\s+\w+", code_after):
+        elif _PY_DEF_RE.match(code_after):
             scope = "function"
-        elif re.match(r"@\w+", code_after):
+        elif _PY_DECORATOR_RE.match(code_after):
             # Check for decorators
             lines = code_after.split("\n")
             for i, line in enumerate(lines):
-                if i > 0 and re.match(r"def\s+\w+", line.strip()):
+                if i > 0 and _PY_DEF_RE.match(line.strip()):
                     scope = "function"
                     break
-                elif i > 0 and re.match(r"class\s+\w+", line.strip()):
+                elif i > 0 and _CLASS_RE.match(line.strip()):
                     scope = "class"
                     break
         else:
             scope = "variable"
     elif language in ["js", "ts"]:
         # JavaScript/TypeScript scope detection
-        if re.match(r"class\s+\w+", code_after):
+        if _CLASS_RE.match(code_after):
             scope = "class"
-        elif re.match(r"(async\s+)?function\s+\w+", code_after) or re.match(r"const\s+\w+\s*=\s*(\(.*\)|async\s*\(.*\))\s*=>", code_after):
+        elif _JS_FUNCTION_RE.match(code_after) or _JS_ARROW_FUNCTION_RE.match(code_after):
             scope = "function"
         else:
             scope = "variable"
     elif language in ["java", "cs"]:
         # Java/C# scope detection
-        if re.match(r"(public|private|protected)?\s*(static)?\s*class\s+\w+", code_after):
+        if _JAVA_CLASS_RE.match(code_after):
             scope = "class"
-        elif re.match(r"(public|private|protected)?\s*(static)?\s*\w+\s+\w+\s*\(", code_after):
+        elif _JAVA_METHOD_RE.match(code_after):
             scope = "method"
         else:
             scope = "variable"
@@ -325,6 +528,132 @@ def determine_scope(content: str, position: int, language: str) -> str:
     return scope
 
 
+def _read_marked_text(file_path: str) -> Optional[str]:
+    """
+    Read a file as text if it contains the @ai-metadata marker.
+    
+    The file is memory-mapped, so files without the marker (most of them) are
+    searched without being read into memory or decoded.
+    
+    Args:
+        file_path: Path to the file.
+    
+    Returns:
+        The UTF-8 decoded content with line endings translated as in text mode,
+        or None if the file does not contain the marker. Bytes that are not valid
+        UTF-8 are replaced rather than failing the whole file, since the metadata
+        itself is rarely where they occur.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return None
+        except OSError:
+            # Not mappable (a pipe, say), read it instead
+            raw_content = f.read()
+            if _METADATA_MARKER_BYTES not in raw_content:
+                return None
+            mapped = None
+        
+        if mapped is not None:
+            with mapped:
+                if mapped.find(_METADATA_MARKER_BYTES) == -1:
+                    return None
+                has_carriage_returns = mapped.find(b'\r') != -1
+                content = str(mapped, 'utf-8', 'replace')
+        else:
+            has_carriage_returns = b'\r' in raw_content
+            content = raw_content.decode('utf-8', errors='replace')
+    
+    if has_carriage_returns:
+        # Same line endings as reading in text mode
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _parse_file(file_path: str) -> ParsedFile:
+    """
+    Parse a file for ADP metadata.
+    
+    Parsing does not depend on the parser's schema, so this also runs in worker
+    processes, which need not have the schema registered.
+    
+    Args:
+        file_path: Path to the file to parse.
+    
+    Returns:
+        A ParsedFile object containing the parsed metadata.
+    """
+    language = get_language_from_file_path(file_path)
+    if not language:
+        logger.warning(f"Unsupported file type: {file_path}")
+        return ParsedFile(file_path=file_path, metadata_blocks=[])
+    
+    try:
+        logger.info(f"Parsing file: {file_path} (language: {language})")
+        content = _read_marked_text(file_path)
+        if content is None:
+            return ParsedFile(file_path=file_path, metadata_blocks=[])
+        
+        metadata_positions = extract_metadata_from_text(content, language)
+        logger.debug(f"Found {len(metadata_positions)} potential metadata blocks")
+        
+        metadata_blocks = []
+        
+        for metadata_block in metadata_positions:
+            metadata = metadata_block["metadata"]
+            line_number = metadata_block["line"]
+            scope = metadata_block["scope"]
+            
+            # Debug prints
+            logger.debug(f"Metadata type: {type(metadata)}")
+            logger.debug(f"Metadata content: {metadata}")
+            logger.debug(f"Line number: {line_number}")
+            logger.debug(f"Scope: {scope}")
+            
+            # Create ADPMetadata object
+            metadata_obj = ADPMetadata(
+                metadata=metadata,
+                file_path=file_path,
+                line_number=line_number,
+                scope=scope
+            )
+            metadata_blocks.append(metadata_obj)
+        
+        logger.info(f"Successfully parsed {len(metadata_blocks)} metadata blocks from {file_path}")
+        return ParsedFile(file_path=file_path, metadata_blocks=metadata_blocks)
+    except Exception as e:
+        logger.error(f"Error parsing file {file_path}: {e}")
+        return ParsedFile(file_path=file_path, metadata_blocks=[])
+
+
+def iter_parse_files(file_paths: List[str], max_workers: Optional[int] = None) -> Iterator[ParsedFile]:
+    """
+    Parse files for ADP metadata, in a process pool when there are enough of them.
+    
+    As with any use of multiprocessing, scripts calling this on platforms that
+    spawn worker processes (Windows, macOS) need an if __name__ == "__main__" guard.
+    
+    Args:
+        file_paths: Paths of the files to parse.
+        max_workers: Number of worker processes. If None, uses one per CPU;
+            1 parses in this process.
+    
+    Yields:
+        A ParsedFile for every path, with or without metadata, in the order given.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(file_paths) < _PARALLEL_MIN_FILES:
+        yield from map(_parse_file, file_paths)
+        return
+    
+    chunksize = max(1, min(32, len(file_paths) // (max_workers * 4)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(_parse_file, file_paths, chunksize=chunksize)
+
+
 class ADPParser:
     """Parser for extracting and validating ADP metadata from code files."""
     
@@ -336,6 +665,9 @@ class ADPParser:
             schema_name: Name of the schema to use for validation. If None, uses the active schema.
         """
         self.schema = get_schema(schema_name)
+        # Reuse the schema's compiled validator, so per-block validation is a single call
+        # and creating a parser does not serialize the schema to look it up again
+        self._validator = self.schema.validators["compiled"]
     
     def parse_file(self, file_path: str) -> ParsedFile:
         """
@@ -347,69 +679,62 @@ class ADPParser:
         Returns:
             A ParsedFile object containing the parsed metadata.
         """
-        language = get_language_from_file_path(file_path)
-        if not language:
-            logger.warning(f"Unsupported file type: {file_path}")
-            return ParsedFile(file_path=file_path, metadata_blocks=[])
+        return _parse_file(file_path)
+    
+    def parse_files(self, file_paths: Iterable[str]) -> List[ParsedFile]:
+        """
+        Parse a sequence of files for ADP metadata.
         
-        try:
-            logger.info(f"Parsing file: {file_path} (language: {language})")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            metadata_positions = extract_metadata_from_text(content, language)
-            logger.debug(f"Found {len(metadata_positions)} potential metadata blocks")
-            
-            metadata_blocks = []
-            
-            for metadata_block in metadata_positions:
-                metadata = metadata_block["metadata"]
-                line_number = metadata_block["line"]
-                scope = metadata_block["scope"]
-                
-                # Debug prints
-                logger.debug(f"Metadata type: {type(metadata)}")
-                logger.debug(f"Metadata content: {metadata}")
-                logger.debug(f"Line number: {line_number}")
-                logger.debug(f"Scope: {scope}")
-                
-                # Create ADPMetadata object
-                metadata_obj = ADPMetadata(
-                    metadata=metadata,
-                    file_path=file_path,
-                    line_number=line_number,
-                    scope=scope
-                )
-                metadata_blocks.append(metadata_obj)
-            
-            logger.info(f"Successfully parsed {len(metadata_blocks)} metadata blocks from {file_path}")
-            return ParsedFile(file_path=file_path, metadata_blocks=metadata_blocks)
-        except Exception as e:
-            logger.error(f"Error parsing file {file_path}: {e}")
-            return ParsedFile(file_path=file_path, metadata_blocks=[])
+        Args:
+            file_paths: Iterable of paths to the files to parse.
+        
+        Returns:
+            List of ParsedFile objects for the files that contain metadata.
+        """
+        result = []
+        for file_path in file_paths:
+            parsed_file = self.parse_file(file_path)
+            if parsed_file.has_metadata:
+                result.append(parsed_file)
+        return result
+    
+    def iter_parse_directory(self, directory: str, recursive: bool = True,
+                             max_workers: Optional[int] = None) -> Iterator[ParsedFile]:
+        """
+        Parse all files in a directory for ADP metadata, one file at a time.
+        
+        Supported files are found with iter_source_files() and parsed with
+        iter_parse_files(), so larger directories are parsed in a process pool.
+        
+        Args:
+            directory: Directory to parse.
+            recursive: Whether to recursively parse subdirectories.
+            max_workers: Number of worker processes. If None, uses one per CPU;
+                1 parses in this process.
+        
+        Yields:
+            ParsedFile objects for the files that contain metadata, as they are
+            parsed and in directory walk order.
+        """
+        file_paths = [entry.path for entry in iter_source_files(directory, recursive)]
+        for parsed_file in iter_parse_files(file_paths, max_workers):
+            if parsed_file.has_metadata:
+                yield parsed_file
     
-    def parse_directory(self, directory: str, recursive: bool = True) -> List[ParsedFile]:
+    def parse_directory(self, directory: str, recursive: bool = True,
+                        max_workers: Optional[int] = None) -> List[ParsedFile]:
         """
         Parse all files in a directory for ADP metadata.
         
         Args:
             directory: Directory to parse.
             recursive: Whether to recursively parse subdirectories.
+            max_workers: Number of worker processes, as for iter_parse_directory().
         
         Returns:
             List of ParsedFile objects.
         """
-        result = []
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if get_language_from_file_path(file_path):
-                    parsed_file = self.parse_file(file_path)
-                    if parsed_file.has_metadata:
-                        result.append(parsed_file)
-            if not recursive:
-                break
-        return result
+        return list(self.iter_parse_directory(directory, recursive, max_workers))
     
     def validate_metadata(self, metadata: ADPMetadata) -> bool:
         """
@@ -421,7 +746,7 @@ class ADPParser:
         Returns:
             True if the metadata is valid, False otherwise.
         """
-        return self.schema.validate(metadata)
+        return self._validator(metadata)
     
     def get_validation_errors(self, metadata: ADPMetadata) -> List[str]:
         """
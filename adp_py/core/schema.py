@@ -6,17 +6,128 @@
 """
 
 import os
-import yaml
+import sys
 import json
-from typing import Dict, Any, Optional, List, Union
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional, List, Union
 from dataclasses import dataclass, field
-import jsonschema
+
+# yaml and jsonschema are imported where they are used: loading the default schema
+# needs neither when fastjsonschema is installed, and both are slow to import
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+try:
+    import fastjsonschema
+except ImportError:  # Optional speedup, see the "fast" extra in pyproject.toml
+    fastjsonschema = None
 
 # Registry for storing multiple schemas
 _schema_registry: Dict[str, Dict[str, Any]] = {}
 _active_schema_name: str = "default"
 
-@dataclass
+# Compiled validators, keyed by the canonical JSON form of their schema
+_VALIDATOR_CACHE: Dict[str, "Validator"] = {}
+
+
+def _schema_key(schema: Dict[str, Any]) -> str:
+    """Return a canonical key identifying a schema by its content."""
+    return json.dumps(schema, sort_keys=True)
+
+
+def get_validator(schema: Dict[str, Any]) -> "Validator":
+    """
+    Get a compiled validator for a schema, reusing a cached one when possible.
+    
+    Args:
+        schema: The JSON schema dictionary.
+    
+    Returns:
+        A validator for the draft the schema declares in "$schema" (Draft 7 if
+        it declares none), shared by all schemas with the same content.
+    """
+    key = _schema_key(schema)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        from jsonschema import Draft7Validator
+        from jsonschema.validators import validator_for
+        
+        validator = validator_for(schema, default=Draft7Validator)(schema)
+        _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+# Compiled validation predicates, keyed like _VALIDATOR_CACHE
+_COMPILED_CACHE: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+
+# The fastjsonschema functions behind those predicates, which raise with the reason
+# metadata is invalid
+_FASTJSONSCHEMA_CACHE: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile a schema into a fast validation predicate.
+    
+    Uses fastjsonschema to generate specialized validation code when it is
+    installed, and falls back to the cached jsonschema validator otherwise.
+    
+    Args:
+        schema: The JSON schema dictionary.
+    
+    Returns:
+        A function that returns True if the metadata is valid, False otherwise.
+    """
+    key = _schema_key(schema)
+    predicate = _COMPILED_CACHE.get(key)
+    if predicate is not None:
+        return predicate
+    
+    if fastjsonschema is not None:
+        # jsonschema (used without a format checker here and in get_validation_errors)
+        # treats "format" as an annotation, so fastjsonschema must not enforce it either
+        compiled = fastjsonschema.compile(schema, use_formats=False)
+        _FASTJSONSCHEMA_CACHE[key] = compiled
+        
+        def predicate(metadata: Dict[str, Any]) -> bool:
+            try:
+                compiled(metadata)
+                return True
+            except fastjsonschema.JsonSchemaException:
+                return False
+    else:
+        predicate = get_validator(schema).is_valid
+    
+    _COMPILED_CACHE[key] = predicate
+    return predicate
+
+
+def _compiled_error_message(schema: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+    """
+    Describe why the compiled predicate rejected metadata that jsonschema reports no errors for.
+    
+    Args:
+        schema: The JSON schema dictionary.
+        metadata: The rejected metadata.
+    
+    Returns:
+        fastjsonschema's error message, or a generic one if there is none.
+    """
+    compiled = _FASTJSONSCHEMA_CACHE.get(_schema_key(schema))
+    if compiled is not None:
+        try:
+            compiled(metadata)
+        except fastjsonschema.JsonSchemaException as e:
+            return str(e)
+    return "Metadata does not match the schema"
+
+
+# Keyword arguments for @dataclass that drop the per-instance __dict__ where
+# dataclasses support it (Python 3.10+), for classes created in large numbers:
+# metadata blocks, parsed files, graph nodes and edges
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ADPMetadata:
     """Class representing ADP metadata extracted from a file."""
     metadata: dict
@@ -35,21 +146,29 @@ class ADPSchema:
     
     def __post_init__(self):
         """Initialize validators after instance creation."""
-        self.validators["jsonschema"] = jsonschema.Draft7Validator(self.schema)
+        # The jsonschema validator is only needed to report errors, so it is added
+        # by get_validation_errors on first use
+        self.validators["compiled"] = compile_validator(self.schema)
     
     def validate(self, metadata: Dict[str, Any]) -> bool:
         """Validate metadata against this schema."""
-        try:
-            self.validators["jsonschema"].validate(metadata)
-            return True
-        except jsonschema.exceptions.ValidationError:
-            return False
+        return self.validators["compiled"](metadata)
     
     def get_validation_errors(self, metadata: Dict[str, Any]) -> List[str]:
         """Get detailed validation errors for metadata."""
+        # Most metadata is valid; only collect errors once the fast check has failed
+        if self.validators["compiled"](metadata):
+            return []
+        validator = self.validators.get("jsonschema")
+        if validator is None:
+            validator = self.validators["jsonschema"] = get_validator(self.schema)
         errors = []
-        for error in self.validators["jsonschema"].iter_errors(metadata):
+        for error in validator.iter_errors(metadata):
             errors.append(f"{error.message} at {'/'.join(str(p) for p in error.path)}")
+        if not errors:
+            # The compiled check failed but jsonschema disagrees; never report invalid
+            # metadata without a reason
+            errors.append(_compiled_error_message(self.schema, metadata))
         return errors
     
     @classmethod
@@ -67,6 +186,8 @@ class ADPSchema:
         """Create a schema from a file (YAML or JSON)."""
         with open(file_path, 'r', encoding='utf-8') as f:
             if file_path.endswith('.yaml') or file_path.endswith('.yml'):
+                import yaml
+                
                 data = yaml.safe_load(f)
             else:
                 data = json.load(f)
@@ -86,6 +207,8 @@ class ADPSchema:
         data = self.to_dict()
         with open(file_path, 'w', encoding='utf-8') as f:
             if file_path.endswith('.yaml') or file_path.endswith('.yml'):
+                import yaml
+                
                 yaml.dump(data, f, default_flow_style=False)
             else:
                 json.dump(data, f, indent=2)
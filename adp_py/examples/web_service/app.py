@@ -34,15 +34,18 @@
 }
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, g
 import os
 import jwt
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
 import logging
 from typing import Dict, Any, List, Optional, Union
 
 from adp_py.examples.web_service.database import UserDatabase, User
 from adp_py.examples.web_service.auth_client import AuthClient
+from adp_py.utils.json_utils import dumps_bytes
 
 # Configure logging
 logging.basicConfig(
@@ -62,6 +65,43 @@ AUTH_SERVICE_URL = os.environ.get('AUTH_SERVICE_URL', 'http://localhost:5001')
 user_db = UserDatabase(DB_CONNECTION)
 auth_client = AuthClient(AUTH_SERVICE_URL)
 
+# Tokens are valid for a day, so one minted seconds ago can be handed out again
+# instead of signing a new one on every login
+_TOKEN_LIFETIME_SECONDS = 24 * 60 * 60
+_TOKEN_REUSE_SECONDS = 10.0
+# Recently minted tokens by (user id, username, email): (token, time.monotonic() minted)
+_recent_tokens: Dict[tuple, tuple] = {}
+_recent_tokens_lock = threading.Lock()
+
+# How long (in seconds) a page of GET /users may be served again without querying,
+# and how many pages are kept at most (the key comes from the query string). Each
+# worker process has its own cache, and create_user() only clears the one in the
+# process that handled it, so the TTL bounds how stale other workers' pages get.
+_USERS_PAGE_TTL = 5.0
+_USERS_PAGE_CACHE_SIZE = 256
+# Recent GET /users responses by (page, after, limit): (JSON body, time.monotonic() deadline)
+_users_pages: Dict[tuple, tuple] = {}
+_users_pages_lock = threading.Lock()
+
+
+def json_response(obj: Any) -> Response:
+    """Build a JSON response, serialized with orjson when it is installed."""
+    return app.response_class(dumps_bytes(obj), mimetype='application/json')
+
+
+@app.before_request
+def open_db_session():
+    """Open one database session per request, shared by all of its queries."""
+    g.db_session = user_db.Session()
+
+
+@app.teardown_request
+def close_db_session(exception: Optional[BaseException] = None):
+    """Close the request's database session, rolling back anything uncommitted."""
+    session = g.pop('db_session', None)
+    if session is not None:
+        session.close()
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -78,7 +118,7 @@ def health_check():
         ]
     }
     """
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'version': '1.0.0'
@@ -103,6 +143,10 @@ def get_users():
             {
                 "consideration": "Database query optimization",
                 "description": "Uses pagination and limited fields to optimize query performance"
+            },
+            {
+                "consideration": "Per-process response cache",
+                "description": "Pages are cached for a few seconds in each worker process; a new user is listed at once by the worker that created it, and by the others once their cached pages expire"
             }
         ]
     }
@@ -110,18 +154,33 @@ def get_users():
     try:
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 10))
+        # Keyset pagination: ?after=<next_cursor of the previous page> instead of ?page=
+        after = request.args.get('after')
+        after_id = int(after) if after is not None else None
         
-        users = user_db.get_users(page=page, limit=limit)
+        now = time.monotonic()
+        with _users_pages_lock:
+            cached = _users_pages.get((page, after_id, limit))
+        if cached is not None and now < cached[1]:
+            return app.response_class(cached[0], mimetype='application/json')
         
-        return jsonify({
+        users = user_db.get_users(page=page, limit=limit, session=g.db_session, after_id=after_id)
+        
+        body = dumps_bytes({
             'users': [user.to_dict(exclude_sensitive=True) for user in users],
             'page': page,
             'limit': limit,
-            'total': user_db.count_users()
+            'total': user_db.count_users(session=g.db_session),
+            'next_cursor': users[-1].id if users else None
         })
+        with _users_pages_lock:
+            if len(_users_pages) >= _USERS_PAGE_CACHE_SIZE:
+                _users_pages.clear()
+            _users_pages[(page, after_id, limit)] = (body, now + _USERS_PAGE_TTL)
+        return app.response_class(body, mimetype='application/json')
     except Exception as e:
         logger.error(f"Error retrieving users: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve users'}), 500
+        return json_response({'error': 'Failed to retrieve users'}), 500
 
 
 @app.route('/users/<int:user_id>', methods=['GET'])
@@ -140,15 +199,15 @@ def get_user(user_id: int):
     }
     """
     try:
-        user = user_db.get_user_by_id(user_id)
+        user = user_db.get_user_by_id(user_id, session=g.db_session)
         
         if not user:
-            return jsonify({'error': 'User not found'}), 404
+            return json_response({'error': 'User not found'}), 404
         
-        return jsonify({'user': user.to_dict()})
+        return json_response({'user': user.to_dict()})
     except Exception as e:
         logger.error(f"Error retrieving user {user_id}: {str(e)}")
-        return jsonify({'error': 'Failed to retrieve user'}), 500
+        return json_response({'error': 'Failed to retrieve user'}), 500
 
 
 @app.route('/users', methods=['POST'])
@@ -181,14 +240,15 @@ def create_user():
         required_fields = ['username', 'email', 'password']
         for field in required_fields:
             if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+                return json_response({'error': f'Missing required field: {field}'}), 400
         
         # Check if user already exists
-        if user_db.get_user_by_email(data['email']):
-            return jsonify({'error': 'User with this email already exists'}), 409
+        conflicts = user_db.find_conflicts(data['email'], data['username'], session=g.db_session)
+        if 'email' in conflicts:
+            return json_response({'error': 'User with this email already exists'}), 409
         
-        if user_db.get_user_by_username(data['username']):
-            return jsonify({'error': 'Username already taken'}), 409
+        if 'username' in conflicts:
+            return json_response({'error': 'Username already taken'}), 409
         
         # Create the user
         new_user = User(
@@ -198,16 +258,19 @@ def create_user():
             created_at=datetime.now()
         )
         
-        user_id = user_db.create_user(new_user)
+        user_id = user_db.create_user(new_user, session=g.db_session)
+        # Cached pages of GET /users no longer show every user
+        with _users_pages_lock:
+            _users_pages.clear()
         
-        return jsonify({
+        return json_response({
             'message': 'User created successfully',
             'user_id': user_id
         }), 201
     
     except Exception as e:
         logger.error(f"Error creating user: {str(e)}")
-        return jsonify({'error': 'Failed to create user'}), 500
+        return json_response({'error': 'Failed to create user'}), 500
 
 
 @app.route('/login', methods=['POST'])
@@ -231,21 +294,21 @@ def login():
         
         # Validate required fields
         if 'email' not in data or 'password' not in data:
-            return jsonify({'error': 'Email and password are required'}), 400
+            return json_response({'error': 'Email and password are required'}), 400
         
         # Get the user
-        user = user_db.get_user_by_email(data['email'])
+        user = user_db.get_user_by_email(data['email'], session=g.db_session)
         if not user:
-            return jsonify({'error': 'Invalid credentials'}), 401
+            return json_response({'error': 'Invalid credentials'}), 401
         
         # Verify password
         if not auth_client.verify_password(data['password'], user.password):
-            return jsonify({'error': 'Invalid credentials'}), 401
+            return json_response({'error': 'Invalid credentials'}), 401
         
         # Generate token
         token = generate_token(user)
         
-        return jsonify({
+        return json_response({
             'token': token,
             'user_id': user.id,
             'username': user.username
@@ -253,7 +316,7 @@ def login():
     
     except Exception as e:
         logger.error(f"Error during login: {str(e)}")
-        return jsonify({'error': 'Login failed'}), 500
+        return json_response({'error': 'Login failed'}), 500
 
 
 def generate_token(user: User) -> str:
@@ -270,15 +333,33 @@ def generate_token(user: User) -> str:
         ]
     }
     """
+    key = (user.id, user.username, user.email)
+    now = time.monotonic()
+    with _recent_tokens_lock:
+        recent = _recent_tokens.get(key)
+    if recent is not None and now - recent[1] < _TOKEN_REUSE_SECONDS:
+        return recent[0]
+    
     payload = {
         'user_id': user.id,
         'username': user.username,
         'email': user.email,
-        'exp': datetime.utcnow() + timedelta(days=1)
+        # A NumericDate, which is what PyJWT converts a datetime to anyway
+        'exp': int(time.time()) + _TOKEN_LIFETIME_SECONDS
     }
     
-    return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+    # jwt.encode already signs through one module-level PyJWT instance with its
+    # algorithm objects built once, and repeat logins reuse the token above, so signing
+    # is left to PyJWT rather than hand-assembling header, payload and HMAC
+    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+    with _recent_tokens_lock:
+        # Drop expired entries so the map only holds the last few seconds of logins
+        for stale_key in [k for k, (_, minted) in _recent_tokens.items() if now - minted >= _TOKEN_REUSE_SECONDS]:
+            del _recent_tokens[stale_key]
+        _recent_tokens[key] = (token, now)
+    return token
 
 
 if __name__ == '__main__':
+    # Development server only; see wsgi.py for serving under gunicorn
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
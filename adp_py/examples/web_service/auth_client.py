@@ -28,11 +28,51 @@ import hmac
 import base64
 import requests
 import logging
+import sys
+import threading
+import time
 from typing import Dict, Any, Optional, Tuple, Union, List
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# PBKDF2 iterations for new password hashes, overridable with the PBKDF2_ITERS
+# environment variable. Hashes stored without a prefix used this default.
+_DEFAULT_PBKDF2_ITERATIONS = 100000
+# Prefix of stored hashes that record their iteration count: "$pbkdf2-sha256$<n>$<b64>"
+_PBKDF2_PREFIX = "$pbkdf2-sha256$"
+
+# How long (in seconds) a successful password verification is remembered, and how
+# many are remembered at most
+_VERIFY_CACHE_TTL = 30.0
+_VERIFY_CACHE_SIZE = 4096
+
+
+def _pbkdf2_sha256(password: bytes, salt: bytes, iterations: int) -> bytes:
+    """
+    Derive a PBKDF2-HMAC-SHA256 key without blocking other requests.
+    
+    hashlib releases the GIL for the whole derivation, so threaded servers already
+    hash on all cores at once. Under gevent (see wsgi.py) it would instead stall every
+    greenlet in the worker, so there it runs in gevent's pool of native threads.
+    
+    Args:
+        password: The password bytes
+        salt: The salt
+        iterations: Number of PBKDF2 iterations
+    
+    Returns:
+        The derived key
+    """
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        import gevent
+        
+        return gevent.get_hub().threadpool.apply(
+            hashlib.pbkdf2_hmac, ('sha256', password, salt, iterations)
+        )
+    return hashlib.pbkdf2_hmac('sha256', password, salt, iterations)
+
 
 class AuthClient:
     """
@@ -50,14 +90,27 @@ class AuthClient:
     }
     """
     
-    def __init__(self, auth_service_url: str):
+    def __init__(self, auth_service_url: str, pbkdf2_iterations: Optional[int] = None):
         """
         Initialize the authentication client.
         
         Args:
             auth_service_url: URL of the authentication service
+            pbkdf2_iterations: PBKDF2 iterations for new password hashes. If None, uses
+                the PBKDF2_ITERS environment variable or 100000. Existing hashes keep
+                verifying with the count they were created with.
         """
         self.auth_service_url = auth_service_url
+        self.pbkdf2_iterations = pbkdf2_iterations or int(
+            os.environ.get('PBKDF2_ITERS', _DEFAULT_PBKDF2_ITERATIONS)
+        )
+        # Recently verified (password, stored hash) pairs, so that repeated logins do not
+        # each pay for the PBKDF2 iterations. Keys are HMACs under a per-process random
+        # key, so the cache holds nothing that could be brute-forced offline, and only
+        # successful verifications are cached, so guessing passwords stays expensive.
+        self._verify_cache_key = os.urandom(32)
+        self._verified: Dict[bytes, float] = {}
+        self._verified_lock = threading.Lock()
         logger.info(f"Auth client initialized with service URL: {auth_service_url}")
     
     def hash_password(self, password: str) -> str:
@@ -78,17 +131,13 @@ class AuthClient:
         # In a real application, this would use a proper password hashing library like bcrypt
         # This is a simplified implementation for demonstration purposes
         salt = os.urandom(16)
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt,
-            100000  # Number of iterations
-        )
+        password_hash = _pbkdf2_sha256(password.encode('utf-8'), salt, self.pbkdf2_iterations)
         
-        # Combine salt and hash for storage
+        # Combine salt and hash for storage, recording the iteration count so it can
+        # be tuned without invalidating existing hashes
         encoded = base64.b64encode(salt + password_hash).decode('utf-8')
         
-        return encoded
+        return f"{_PBKDF2_PREFIX}{self.pbkdf2_iterations}${encoded}"
     
     def verify_password(self, password: str, stored_password: str) -> bool:
         """
@@ -106,28 +155,58 @@ class AuthClient:
         }
         """
         try:
-            # Decode the stored password to get salt and hash
-            decoded = base64.b64decode(stored_password.encode('utf-8'))
+            # Decode the stored password to get the iteration count, salt and hash
+            iterations = _DEFAULT_PBKDF2_ITERATIONS
+            encoded = stored_password
+            if stored_password.startswith(_PBKDF2_PREFIX):
+                iterations_text, encoded = stored_password[len(_PBKDF2_PREFIX):].split('$', 1)
+                iterations = int(iterations_text)
+            decoded = base64.b64decode(encoded.encode('utf-8'))
             
             # Extract salt (first 16 bytes) and hash
             salt = decoded[:16]
             stored_hash = decoded[16:]
             
+            password_bytes = password.encode('utf-8')
+            cache_key = hmac.new(
+                self._verify_cache_key, stored_password.encode('utf-8') + password_bytes, hashlib.sha256
+            ).digest()
+            now = time.monotonic()
+            with self._verified_lock:
+                expires_at = self._verified.get(cache_key)
+            if expires_at is not None and now < expires_at:
+                return True
+            
             # Hash the provided password with the same salt
-            password_hash = hashlib.pbkdf2_hmac(
-                'sha256',
-                password.encode('utf-8'),
-                salt,
-                100000  # Same number of iterations as in hash_password
-            )
+            password_hash = _pbkdf2_sha256(password_bytes, salt, iterations)
             
             # Compare hashes in constant time to prevent timing attacks
-            return hmac.compare_digest(password_hash, stored_hash)
+            if not hmac.compare_digest(password_hash, stored_hash):
+                return False
+            
+            self._remember_verified(cache_key, now + _VERIFY_CACHE_TTL)
+            return True
         
         except Exception as e:
             logger.error(f"Error verifying password: {str(e)}")
             return False
     
+    def _remember_verified(self, cache_key: bytes, expires_at: float) -> None:
+        """
+        Record a successful password verification until it expires.
+        
+        Args:
+            cache_key: HMAC identifying the password and stored hash
+            expires_at: time.monotonic() value after which the entry is ignored
+        """
+        with self._verified_lock:
+            if len(self._verified) >= _VERIFY_CACHE_SIZE:
+                now = time.monotonic()
+                self._verified = {key: expiry for key, expiry in self._verified.items() if expiry > now}
+                if len(self._verified) >= _VERIFY_CACHE_SIZE:
+                    self._verified.clear()
+            self._verified[cache_key] = expires_at
+    
     def check_token(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         @ai-metadata {
@@ -157,7 +236,10 @@ class AuthClient:
             logger.info(f"Checking token validity (simplified implementation)")
             
             # For demo, assume token is valid if it's not empty
-            # In a real app, we would verify the token signature and expiration
+            # In a real app, we would verify the token signature and expiration. With
+            # several workers or hosts, verified payloads would then be worth sharing in a
+            # store such as Redis, keyed by a hash of the token and expiring with it.
+            # Until then there is no verification cost to cache.
             is_valid = bool(token)
             
             # Simulate user data that would be extracted from the token
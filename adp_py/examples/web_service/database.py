@@ -26,17 +26,62 @@
 """
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timezone
+import os
+import time
+from typing import List, Optional, Dict, Any, Set, Union
 import sqlite3
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Text, or_
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# How long (in seconds) count_users() may return a previously counted total
+_COUNT_CACHE_TTL = 5.0
+
+# Columns update_user() may change; the ID and timestamps are managed here
+_UPDATABLE_COLUMNS = frozenset({'username', 'email', 'password', 'full_name', 'bio', 'profile_image'})
+
+# Connection pool settings, sized for a threaded server: (cores * 2) + 1 connections
+# plus a few extra under load, checked before use and replaced every half hour
+_POOL_OPTIONS = {
+    "poolclass": QueuePool,
+    "pool_size": (os.cpu_count() or 4) * 2 + 1,
+    "max_overflow": 4,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+# Set on every new SQLite connection: WAL lets reads proceed during writes, and with
+# it synchronous=NORMAL is still safe against corruption while syncing far less
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply _SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _utcnow() -> datetime:
+    """Get the current UTC time as a naive datetime, as datetime.utcnow() (deprecated) did."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 # Create the database model
 Base = declarative_base()
 
@@ -58,16 +103,35 @@ class UserModel(Base):
     __tablename__ = 'users'
     
     id = Column(Integer, primary_key=True)
+    # The unique constraints are backed by an index on every backend (SQLite builds a
+    # sqlite_autoindex B-tree for each), so lookups by username or email, including
+    # find_conflicts' "email = ? OR username = ?", need no separate index
     username = Column(String(50), unique=True, nullable=False)
     email = Column(String(100), unique=True, nullable=False)
     password = Column(String(100), nullable=False)
     full_name = Column(String(100), nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+    updated_at = Column(DateTime, nullable=True, onupdate=_utcnow)
     bio = Column(Text, nullable=True)
     profile_image = Column(String(200), nullable=True)
 
 
+# Columns read into a User. Read paths select these instead of whole UserModel
+# objects, so rows become Users directly, without ORM instances or identity map
+# bookkeeping in between.
+_USER_COLUMNS = (
+    UserModel.id,
+    UserModel.username,
+    UserModel.email,
+    UserModel.password,
+    UserModel.full_name,
+    UserModel.created_at,
+    UserModel.updated_at,
+    UserModel.bio,
+    UserModel.profile_image,
+)
+
+
 @dataclass
 class User:
     """
@@ -103,6 +167,7 @@ class User:
         Returns:
             Dictionary representation of the user
         """
+        # Never include password
         result = {
             'id': self.id,
             'username': self.username,
@@ -112,13 +177,10 @@ class User:
         }
         
         if not exclude_sensitive:
-            result.update({
-                'full_name': self.full_name,
-                'bio': self.bio,
-                'profile_image': self.profile_image
-            })
-        
-        # Never include password
+            # Set directly rather than through update() with a temporary dict
+            result['full_name'] = self.full_name
+            result['bio'] = self.bio
+            result['profile_image'] = self.profile_image
         
         return result
 
@@ -146,149 +208,253 @@ class UserDatabase:
         Args:
             connection_string: Database connection string
         """
-        self.engine = create_engine(connection_string)
-        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        url = make_url(connection_string)
+        is_sqlite = url.get_backend_name() == 'sqlite'
+        engine_options = {}
+        if not is_sqlite or url.database not in (None, '', ':memory:'):
+            # An in-memory SQLite database lives in a single connection, so it keeps the
+            # default pool; pooled SQLite connections are handed between threads
+            engine_options.update(_POOL_OPTIONS)
+            if is_sqlite:
+                engine_options["connect_args"] = {"check_same_thread": False}
+        # Compiled SQL is cached per engine by SQLAlchemy itself (query_cache_size, 500
+        # statements by default), which covers the dozen or so queries issued here, so
+        # the queries below are not rewritten as lambda statements
+        self.engine = create_engine(connection_string, **engine_options)
+        if is_sqlite:
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        # A plain session factory: every call returns a new session that its user closes.
+        # Objects are not expired on commit, so reading the new ID back in create_user
+        # does not issue another SELECT.
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        # (count, time.monotonic() deadline) of the last COUNT(*), which scans the table
+        self._count_cache = (0, 0.0)
         
         # Create tables if they don't exist
         Base.metadata.create_all(self.engine)
         
         logger.info("Database initialized")
     
-    def get_users(self, page: int = 1, limit: int = 10) -> List[User]:
+    def get_users(self, page: int = 1, limit: int = 10, session: Optional[Session] = None,
+                  after_id: Optional[int] = None) -> List[User]:
         """
         Get a paginated list of users.
         
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored if after_id is given
             limit: Number of users per page
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
+            after_id: Return the users following the user with this ID (the last ID of
+                the previous page). Unlike page, this seeks on the primary key instead of
+                scanning and skipping all earlier rows.
         
         Returns:
             List of User objects
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            offset = (page - 1) * limit
-            user_models = session.query(UserModel).order_by(UserModel.id).offset(offset).limit(limit).all()
+            query = session.query(*_USER_COLUMNS).order_by(UserModel.id)
+            if after_id is not None:
+                query = query.filter(UserModel.id > after_id)
+            else:
+                query = query.offset((page - 1) * limit)
+            rows = query.limit(limit).all()
             
-            return [self._model_to_user(model) for model in user_models]
+            return [self._row_to_user(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting users: {str(e)}")
             return []
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def count_users(self) -> int:
+    def count_users(self, session: Optional[Session] = None) -> int:
         """
         Count the total number of users.
         
+        The total is cached for a few seconds, and until a user is created or deleted.
+        The cache belongs to this process, so other worker processes keep returning
+        their own total until it expires.
+        
+        Args:
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
+        
         Returns:
             Total number of users
         """
-        session = self.Session()
+        count, expires_at = self._count_cache
+        if time.monotonic() < expires_at:
+            return count
+        
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            return session.query(UserModel).count()
+            count = session.query(UserModel).count()
+            self._count_cache = (count, time.monotonic() + _COUNT_CACHE_TTL)
+            return count
         except Exception as e:
             logger.error(f"Error counting users: {str(e)}")
             return 0
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
+    def get_user_by_id(self, user_id: int, session: Optional[Session] = None) -> Optional[User]:
         """
         Get a user by ID.
         
         Args:
             user_id: The user ID to find
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             User object if found, None otherwise
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            user_model = session.query(UserModel).filter(UserModel.id == user_id).first()
+            row = session.query(*_USER_COLUMNS).filter(UserModel.id == user_id).first()
             
-            if not user_model:
+            if not row:
                 return None
             
-            return self._model_to_user(user_model)
+            return self._row_to_user(row)
         except Exception as e:
             logger.error(f"Error getting user by ID {user_id}: {str(e)}")
             return None
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    def get_user_by_email(self, email: str, session: Optional[Session] = None) -> Optional[User]:
         """
         Get a user by email.
         
         Args:
             email: The email to find
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             User object if found, None otherwise
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            user_model = session.query(UserModel).filter(UserModel.email == email).first()
+            row = session.query(*_USER_COLUMNS).filter(UserModel.email == email).first()
             
-            if not user_model:
+            if not row:
                 return None
             
-            return self._model_to_user(user_model)
+            return self._row_to_user(row)
         except Exception as e:
             logger.error(f"Error getting user by email {email}: {str(e)}")
             return None
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def get_user_by_username(self, username: str) -> Optional[User]:
+    def get_user_by_username(self, username: str, session: Optional[Session] = None) -> Optional[User]:
         """
         Get a user by username.
         
         Args:
             username: The username to find
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             User object if found, None otherwise
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            user_model = session.query(UserModel).filter(UserModel.username == username).first()
+            row = session.query(*_USER_COLUMNS).filter(UserModel.username == username).first()
             
-            if not user_model:
+            if not row:
                 return None
             
-            return self._model_to_user(user_model)
+            return self._row_to_user(row)
         except Exception as e:
             logger.error(f"Error getting user by username {username}: {str(e)}")
             return None
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def create_user(self, user: User) -> int:
+    def find_conflicts(self, email: str, username: str, session: Optional[Session] = None) -> Set[str]:
+        """
+        Find which of a new user's unique fields are already taken, in one query.
+        
+        Args:
+            email: The email to check
+            username: The username to check
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
+        
+        Returns:
+            The taken fields, a subset of {'email', 'username'}
+        """
+        own_session = session is None
+        if own_session:
+            session = self.Session()
+        try:
+            rows = session.query(UserModel.email, UserModel.username).filter(
+                or_(UserModel.email == email, UserModel.username == username)
+            ).all()
+            
+            conflicts = set()
+            for row_email, row_username in rows:
+                if row_email == email:
+                    conflicts.add('email')
+                if row_username == username:
+                    conflicts.add('username')
+            return conflicts
+        except Exception as e:
+            logger.error(f"Error checking for existing user {username}: {str(e)}")
+            return set()
+        finally:
+            if own_session:
+                session.close()
+    
+    def create_user(self, user: User, session: Optional[Session] = None) -> int:
         """
         Create a new user.
         
         Args:
             user: The user to create
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             The ID of the created user
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
             user_model = UserModel(
                 username=user.username,
                 email=user.email,
                 password=user.password,
                 full_name=user.full_name,
-                created_at=user.created_at or datetime.utcnow(),
+                created_at=user.created_at or _utcnow(),
                 bio=user.bio,
                 profile_image=user.profile_image
             )
             
             session.add(user_model)
             session.commit()
+            self._count_cache = (0, 0.0)
             
             return user_model.id
         except Exception as e:
@@ -296,88 +462,87 @@ class UserDatabase:
             logger.error(f"Error creating user: {str(e)}")
             raise
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def update_user(self, user_id: int, user_data: Dict[str, Any]) -> bool:
+    def update_user(self, user_id: int, user_data: Dict[str, Any], session: Optional[Session] = None) -> bool:
         """
         Update a user.
         
         Args:
             user_id: The ID of the user to update
-            user_data: Dictionary of fields to update
+            user_data: Dictionary of fields to update. Keys other than the columns in
+                _UPDATABLE_COLUMNS are ignored.
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             True if successful, False otherwise
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            user_model = session.query(UserModel).filter(UserModel.id == user_id).first()
-            
-            if not user_model:
-                return False
+            values = {key: value for key, value in user_data.items() if key in _UPDATABLE_COLUMNS}
+            values['updated_at'] = _utcnow()
             
-            # Update fields
-            for key, value in user_data.items():
-                if hasattr(user_model, key) and key != 'id':
-                    setattr(user_model, key, value)
-            
-            user_model.updated_at = datetime.utcnow()
+            # A single UPDATE; the matched row count tells whether the user exists
+            updated = session.query(UserModel).filter(UserModel.id == user_id).update(
+                values, synchronize_session=False
+            )
             
             session.commit()
-            return True
+            return updated > 0
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating user {user_id}: {str(e)}")
             return False
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def delete_user(self, user_id: int) -> bool:
+    def delete_user(self, user_id: int, session: Optional[Session] = None) -> bool:
         """
         Delete a user.
         
         Args:
             user_id: The ID of the user to delete
+            session: Session to use, such as one shared by a request. If None, a new
+                session is opened and closed.
         
         Returns:
             True if successful, False otherwise
         """
-        session = self.Session()
+        own_session = session is None
+        if own_session:
+            session = self.Session()
         try:
-            user_model = session.query(UserModel).filter(UserModel.id == user_id).first()
-            
-            if not user_model:
-                return False
+            # A single DELETE; the matched row count tells whether the user existed
+            deleted = session.query(UserModel).filter(UserModel.id == user_id).delete(
+                synchronize_session=False
+            )
             
-            session.delete(user_model)
             session.commit()
+            if deleted:
+                self._count_cache = (0, 0.0)
             
-            return True
+            return deleted > 0
         except Exception as e:
             session.rollback()
             logger.error(f"Error deleting user {user_id}: {str(e)}")
             return False
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
-    def _model_to_user(self, model: UserModel) -> User:
+    def _row_to_user(self, row) -> User:
         """
-        Convert a SQLAlchemy model to a User object.
+        Convert a row of _USER_COLUMNS to a User object.
         
         Args:
-            model: The SQLAlchemy model
+            row: The result row, whose keys are the User field names
         
         Returns:
             User object
         """
-        return User(
-            id=model.id,
-            username=model.username,
-            email=model.email,
-            password=model.password,
-            full_name=model.full_name,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-            bio=model.bio,
-            profile_image=model.profile_image
-        ) 
\ No newline at end of file
+        return User(**row._asdict()) 
\ No newline at end of file
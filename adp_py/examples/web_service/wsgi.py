@@ -0,0 +1,25 @@
+"""
+@ai-metadata {
+    "domain": "example-web-service",
+    "name": "wsgi",
+    "description": "WSGI entry point for serving the user service with gunicorn and gevent workers",
+    "dependencies": ["app.py"]
+}
+"""
+
+# Serve with one gevent worker per core, each multiplexing many connections:
+#
+#     gunicorn -k gevent -w "$(nproc)" --worker-connections 1000 \
+#         adp_py.examples.web_service.wsgi:app
+#
+# The gevent worker monkey-patches the standard library before it imports this module,
+# so database sockets and the thread locks used by the service's caches cooperate with
+# gevent without any patching here.
+#
+# Those caches (the GET /users pages and the user count) live in each worker process.
+# Creating a user clears them only in the worker that handled the request; the other
+# workers serve their cached pages and counts until they expire, a few seconds later.
+
+from adp_py.examples.web_service.app import app
+
+__all__ = ["app"]
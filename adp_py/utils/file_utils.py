@@ -8,34 +8,248 @@
 
 import os
 import glob
-from typing import List, Set, Optional, Iterator, Pattern
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, List, Set, Optional, Iterator, Pattern, Tuple
 import re
 
+# Characters that make a glob pattern match more than its literal text
+_GLOB_MAGIC_RE = re.compile(r'[*?[]')
 
-def get_files_by_extension(directory: str, extensions: List[str], recursive: bool = True) -> List[str]:
+# Backreferences (\1, (?P=name)), which refer to the wrong groups once patterns are
+# combined into one alternation
+_BACKREFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# Global inline flags such as (?i), which before Python 3.11 still compile inside an
+# alternation and then apply to every pattern combined with them
+_GLOBAL_FLAGS_RE = re.compile(r'\(\?[aiLmsux]+\)')
+
+# Frequently used path filters, compiled once at import; see filter_files_by_named()
+COMMON_PATTERNS = {
+    "python": re.compile(r'\.py$'),
+    "javascript": re.compile(r'\.jsx?$'),
+    "typescript": re.compile(r'\.tsx?$'),
+    "test": re.compile(r'(?:^|[/\\])tests?[/\\]'),
+    "init": re.compile(r'(?:^|[/\\])__init__\.py$'),
+}
+
+# Bytes of a file's start that is_binary_file() inspects
+_BINARY_CHECK_SIZE = 8192
+
+# Byte order marks of UTF-8, UTF-16 and UTF-32 text (UTF-16 text is full of NUL bytes)
+_TEXT_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff', b'\x00\x00\xfe\xff')
+
+# Extensions whose files is_binary_file() classifies without reading them: image,
+# archive, compiled and document formats that are always binary, and source and
+# markup formats that are always text
+_KNOWN_BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.gz', '.tar', '.so', '.dll', '.exe',
+    '.pyc', '.o', '.a', '.class', '.jar', '.wasm',
+})
+_KNOWN_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.md', '.txt', '.json', '.yml', '.yaml', '.toml', '.html', '.css', '.rst',
+})
+
+# Whether file names compare case-sensitively here, as fnmatch does (not on Windows)
+_CASE_SENSITIVE = os.path.normcase('A') == 'A'
+
+# Directories that hold version control data, dependencies or caches rather than a
+# project's own files; see default_skip_dir()
+DEFAULT_SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__", "venv", ".venv", ".tox"})
+
+# How long (in seconds) a cached listing may be reused, and how many are kept at most.
+# Listings are also dropped as soon as a directory they walked changes its mtime; the
+# TTL covers changes within a file system's timestamp granularity.
+_LISTING_CACHE_TTL = 5.0
+_LISTING_CACHE_SIZE = 128
+# Listings by call arguments: (time.monotonic() deadline, directory mtimes, sorted paths)
+_listing_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_listing_cache_lock = threading.Lock()
+
+
+def default_skip_dir(entry: os.DirEntry) -> bool:
+    """
+    Skip directory callback that prunes the directories in DEFAULT_SKIP_DIRS.
+    
+    Args:
+        entry: Directory found during a walk
+    
+    Returns:
+        True if the directory should not be walked
+    """
+    return entry.name in DEFAULT_SKIP_DIRS
+
+
+def clear_file_listing_cache() -> None:
+    """Forget all cached results of get_files_by_extension() and get_directories()."""
+    with _listing_cache_lock:
+        _listing_cache.clear()
+
+
+def _cached_listing(key: tuple, build: Callable[[List[Tuple[str, int]]], List[str]]) -> List[str]:
+    """
+    Return a cached directory listing, or build and cache it.
+    
+    Unlike functools.lru_cache, entries are checked against the directories they
+    were built from, so a listing is never reused after files were added or removed.
+    
+    Args:
+        key: Arguments of the listing call
+        build: Builds the sorted listing, appending (directory, st_mtime_ns) to the
+            list it is given for every directory it reads
+    
+    Returns:
+        A fresh copy of the listing
+    """
+    now = time.monotonic()
+    with _listing_cache_lock:
+        cached = _listing_cache.get(key)
+    if cached is not None and now < cached[0] and _stamps_match(cached[1]):
+        with _listing_cache_lock:
+            if key in _listing_cache:
+                _listing_cache.move_to_end(key)
+        return list(cached[2])
+    
+    stamps: List[Tuple[str, int]] = []
+    result = build(stamps)
+    with _listing_cache_lock:
+        _listing_cache[key] = (now + _LISTING_CACHE_TTL, stamps, result)
+        _listing_cache.move_to_end(key)
+        while len(_listing_cache) > _LISTING_CACHE_SIZE:
+            _listing_cache.popitem(last=False)
+    return list(result)
+
+
+def _stamps_match(stamps: List[Tuple[str, int]]) -> bool:
+    """Check that none of the directories a listing read has changed since."""
+    try:
+        return all(os.stat(directory or os.curdir).st_mtime_ns == mtime for directory, mtime in stamps)
+    except OSError:
+        return False
+
+
+def _iter_entries(directory: str, recursive: bool,
+                  skip_dir: Optional[Callable[[os.DirEntry], bool]] = None,
+                  stamps: Optional[List[Tuple[str, int]]] = None) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Walk a directory the way glob's "**" does, listing each directory once.
+    
+    Names starting with a dot are skipped, and symbolic links to directories are
+    followed. Directories that cannot be listed are skipped.
+    
+    Args:
+        directory: Directory to walk. Paths are built on it as given, so '' yields
+            paths relative to the current directory, as glob does.
+        recursive: Whether to descend into subdirectories
+        skip_dir: Called with each directory found; if it returns True, the directory
+            is neither yielded nor descended into
+        stamps: If given, (directory, st_mtime_ns) is appended for every directory listed
+    
+    Yields:
+        (path, entry) pairs for every file and directory found
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            if stamps is not None:
+                stamps.append((current, os.stat(current or os.curdir).st_mtime_ns))
+            with os.scandir(current or os.curdir) as it:
+                entries = [entry for entry in it if entry.name[0] != '.']
+        except OSError:
+            continue
+        for entry in entries:
+            is_dir = _is_dir(entry)
+            if is_dir and skip_dir is not None and skip_dir(entry):
+                continue
+            path = entry.path if current else entry.name
+            yield path, entry
+            if recursive and is_dir:
+                stack.append(path)
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """Check whether an entry is a directory (following symlinks), like os.path.isdir."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def get_files_by_extension(directory: str, extensions: List[str], recursive: bool = True,
+                           skip_dir: Optional[Callable[[os.DirEntry], bool]] = None) -> List[str]:
     """
     Get all files with specified extensions in a directory.
     
+    The directory is walked once for all extensions. Matching follows glob
+    semantics for a '*<extension>' pattern: hidden files are skipped and an
+    extension may itself contain glob wildcards.
+    
+    Results are cached until a directory that was walked changes (see
+    clear_file_listing_cache()).
+    
     Args:
         directory: Directory to search
         extensions: List of file extensions to include (e.g. ['.py', '.js'])
         recursive: Whether to search recursively
+        skip_dir: Called with each directory found; directories for which it returns
+            True are pruned from the walk (e.g. default_skip_dir)
     
     Returns:
-        List of file paths
+        Sorted list of file paths, each listed once
+    """
+    # All extensions come from the one walk, so a single sort orders them; there are
+    # no per-extension sorted streams to heapq.merge()
+    key = ('files', directory, os.path.abspath(directory), tuple(extensions), recursive, skip_dir)
+    return _cached_listing(
+        key, lambda stamps: sorted(_match_extensions(directory, extensions, recursive, skip_dir, stamps))
+    )
+
+
+def iter_files_by_extension(directory: str, extensions: List[str], recursive: bool = True,
+                            skip_dir: Optional[Callable[[os.DirEntry], bool]] = None) -> Iterator[str]:
     """
-    files = []
+    Iterate over the files with specified extensions in a directory as they are found.
     
-    if recursive:
-        for ext in extensions:
-            pattern = os.path.join(directory, f'**/*{ext}')
-            files.extend(glob.glob(pattern, recursive=True))
-    else:
-        for ext in extensions:
-            pattern = os.path.join(directory, f'*{ext}')
-            files.extend(glob.glob(pattern))
+    Like get_files_by_extension(), but paths come in walk order rather than
+    sorted, and no list of all matches is built first.
     
-    return sorted(files)
+    Args:
+        directory: Directory to search
+        extensions: List of file extensions to include (e.g. ['.py', '.js'])
+        recursive: Whether to search recursively
+        skip_dir: Called with each directory found; directories for which it returns
+            True are pruned from the walk (e.g. default_skip_dir)
+    
+    Yields:
+        File paths, each yielded once
+    """
+    return _match_extensions(directory, extensions, recursive, skip_dir)
+
+
+def _match_extensions(directory: str, extensions: List[str], recursive: bool,
+                      skip_dir: Optional[Callable[[os.DirEntry], bool]] = None,
+                      stamps: Optional[List[Tuple[str, int]]] = None) -> Iterator[str]:
+    """Yield the files matching any of the extensions, walking with _iter_entries()."""
+    if not _CASE_SENSITIVE:
+        extensions = [ext.lower() for ext in extensions]
+    # Literal extensions are checked with a single str.endswith() call on a tuple, the
+    # equivalent of one "*.{py,js,ts}" brace pattern (which glob does not support)
+    suffixes = tuple(ext for ext in extensions if not _GLOB_MAGIC_RE.search(ext))
+    patterns = [
+        re.compile(fnmatch.translate(f'*{ext}')) for ext in extensions if _GLOB_MAGIC_RE.search(ext)
+    ]
+    
+    for path, entry in _iter_entries(directory, recursive, skip_dir, stamps):
+        name = entry.name if _CASE_SENSITIVE else entry.name.lower()
+        # Test the suffixes first: one C-level call per entry, with no generator built
+        # for the wildcard patterns unless there are any
+        if name.endswith(suffixes) or (patterns and any(pattern.match(name) for pattern in patterns)):
+            yield path
 
 
 def find_files_by_pattern(directory: str, pattern: str, recursive: bool = True) -> List[str]:
@@ -50,10 +264,39 @@ def find_files_by_pattern(directory: str, pattern: str, recursive: bool = True)
     Returns:
         List of matching file paths
     """
+    # No need to split off the pattern's literal prefix ('a/b/c' in 'a/b/c/*.py'):
+    # glob only lists directories from the first component with a wildcard onwards
     full_pattern = os.path.join(directory, pattern)
     return sorted(glob.glob(full_pattern, recursive=recursive))
 
 
+def find_files(directory: str, pattern: str, regex: Optional[str] = None, recursive: bool = True) -> Iterator[str]:
+    """
+    Iterate over the files matching a glob pattern and, optionally, a regex.
+    
+    Equivalent to filter_files_by_regex(find_files_by_pattern(...), regex) without
+    the intermediate list: each path is tested against the regex as glob finds it.
+    Paths come in the order glob finds them rather than sorted.
+    
+    Args:
+        directory: Base directory to search
+        pattern: Glob pattern to match (e.g. '*.py')
+        regex: Regex pattern to match against the file path, or None to keep all
+        recursive: Whether to search recursively
+    
+    Yields:
+        Matching file paths
+    """
+    paths = glob.iglob(os.path.join(directory, pattern), recursive=recursive)
+    if regex is None:
+        yield from paths
+        return
+    search = _compile(regex).search
+    for path in paths:
+        if search(path):
+            yield path
+
+
 def filter_files_by_regex(files: List[str], pattern: str) -> List[str]:
     """
     Filter a list of files by a regex pattern.
@@ -65,47 +308,205 @@ def filter_files_by_regex(files: List[str], pattern: str) -> List[str]:
     Returns:
         Filtered list of file paths
     """
-    regex = re.compile(pattern)
+    regex = _compile(pattern)
     return [f for f in files if regex.search(f)]
 
 
-def get_directories(path: str, recursive: bool = False) -> List[str]:
+def filter_files_by_regexes(files: List[str], patterns: List[str]) -> List[str]:
+    """
+    Filter a list of files by several regex patterns at once.
+    
+    The patterns are combined into a single alternation, so each path is
+    searched once rather than once per pattern. Patterns that cannot be
+    combined (backreferences, global inline flags) are searched one by one.
+    
+    Args:
+        files: List of file paths
+        patterns: Regex patterns to match against the file path
+    
+    Returns:
+        Filtered list of file paths that match any of the patterns
+    """
+    if not patterns:
+        return []
+    
+    combined = None
+    if not any(_BACKREFERENCE_RE.search(pattern) or _GLOBAL_FLAGS_RE.search(pattern) for pattern in patterns):
+        try:
+            combined = _compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+        except re.error:
+            pass
+    if combined is not None:
+        return [f for f in files if combined.search(f)]
+    
+    regexes = [_compile(pattern) for pattern in patterns]
+    return [f for f in files if any(regex.search(f) for regex in regexes)]
+
+
+def filter_files_by_named(files: List[str], name: str) -> List[str]:
+    """
+    Filter a list of files by one of the precompiled COMMON_PATTERNS.
+    
+    Args:
+        files: List of file paths
+        name: Key of the pattern in COMMON_PATTERNS (e.g. 'python', 'test')
+    
+    Returns:
+        Filtered list of file paths
+    """
+    search = COMMON_PATTERNS[name].search
+    return [f for f in files if search(f)]
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> Pattern:
+    """Compile a regex, reusing the compiled form when the same pattern is seen again."""
+    return re.compile(pattern)
+
+
+def get_directories(path: str, recursive: bool = False,
+                    skip_dir: Optional[Callable[[os.DirEntry], bool]] = None,
+                    max_workers: Optional[int] = None) -> List[str]:
     """
     Get all directories in a path.
     
+    Symbolic links to directories are listed, but when searching recursively
+    they are not descended into (as with os.walk).
+    
+    Results are cached until a directory that was walked changes (see
+    clear_file_listing_cache()).
+    
     Args:
         path: Path to search
         recursive: Whether to search recursively
+        skip_dir: Called with each directory found; directories for which it returns
+            True are neither listed nor searched (e.g. default_skip_dir)
+        max_workers: Number of threads listing the directories of each level of the
+            tree concurrently when searching recursively. Worth it on network and
+            FUSE file systems, where each listing waits on a round trip; if None or
+            1, directories are listed one at a time.
     
     Returns:
         List of directory paths
     """
-    if recursive:
-        result = []
-        for root, dirs, _ in os.walk(path):
-            result.extend([os.path.join(root, d) for d in dirs])
-        return sorted(result)
-    else:
-        return sorted([os.path.join(path, d) for d in os.listdir(path) 
-                if os.path.isdir(os.path.join(path, d))])
+    key = ('directories', path, os.path.abspath(path), recursive, skip_dir)
+    return _cached_listing(
+        key, lambda stamps: _list_directories(path, recursive, skip_dir, stamps, max_workers)
+    )
+
+
+def _list_directories(path: str, recursive: bool, skip_dir: Optional[Callable[[os.DirEntry], bool]],
+                      stamps: List[Tuple[str, int]], max_workers: Optional[int] = None) -> List[str]:
+    """Build get_directories()'s listing, recording the mtime of every directory read."""
+    if not recursive:
+        stamps.append((path, os.stat(path).st_mtime_ns))
+        # DirEntry carries the path and, usually, the file type from the listing itself
+        with os.scandir(path) as entries:
+            return sorted(entry.path for entry in entries
+                          if _is_dir(entry) and not (skip_dir is not None and skip_dir(entry)))
+    
+    def scan(directory: str) -> Optional[Tuple[int, List[str], List[str]]]:
+        return _scan_subdirectories(directory, skip_dir)
+    
+    if max_workers is None or max_workers == 1:
+        return _walk_directory_levels(path, scan, map, stamps)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return _walk_directory_levels(path, scan, executor.map, stamps)
+
+
+def _walk_directory_levels(path: str, scan: Callable[[str], Any], map_levels: Callable[..., Iterator[Any]],
+                           stamps: List[Tuple[str, int]]) -> List[str]:
+    """
+    List the directories below a path breadth-first, one level of the tree at a time.
+    
+    Args:
+        path: Path to search
+        scan: _scan_subdirectories() for one directory
+        map_levels: map() or an executor's map(), applied to each level's directories
+        stamps: (directory, st_mtime_ns) is appended for every directory read
+    
+    Returns:
+        Sorted list of directory paths
+    """
+    result = []
+    level = [path]
+    while level:
+        next_level = []
+        # map() keeps the level's order, so the stamps do not depend on thread timing
+        for current, scanned in zip(level, map_levels(scan, level)):
+            if scanned is None:
+                continue
+            mtime, found, descend = scanned
+            stamps.append((current, mtime))
+            result.extend(found)
+            next_level.extend(descend)
+        level = next_level
+    return sorted(result)
+
+
+def _scan_subdirectories(directory: str, skip_dir: Optional[Callable[[os.DirEntry], bool]]
+                         ) -> Optional[Tuple[int, List[str], List[str]]]:
+    """
+    List the subdirectories of one directory.
+    
+    Args:
+        directory: Directory to list
+        skip_dir: Prunes subdirectories, as for get_directories()
+    
+    Returns:
+        (st_mtime_ns, subdirectories, subdirectories to descend into), or None if
+        the directory cannot be read. Symbolic links to directories are listed but
+        not descended into.
+    """
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+    found = []
+    descend = []
+    try:
+        # entry.path is built once per entry from the directory listing; os.fwalk would
+        # save path lookups but yield bare names that need joining again
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if _is_dir(entry) and not (skip_dir is not None and skip_dir(entry)):
+                    found.append(entry.path)
+                    if not entry.is_symlink():
+                        descend.append(entry.path)
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        return mtime, [], []
+    return mtime, found, descend
 
 
 def is_binary_file(file_path: str) -> bool:
     """
     Check if a file is binary or text.
     
+    Files with a well-known binary or text extension (e.g. '.png', '.py') are
+    classified by it without being opened. Otherwise a file is considered binary
+    if its first 8 KiB contain a NUL byte, which text in any 8-bit encoding
+    (UTF-8, Latin-1, ...) does not, unless it starts with a Unicode byte order mark.
+    
     Args:
         file_path: Path to the file
     
     Returns:
         True if the file is binary, False if it's text
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            f.read(1024)  # Try to read as text
-            return False
-    except UnicodeDecodeError:
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in _KNOWN_BINARY_EXTENSIONS:
         return True
+    if ext in _KNOWN_TEXT_EXTENSIONS:
+        return False
+    
+    with open(file_path, 'rb') as f:
+        chunk = f.read(_BINARY_CHECK_SIZE)
+    if chunk.startswith(_TEXT_BOMS):
+        return False
+    # bytes.__contains__ is a memchr() call, already vectorized by the C library; a
+    # NumPy comparison over the same 8 KiB is about ten times slower
+    return b'\x00' in chunk
 
 
 def ensure_directory_exists(directory: str) -> None:
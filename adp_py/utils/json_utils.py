@@ -0,0 +1,52 @@
+"""
+@ai-metadata {
+    "domain": "utilities",
+    "description": "JSON serialization helpers that use orjson when it is installed",
+    "dependencies": []
+}
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra in pyproject.toml
+    orjson = None
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    
+    Args:
+        obj: The object to serialize.
+        indent: Whether to pretty-print with a two-space indent. Otherwise the
+            output is compact, without whitespace.
+    
+    Returns:
+        The JSON document as bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    # Compact separators, matching orjson's output
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+    
+    Args:
+        obj: The object to serialize.
+        indent: Whether to pretty-print with a two-space indent.
+    
+    Returns:
+        The JSON document as a string.
+    """
+    return dumps_bytes(obj, indent=indent).decode('utf-8')
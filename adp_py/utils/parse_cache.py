@@ -0,0 +1,137 @@
+"""
+@ai-metadata {
+    "domain": "utilities",
+    "description": "Persistent cache of parsed files, invalidated by file modification time and size",
+    "dependencies": ["../core/parser.py"]
+}
+"""
+
+import os
+import pickle
+import sqlite3
+import logging
+from typing import Optional
+
+from adp_py import __version__
+from adp_py.core.parser import ParsedFile, PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Entries are only valid for the package and parser versions that wrote them
+_CACHE_VERSION = f"{__version__}+parser{PARSER_VERSION}"
+
+
+def default_cache_path() -> str:
+    """
+    Get the default location of the parse cache database.
+    
+    Returns:
+        Path to parse_cache.sqlite under $XDG_CACHE_HOME/adp (or ~/.cache/adp).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "adp", "parse_cache.sqlite")
+
+
+class ParseCache:
+    """
+    SQLite-backed memo of ParsedFile results across CLI runs.
+    
+    Entries are keyed by absolute path and are only returned while the file's
+    mtime and size, the parser schema and the package and parser versions all
+    still match, so edited files are re-parsed automatically. If the database
+    cannot be opened the cache behaves as if it were always empty.
+    """
+    
+    def __init__(self, schema_name: str = "default", cache_path: Optional[str] = None):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            schema_name: Name of the schema used by the parser producing the results.
+            cache_path: Path to the SQLite database. If None, uses default_cache_path().
+        """
+        self.schema_name = schema_name
+        self.cache_path = cache_path or default_cache_path()
+        self._conn = None
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parsed_files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                "schema_name TEXT, version TEXT, data BLOB)"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Parse cache disabled, cannot open {self.cache_path}: {e}")
+            self._conn = None
+    
+    def get(self, file_path: str, stat_result: os.stat_result) -> Optional[ParsedFile]:
+        """
+        Look up a cached parse result.
+        
+        Args:
+            file_path: Path of the parsed file.
+            stat_result: Current stat of the file.
+        
+        Returns:
+            The cached ParsedFile, or None on a miss or stale entry.
+        """
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT data FROM parsed_files WHERE path = ? AND mtime_ns = ? AND size = ? "
+                "AND schema_name = ? AND version = ?",
+                (os.path.abspath(file_path), stat_result.st_mtime_ns, stat_result.st_size,
+                 self.schema_name, _CACHE_VERSION)
+            ).fetchone()
+            if row is None:
+                return None
+            parsed_file = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, AttributeError, EOFError) as e:
+            logger.debug(f"Ignoring unreadable parse cache entry for {file_path}: {e}")
+            return None
+        # Report the path as requested rather than as stored
+        parsed_file.file_path = file_path
+        for metadata_block in parsed_file.metadata_blocks:
+            metadata_block.file_path = file_path
+        return parsed_file
+    
+    def put(self, file_path: str, stat_result: os.stat_result, parsed_file: ParsedFile) -> None:
+        """
+        Store a parse result.
+        
+        Args:
+            file_path: Path of the parsed file.
+            stat_result: Stat of the file at the time it was parsed.
+            parsed_file: The parse result to store.
+        """
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_files VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(file_path), stat_result.st_mtime_ns, stat_result.st_size,
+                 self.schema_name, _CACHE_VERSION,
+                 pickle.dumps(parsed_file, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+        except sqlite3.Error as e:
+            logger.debug(f"Could not store parse cache entry for {file_path}: {e}")
+    
+    def close(self) -> None:
+        """Commit pending entries and close the database."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save parse cache: {e}")
+        finally:
+            self._conn.close()
+            self._conn = None
+    
+    def __enter__(self) -> 'ParseCache':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()